@@ -0,0 +1,75 @@
+"""Micro-benchmark: ChartVisualizer build time against row count.
+
+Run from the repository root:
+
+    python -m benchmarks.chart_build
+    python -m benchmarks.chart_build --rows 1000 10000 100000 --max-us-per-row 20
+    
+With --max-us-per-row the script exits with status 1 when any run is
+slower than the budget, so it can be used as a regression check.
+"""
+import argparse
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.visualization import ChartVisualizer
+
+
+def make_ohlcv(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build a synthetic minute series in get_historical_ohlcv format."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0, 0.0005, rows)) * close
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=rows, freq='min'),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume_from': rng.random(rows),
+    })
+    df['volume_to'] = df['volume_from'] * df['close']
+    df['volume'] = df['volume_to']
+    return df
+
+
+def time_build(visualizer: ChartVisualizer, df: pd.DataFrame, repeat: int, **kwargs) -> float:
+    """Best-of-``repeat`` seconds to build a chart."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        visualizer.create_candlestick_chart(df, 'BTC', timeframe='minute', **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 50_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-us-per-row', type=float, default=None,
+                        help='Fail if a full-resolution build exceeds this many microseconds per row')
+    args = parser.parse_args()
+    
+    visualizer = ChartVisualizer()
+    print(f"{'rows':>10} {'full (ms)':>12} {'us/row':>8} {'max_points=1500 (ms)':>22}")
+    failed = False
+    for rows in args.rows:
+        df = make_ohlcv(rows)
+        full = time_build(visualizer, df, args.repeat)
+        downsampled = time_build(visualizer, df, args.repeat, max_points=1500, webgl=True)
+        per_row = full / rows * 1e6
+        print(f"{rows:>10} {full * 1000:>12.1f} {per_row:>8.2f} {downsampled * 1000:>22.1f}")
+        if args.max_us_per_row is not None and per_row > args.max_us_per_row:
+            failed = True
+    
+    if failed:
+        print(f"[FAIL] Build time exceeded {args.max_us_per_row} us/row")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+"""Recorded CryptoCompare responses and a provider that replays them offline.
+
+Record fresh fixtures from the live API (needs network access):
+
+    python -m benchmarks.fixtures record --symbols BTC --limits hour=2000 day=30 --api-key KEY
+    
+or regenerate the bundled synthetic fixture (same response format, random
+walk prices) without network access:
+
+    python -m benchmarks.fixtures synthetic
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from src.data_providers.cryptocompare_provider import CryptoCompareProvider
+
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+DEFAULT_FIXTURE = FIXTURE_DIR / "cryptocompare.json"
+
+API_URL = "https://min-api.cryptocompare.com"
+HISTO_ENDPOINTS = {
+    "minute": "/data/v2/histominute",
+    "hour": "/data/v2/histohour",
+    "day": "/data/v2/histoday",
+}
+TIMEFRAME_SECONDS = {"minute": 60, "hour": 3600, "day": 86400}
+
+# Bars recorded per histo endpoint: one full hourly page for history
+# benchmarks, a month of daily bars for get_market_data
+DEFAULT_LIMITS = {"hour": 2000, "day": 30}
+
+
+class FixtureDataProvider(CryptoCompareProvider):
+    """
+    CryptoCompareProvider that answers from recorded API responses.
+    
+    Responses are kept as raw JSON bodies and decoded on every call, and
+    bars go through the same conversion as live responses, so parsing
+    cost is measured as in production. Histories longer than the
+    recording are served by repeating it with shifted timestamps, and the
+    API's 2000-bar cap is not applied, so any size can be benchmarked
+    offline.
+    """
+    
+    def __init__(self, path: Union[str, Path] = DEFAULT_FIXTURE):
+        """
+        Initialize fixture provider.
+        
+        Args:
+            path: Fixture file written by record_fixture or synthetic_fixture
+        """
+        super().__init__()
+        with open(path, encoding="utf-8") as f:
+            fixture = json.load(f)
+        
+        self.source = fixture.get("source")
+        self.recorded_at = fixture.get("recorded_at")
+        self._responses: Dict[str, Dict] = fixture["responses"]
+        self._bodies: Dict[Tuple[str, int], bytes] = {}
+    
+    def _body(self, key: str, bars: Optional[int] = None) -> Optional[bytes]:
+        """
+        Get the raw response body for a request, built once per size.
+        
+        Args:
+            key: Response key (e.g., 'histohour/BTC/USD', 'pricemulti')
+            bars: Bars a histo response should hold (None for as recorded)
+            
+        Returns:
+            Encoded JSON body, or None if the request was not recorded
+        """
+        cache_key = (key, bars or 0)
+        body = self._bodies.get(cache_key)
+        if body is None:
+            response = self._responses.get(key)
+            if response is None:
+                return None
+            if bars is not None and response.get("Response") != "Error":
+                step = TIMEFRAME_SECONDS[key.split("/")[0][len("histo"):]]
+                data = _tile_bars(response["Data"]["Data"], bars, step)
+                response = {**response, "Data": {**response["Data"], "Data": data}}
+            body = self._bodies[cache_key] = json.dumps(response).encode("utf-8")
+        return body
+    
+    def get_current_price(self, symbol: str, currency: str = "USD") -> Optional[float]:
+        """Get the recorded price of a pair."""
+        prices = self.get_current_prices([symbol], currency)
+        return prices.get(symbol.upper(), {}).get(currency.upper())
+    
+    def get_current_prices(
+        self,
+        symbols: List[str],
+        currencies: Union[str, List[str]] = "USD",
+        as_dataframe: bool = False
+    ) -> Union[Dict[str, Dict[str, float]], pd.DataFrame]:
+        """Get recorded prices from the pricemulti response; unrecorded pairs are omitted."""
+        if isinstance(currencies, str):
+            currencies = [currencies]
+        
+        body = self._body("pricemulti")
+        data = json.loads(body) if body is not None else {}
+        prices: Dict[str, Dict[str, float]] = {}
+        for symbol in symbols:
+            quotes = data.get(symbol.upper(), {})
+            for currency in currencies:
+                if currency.upper() in quotes:
+                    prices.setdefault(symbol.upper(), {})[currency.upper()] = float(quotes[currency.upper()])
+        
+        if as_dataframe:
+            return pd.DataFrame.from_dict(prices, orient='index')
+        return prices
+    
+    def get_market_data(self, symbol: str, currency: str = "USD") -> Optional[Dict]:
+        """Build market data from the recorded price and daily history."""
+        price = self.get_current_price(symbol, currency)
+        if price is None:
+            return None
+        hist_data = self._fetch_ohlcv(symbol, currency, "day", 1)
+        return self._market_data_from_history(symbol, currency, price, hist_data)
+    
+    def _fetch_ohlcv(
+        self,
+        symbol: str,
+        currency: str,
+        timeframe: str,
+        limit: int,
+        to_ts: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        """Decode the recorded histo response, sized like the API's (limit + 1 bars)."""
+        if timeframe not in HISTO_ENDPOINTS:
+            raise ValueError(f"Invalid timeframe: {timeframe}. Use 'minute', 'hour', or 'day'.")
+        
+        body = self._body(f"histo{timeframe}/{symbol.upper()}/{currency.upper()}", limit + 1)
+        if body is None:
+            return None
+        response = json.loads(body)
+        if response.get("Response") == "Error":
+            print(f"[ERROR] {response.get('Message')}")
+            return None
+        return response["Data"]["Data"]
+
+
+def _tile_bars(bars: List[Dict], count: int, step: int) -> List[Dict]:
+    """
+    Return the last ``count`` bars, repeating the recording as needed.
+    
+    Earlier copies are shifted back in time by the length of the
+    recording, so timestamps stay evenly spaced.
+    
+    Args:
+        bars: Recorded bars, oldest first
+        count: Bars wanted
+        step: Bar length in seconds
+        
+    Returns:
+        List of bar dictionaries, oldest first
+    """
+    if count <= len(bars):
+        return bars[len(bars) - count:]
+    
+    span = len(bars) * step
+    copies = -(-count // len(bars))
+    tiled = [
+        {**bar, "time": bar["time"] - span * copy}
+        for copy in range(copies - 1, -1, -1)
+        for bar in bars
+    ]
+    return tiled[len(tiled) - count:]
+
+
+def _histo_response(bars: List[Dict]) -> Dict:
+    """Wrap bars in the v2 histo endpoint response envelope."""
+    return {
+        "Response": "Success",
+        "Message": "",
+        "HasWarning": False,
+        "Type": 100,
+        "RateLimit": {},
+        "Data": {
+            "Aggregated": False,
+            "TimeFrom": bars[0]["time"] if bars else None,
+            "TimeTo": bars[-1]["time"] if bars else None,
+            "Data": bars,
+        },
+    }
+
+
+def _write_fixture(path: Union[str, Path], source: str, responses: Dict[str, Dict]) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fixture = {
+        "source": source,
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "responses": responses,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, separators=(",", ":"))
+    return path
+
+
+def record_fixture(
+    path: Union[str, Path] = DEFAULT_FIXTURE,
+    symbols: Sequence[str] = ("BTC",),
+    currency: str = "USD",
+    limits: Optional[Dict[str, int]] = None,
+    api_key: Optional[str] = None
+) -> Path:
+    """
+    Record live CryptoCompare responses to a fixture file.
+    
+    Args:
+        path: Fixture file to write
+        symbols: Symbols to record
+        currency: Quote currency
+        limits: Bars per histo request by timeframe ('minute', 'hour',
+            'day'; the API returns at most 2000), default DEFAULT_LIMITS
+        api_key: Optional API key
+        
+    Returns:
+        Path of the written fixture
+    """
+    import requests
+    
+    params = {"api_key": api_key} if api_key else {}
+    responses = {}
+    with requests.Session() as session:
+        for symbol in symbols:
+            for timeframe, limit in (limits or DEFAULT_LIMITS).items():
+                response = session.get(
+                    API_URL + HISTO_ENDPOINTS[timeframe],
+                    params={**params, "fsym": symbol.upper(), "tsym": currency.upper(), "limit": limit},
+                    timeout=30
+                )
+                response.raise_for_status()
+                responses[f"histo{timeframe}/{symbol.upper()}/{currency.upper()}"] = response.json()
+        
+        response = session.get(
+            API_URL + "/data/pricemulti",
+            params={**params, "fsyms": ",".join(s.upper() for s in symbols), "tsyms": currency.upper()},
+            timeout=30
+        )
+        response.raise_for_status()
+        responses["pricemulti"] = response.json()
+    
+    return _write_fixture(path, "live", responses)
+
+
+def synthetic_fixture(
+    path: Union[str, Path] = DEFAULT_FIXTURE,
+    symbols: Sequence[str] = ("BTC",),
+    currency: str = "USD",
+    limits: Optional[Dict[str, int]] = None,
+    seed: int = 0
+) -> Path:
+    """
+    Write a fixture in the recorded format from seeded random walks.
+    
+    Args:
+        path: Fixture file to write
+        symbols: Symbols to generate
+        currency: Quote currency
+        limits: Bars per histo response by timeframe (limit + 1 bars are
+            written, as the API returns), default DEFAULT_LIMITS
+        seed: Random seed
+        
+    Returns:
+        Path of the written fixture
+    """
+    rng = np.random.default_rng(seed)
+    end = 1_700_000_000
+    responses = {}
+    prices = {}
+    for index, symbol in enumerate(symbols):
+        base = 60_000.0 / 20 ** index
+        for timeframe, limit in (limits or DEFAULT_LIMITS).items():
+            step = TIMEFRAME_SECONDS[timeframe]
+            count = limit + 1
+            volatility = 0.0005 * np.sqrt(step / 60)
+            # Every timeframe ends at the quoted price
+            log_path = np.cumsum(rng.normal(0, volatility, count))
+            close = base * np.exp(log_path - log_path[-1])
+            open_ = np.r_[close[0], close[:-1]]
+            spread = np.abs(rng.normal(0, volatility / 2, count)) * close
+            volume_from = rng.gamma(2.0, 50.0 * step / 60, count)
+            times = end - end % step - step * np.arange(count - 1, -1, -1)
+            
+            bars = [
+                {
+                    "time": int(t),
+                    "high": round(float(max(o, c) + s), 2),
+                    "low": round(float(min(o, c) - s), 2),
+                    "open": round(float(o), 2),
+                    "volumefrom": round(float(v), 4),
+                    "volumeto": round(float(v * c), 2),
+                    "close": round(float(c), 2),
+                    "conversionType": "direct",
+                    "conversionSymbol": "",
+                }
+                for t, o, c, s, v in zip(times, open_, close, spread, volume_from)
+            ]
+            responses[f"histo{timeframe}/{symbol.upper()}/{currency.upper()}"] = _histo_response(bars)
+        prices[symbol.upper()] = {currency.upper(): round(base, 2)}
+    responses["pricemulti"] = prices
+    
+    return _write_fixture(path, "synthetic", responses)
+
+
+def _parse_limits(values: List[str]) -> Dict[str, int]:
+    """Parse 'timeframe=bars' arguments."""
+    limits = {}
+    for value in values:
+        timeframe, _, bars = value.partition("=")
+        if timeframe not in HISTO_ENDPOINTS or not bars.isdigit():
+            raise argparse.ArgumentTypeError(f"Invalid limit: {value}. Use e.g. hour=2000")
+        limits[timeframe] = int(bars)
+    return limits
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("mode", choices=["record", "synthetic"])
+    parser.add_argument("--path", default=str(DEFAULT_FIXTURE))
+    parser.add_argument("--symbols", nargs="+", default=["BTC"])
+    parser.add_argument("--currency", default="USD")
+    parser.add_argument("--limits", nargs="+", default=[f"{tf}={bars}" for tf, bars in DEFAULT_LIMITS.items()],
+                        help="Bars per histo endpoint, e.g. hour=2000 day=30")
+    parser.add_argument("--api-key", default=None)
+    args = parser.parse_args()
+    limits = _parse_limits(args.limits)
+    
+    started = time.perf_counter()
+    if args.mode == "record":
+        try:
+            path = record_fixture(args.path, args.symbols, args.currency, limits, args.api_key)
+        except Exception as e:
+            print(f"Error recording fixture: {e}")
+            return 1
+    else:
+        path = synthetic_fixture(args.path, args.symbols, args.currency, limits)
+    print(f"Fixture written to: {path} ({time.perf_counter() - started:.1f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""Benchmark suite: providers, sizing, indicators and charts against recorded fixtures.
+
+Run from the repository root:
+
+    python -m benchmarks.suite                      # compare with baselines.json
+    python -m benchmarks.suite --update             # record new baselines
+    python -m benchmarks.suite --filter chart --sizes 1000 10000
+    
+Every case runs offline on FixtureDataProvider (see benchmarks.fixtures).
+The script exits with status 1 when a case is slower than its baseline by
+more than --threshold. Baselines depend on the machine and the installed
+library versions, so they are not committed: record them with --update on
+the machine (or CI runner type) that runs the comparison. Comparing against
+baselines from a different machine is refused (exit status 2).
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+import plotly
+from src.indicators import ATR, EMA, RSI, atr, bollinger_bands, ema, macd, rsi, sma, vwap
+from src.position import PositionCalculator
+from src.visualization import ChartVisualizer
+from .fixtures import DEFAULT_FIXTURE, FixtureDataProvider
+
+
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_CHART_SIZES = (1_000, 10_000, 50_000)
+
+# A case is (name, function to time, items processed per call)
+Case = Tuple[str, Callable[[], object], int]
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> float:
+    """
+    Time a function the way timeit does.
+    
+    Calls are batched so each sample takes at least ``min_time``, garbage
+    collection is paused while sampling, and the best sample is kept.
+    
+    Args:
+        func: Function to time
+        repeat: Number of samples
+        min_time: Minimum seconds per sample
+        
+    Returns:
+        Best seconds per call
+    """
+    func()  # warm up caches and lazy imports
+    
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    
+    best = elapsed / number
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            best = min(best, (time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best
+
+
+def provider_cases(provider: FixtureDataProvider, sizes: Sequence[int]) -> List[Case]:
+    """Decode and convert recorded histo responses."""
+    cases = []
+    for rows in sizes:
+        # The API returns limit + 1 bars
+        cases.append((
+            f"provider.get_historical_ohlcv[{rows}]",
+            lambda rows=rows: provider.get_historical_ohlcv("BTC", "USD", "hour", rows - 1),
+            rows
+        ))
+        cases.append((
+            f"provider.get_historical_candles[{rows}]",
+            lambda rows=rows: provider.get_historical_candles("BTC", "USD", "hour", rows - 1),
+            rows
+        ))
+    return cases
+
+
+def position_cases(provider: FixtureDataProvider, sizes: Sequence[int]) -> List[Case]:
+    """Size setups one by one and in batches."""
+    calculator = PositionCalculator(max_loss_amount=100)
+    cases = []
+    
+    close = provider.get_historical_candles("BTC", "USD", "hour", 999).close
+    setups = [(price, price * 0.98, price * 1.05) for price in close.tolist()]
+    cases.append((
+        f"position.calculate_position_size[{len(setups)}]",
+        lambda: [calculator.calculate_position_size(*setup) for setup in setups],
+        len(setups)
+    ))
+    
+    for rows in sizes:
+        close = provider.get_historical_candles("BTC", "USD", "hour", rows - 1).close
+        cases.append((
+            f"position.calculate_position_sizes[{len(close)}]",
+            lambda close=close: calculator.calculate_position_sizes(close, close * 0.98, close * 1.05),
+            len(close)
+        ))
+    return cases
+
+
+def indicator_cases(provider: FixtureDataProvider, sizes: Sequence[int]) -> List[Case]:
+    """Vectorized indicators over whole series and streaming updates per bar."""
+    cases = []
+    for rows in sizes:
+        candles = provider.get_historical_candles("BTC", "USD", "hour", rows - 1)
+        high, low, close, volume = candles.high, candles.low, candles.close, candles.volume_to
+        
+        def batch(high=high, low=low, close=close, volume=volume):
+            sma(close, 20)
+            ema(close, 50)
+            rsi(close, 14)
+            atr(high, low, close, 14)
+            bollinger_bands(close, 20, 2.0)
+            macd(close)
+            vwap(high, low, close, volume)
+        
+        def streaming(high=high.tolist(), low=low.tolist(), close=close.tolist()):
+            ema_20, rsi_14, atr_14 = EMA(20), RSI(14), ATR(14)
+            for h, l, c in zip(high, low, close):
+                ema_20.update(c)
+                rsi_14.update(c)
+                atr_14.update(h, l, c)
+        
+        cases.append((f"indicators.batch[{len(close)}]", batch, len(close)))
+        cases.append((f"indicators.streaming[{len(close)}]", streaming, len(close)))
+    return cases
+
+
+def chart_cases(provider: FixtureDataProvider, sizes: Sequence[int], output_dir: Path) -> List[Case]:
+    """Build candlestick charts and serialize them to HTML."""
+    visualizer = ChartVisualizer()
+    cases = []
+    for rows in sizes:
+        df = provider.get_historical_ohlcv("BTC", "USD", "hour", rows - 1)
+        path = output_dir / f"chart_{rows}.html"
+        
+        def export(df=df, path=path, built={}):
+            # The figure is built on the untimed warm-up call, and only when
+            # the case runs; the CDN keeps plotly.js out of the measurement
+            if "fig" not in built:
+                built["fig"] = visualizer.create_candlestick_chart(df, "BTC")
+            fig, post_script = ChartVisualizer.html_options(built["fig"])
+            fig.write_html(str(path), include_plotlyjs="cdn", post_script=post_script)
+        
+        cases.append((
+            f"chart.build[{len(df)}]",
+            lambda df=df: visualizer.create_candlestick_chart(df, "BTC"),
+            len(df)
+        ))
+        cases.append((f"chart.export_html[{len(df)}]", export, len(df)))
+    return cases
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    chart_sizes: Sequence[int] = DEFAULT_CHART_SIZES,
+    filters: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+    fixture: Path = DEFAULT_FIXTURE
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run every benchmark case.
+    
+    Args:
+        sizes: Bar counts for provider, position and indicator cases
+        chart_sizes: Bar counts for chart cases
+        filters: Only run cases whose name contains one of these strings
+        repeat: Samples per case
+        fixture: Fixture file to replay
+        
+    Returns:
+        Dictionary mapping case name to 'seconds' (best per call) and
+        'us_per_item'
+    """
+    provider = FixtureDataProvider(fixture)
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        groups = [
+            lambda: provider_cases(provider, sizes),
+            lambda: position_cases(provider, sizes),
+            lambda: indicator_cases(provider, sizes),
+            lambda: chart_cases(provider, chart_sizes, Path(output_dir)),
+        ]
+        for build in groups:
+            for name, func, items in build():
+                if filters and not any(pattern in name for pattern in filters):
+                    continue
+                seconds = measure(func, repeat)
+                results[name] = {"seconds": seconds, "us_per_item": seconds / items * 1e6}
+                print(f"{name:<45} {seconds * 1000:>12.3f} ms {seconds / items * 1e6:>10.3f} us/item", flush=True)
+    return results
+
+
+def machine_info() -> Dict[str, str]:
+    """Describe the machine and library versions the baselines were recorded with."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def load_baselines(path: Path) -> Optional[Dict]:
+    """
+    Load a baselines file.
+    
+    Args:
+        path: File written by save_baselines
+        
+    Returns:
+        Dictionary with 'machine' and 'results', or None if missing
+    """
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(path: Path, results: Dict[str, Dict[str, float]], merge: bool = True) -> None:
+    """
+    Write results as the new baselines.
+    
+    Args:
+        path: Baselines file
+        results: run_suite() results
+        merge: Keep baselines of cases that were not run
+    """
+    existing = load_baselines(path) if merge else None
+    baselines = dict(existing["results"]) if existing else {}
+    baselines.update({name: result["seconds"] for name, result in results.items()})
+    
+    data = {
+        "machine": machine_info(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "results": dict(sorted(baselines.items())),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baselines: Dict[str, float],
+    threshold: float
+) -> List[Dict]:
+    """
+    Compare results with baselines.
+    
+    Args:
+        results: run_suite() results
+        baselines: Case name -> baseline seconds
+        threshold: Allowed slowdown as a fraction (0.5 = 50% slower)
+        
+    Returns:
+        One dictionary per case with 'name', 'seconds', 'baseline',
+        'change' (fractional, None without a baseline) and 'regressed'
+    """
+    rows = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        change = result["seconds"] / baseline - 1.0 if baseline else None
+        rows.append({
+            "name": name,
+            "seconds": result["seconds"],
+            "baseline": baseline,
+            "change": change,
+            "regressed": change is not None and change > threshold,
+        })
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=None,
+                        help="Bar counts for every case (default: 1000 10000 100000, charts up to 50000)")
+    parser.add_argument("--filter", nargs="+", default=None, help="Only run cases containing these strings")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Fail when a case is this fraction slower than its baseline "
+                             "(shared CI runners vary by 30-50%% between runs; lower it on quiet machines)")
+    parser.add_argument("--baselines", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+    parser.add_argument("--update", action="store_true", help="Write the results as the new baselines")
+    parser.add_argument("--output", type=Path, default=None, help="Also write the results as JSON")
+    args = parser.parse_args()
+    
+    stored = load_baselines(args.baselines)
+    if not args.update and stored is not None and stored.get("machine") != machine_info():
+        recorded = stored.get("machine") or {}
+        print(f"[ERROR] Baselines in {args.baselines} were recorded on a different machine; refusing to compare")
+        for key, value in machine_info().items():
+            if recorded.get(key) != value:
+                print(f"  {key}: baseline {recorded.get(key)!r}, here {value!r}")
+        print("Record baselines on this machine with --update")
+        return 2
+    
+    sizes = args.sizes or DEFAULT_SIZES
+    chart_sizes = args.sizes or DEFAULT_CHART_SIZES
+    results = run_suite(sizes, chart_sizes, args.filter, args.repeat, args.fixture)
+    
+    if not args.update and stored is not None:
+        slower = [row["name"] for row in compare(results, stored["results"], args.threshold) if row["regressed"]]
+        if slower:
+            # Confirm with a longer second run so one noisy sample cannot fail the check
+            print(f"\nRe-running {len(slower)} slower case(s) to confirm")
+            retry = run_suite(sizes, chart_sizes, slower, args.repeat * 2, args.fixture)
+            for name, result in retry.items():
+                if name in results and result["seconds"] < results[name]["seconds"]:
+                    results[name] = result
+    
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine_info(), "results": results}, f, indent=2)
+    
+    if args.update:
+        save_baselines(args.baselines, results)
+        print(f"Baselines written to: {args.baselines}")
+        return 0
+    
+    if stored is None:
+        print(f"No baselines at {args.baselines}; run with --update to record them")
+        return 0
+    
+    rows = compare(results, stored["results"], args.threshold)
+    print(f"\n{'case':<45} {'now (ms)':>12} {'base (ms)':>12} {'change':>8}")
+    for row in rows:
+        baseline = f"{row['baseline'] * 1000:12.3f}" if row["baseline"] else f"{'-':>12}"
+        change = f"{row['change']:+8.1%}" if row["change"] is not None else f"{'new':>8}"
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(f"{row['name']:<45} {row['seconds'] * 1000:>12.3f} {baseline} {change}{flag}")
+    
+    regressed = [row["name"] for row in rows if row["regressed"]]
+    if regressed:
+        print(f"[FAIL] {len(regressed)} case(s) more than {args.threshold:.0%} slower than baseline")
+        return 1
+    print(f"[OK] No case more than {args.threshold:.0%} slower than baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
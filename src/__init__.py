@@ -1,17 +1,46 @@
 """Crypto perpetual trading strategy framework."""
 __version__ = "0.1.0"
 
-from .data_providers import BaseDataProvider, CryptoCompareProvider
-from .position import PositionCalculator, PositionType
-from .strategies import BaseStrategy, SimpleStopLossStrategy
-from .visualization import ChartVisualizer
+from .backtest import BacktestEngine, BacktestResult, MonteCarloSimulator, ParameterSweep
+from .data_providers import (
+    AsyncCryptoCompareProvider,
+    BaseDataProvider,
+    CachedDataProvider,
+    CandleStore,
+    Candles,
+    CryptoCompareProvider,
+    MemmapCandleFile,
+    StreamingCryptoCompareProvider,
+)
+from .metrics import MetricsRegistry, disable_metrics, enable_metrics
+from .position import PerpPositionCalculator, PortfolioRisk, PositionCalculator, PositionType
+from .strategies import BaseStrategy, MarketSnapshot, SimpleStopLossStrategy, StrategyScheduler
+from .visualization import ChartExporter, ChartVisualizer
 
 __all__ = [
+    "BacktestEngine",
+    "BacktestResult",
+    "MonteCarloSimulator",
+    "ParameterSweep",
+    "AsyncCryptoCompareProvider",
     "BaseDataProvider",
+    "CachedDataProvider",
+    "CandleStore",
+    "Candles",
     "CryptoCompareProvider",
+    "MemmapCandleFile",
+    "StreamingCryptoCompareProvider",
+    "MetricsRegistry",
+    "disable_metrics",
+    "enable_metrics",
+    "PerpPositionCalculator",
+    "PortfolioRisk",
     "PositionCalculator",
     "PositionType",
     "BaseStrategy",
+    "MarketSnapshot",
     "SimpleStopLossStrategy",
+    "StrategyScheduler",
+    "ChartExporter",
     "ChartVisualizer",
 ]
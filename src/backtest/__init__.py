@@ -0,0 +1,14 @@
+"""Backtesting strategies over historical OHLCV data."""
+from .engine import BacktestEngine, BacktestResult, ReplayDataProvider
+from .monte_carlo import MonteCarloResult, MonteCarloSimulator
+from .optimizer import ParameterSweep, simple_strategy_factory
+
+__all__ = [
+    "BacktestEngine",
+    "BacktestResult",
+    "MonteCarloResult",
+    "MonteCarloSimulator",
+    "ParameterSweep",
+    "ReplayDataProvider",
+    "simple_strategy_factory",
+]
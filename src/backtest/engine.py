@@ -0,0 +1,452 @@
+"""Backtest engine that replays historical OHLCV data through a strategy."""
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from ..data_providers.base_provider import BaseDataProvider
+from ..position.position_calculator import PositionCalculator, PositionType
+from ..strategies.base_strategy import BaseStrategy
+
+
+# Signal actions that open a trade in the event-driven path (HOLD does not)
+ENTRY_ACTIONS = ("BUY", "SELL")
+
+
+def _positional(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give ``df`` a default RangeIndex, reusing it when it already has one.
+    
+    reset_index copies every column, which would undo zero-copy frames
+    built over shared memory or a memory-mapped candle file.
+    """
+    index = df.index
+    if isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1:
+        return df
+    return df.reset_index(drop=True)
+
+
+class ReplayDataProvider(BaseDataProvider):
+    """
+    Data provider that serves one bar of a historical series as "now".
+    
+    Used by the event-driven backtest path: the engine moves the cursor
+    forward and the strategy sees the close of the current bar as the
+    current price, with no access to later bars.
+    """
+    
+    def __init__(self, df: pd.DataFrame, symbol: str = "BTC", currency: str = "USD"):
+        """
+        Initialize replay provider.
+        
+        Args:
+            df: DataFrame in get_historical_ohlcv format
+            symbol: Symbol the series belongs to
+            currency: Quote currency of the series
+        """
+        self.df = _positional(df)
+        self.symbol = symbol.upper()
+        self.currency = currency.upper()
+        self.cursor = 0
+        self._close = self.df['close'].to_numpy(dtype=np.float64)
+    
+    def _matches(self, symbol: str, currency: str) -> bool:
+        return symbol.upper() == self.symbol and currency.upper() == self.currency
+    
+    def get_current_price(self, symbol: str, currency: str = "USD") -> Optional[float]:
+        """
+        Get the close of the current bar.
+        
+        Args:
+            symbol: Trading symbol
+            currency: Quote currency
+            
+        Returns:
+            Close price or None for other symbols
+        """
+        if not self._matches(symbol, currency):
+            return None
+        return float(self._close[self.cursor])
+    
+    def get_market_data(self, symbol: str, currency: str = "USD") -> Optional[Dict]:
+        """
+        Get market data for the current bar.
+        
+        Args:
+            symbol: Trading symbol
+            currency: Quote currency
+            
+        Returns:
+            Dictionary with price and bar statistics or None
+        """
+        if not self._matches(symbol, currency):
+            return None
+        
+        bar = self.df.iloc[self.cursor]
+        return {
+            "symbol": self.symbol,
+            "currency": self.currency,
+            "price": float(bar['close']),
+            "volume_24h": float(bar['volume_to']) if 'volume_to' in bar else None,
+            "change_24h": float(bar['close'] - bar['open']),
+            "change_pct_24h": float((bar['close'] - bar['open']) / bar['open'] * 100) if bar['open'] else None,
+            "high_24h": float(bar['high']),
+            "low_24h": float(bar['low']),
+            "market_cap": None,
+        }
+    
+    def get_historical_ohlcv(
+        self,
+        symbol: str,
+        currency: str = "USD",
+        timeframe: str = "hour",
+        limit: int = 100
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get the bars up to and including the current one.
+        
+        Args:
+            symbol: Trading symbol
+            currency: Quote currency
+            timeframe: Ignored; the replayed series has a single timeframe
+            limit: Number of data points (the API convention returns limit + 1)
+            
+        Returns:
+            DataFrame slice or None for other symbols
+        """
+        if not self._matches(symbol, currency):
+            return None
+        start = max(0, self.cursor - limit)
+        return self.df.iloc[start:self.cursor + 1]
+
+
+class BacktestResult:
+    """Trades and equity curve produced by a backtest run."""
+    
+    def __init__(self, trades: pd.DataFrame, equity: pd.Series, mode: str):
+        """
+        Initialize backtest result.
+        
+        Args:
+            trades: One row per closed trade
+            equity: Cumulative realized P&L per bar
+            mode: 'vectorized' or 'event'
+        """
+        self.trades = trades
+        self.equity = equity
+        self.mode = mode
+    
+    def summary(self) -> Dict:
+        """
+        Summarize the run.
+        
+        Returns:
+            Dictionary with trade count, win rate, P&L, profit factor,
+            average R multiple and maximum drawdown
+        """
+        pnl = self.trades['pnl'].to_numpy(dtype=np.float64)
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+        
+        if len(losses):
+            profit_factor = float(wins.sum() / -losses.sum())
+        else:
+            profit_factor = float('inf') if len(wins) else 0.0
+        
+        equity = np.r_[0.0, self.equity.to_numpy(dtype=np.float64)]
+        drawdown = np.maximum.accumulate(equity) - equity
+        
+        return {
+            "mode": self.mode,
+            "num_trades": int(len(pnl)),
+            "win_rate": float(len(wins) / len(pnl)) if len(pnl) else 0.0,
+            "total_pnl": float(pnl.sum()),
+            "avg_pnl": float(pnl.mean()) if len(pnl) else 0.0,
+            "profit_factor": profit_factor,
+            "avg_r_multiple": float(self.trades['r_multiple'].mean()) if len(pnl) else 0.0,
+            "max_drawdown": float(drawdown.max()),
+        }
+
+
+class BacktestEngine:
+    """
+    Replay an OHLCV series through a strategy and simulate stop/target fills.
+    
+    Entries fill at the close of the signal bar. From the next bar on, a
+    long stops out when the low reaches the stop and takes profit when the
+    high reaches the target (reversed for shorts); if both are touched in
+    the same bar the stop is assumed to fill first. A bar that opens beyond
+    the stop or target (a gap) fills at its open instead of the level, and
+    setups sized to zero units are skipped. Trades still open at
+    the end of the data are closed at the last close. One position is held
+    at a time and sizing comes from the PositionCalculator.
+    """
+    
+    # First forward window scanned for an exit; doubled until a hit is found
+    INITIAL_EXIT_WINDOW = 64
+    
+    def __init__(self, position_calculator: PositionCalculator):
+        """
+        Initialize backtest engine.
+        
+        Args:
+            position_calculator: Calculator used to size every trade
+        """
+        self.position_calculator = position_calculator
+    
+    def run(self, strategy: BaseStrategy, df: pd.DataFrame, mode: str = "auto") -> BacktestResult:
+        """
+        Run a backtest.
+        
+        Args:
+            strategy: Strategy to evaluate
+            df: DataFrame in get_historical_ohlcv format, sorted by timestamp
+            mode: 'vectorized' (requires generate_signals), 'event', or 'auto'
+                (vectorized when the strategy supports it)
+            
+        Returns:
+            BacktestResult with trades and equity curve
+        """
+        if df is None or df.empty:
+            raise ValueError("DataFrame is empty or None")
+        if mode not in ("auto", "vectorized", "event"):
+            raise ValueError("mode must be 'auto', 'vectorized' or 'event'")
+        
+        df = _positional(df)
+        self._open = df['open'].to_numpy(dtype=np.float64)
+        self._high = df['high'].to_numpy(dtype=np.float64)
+        self._low = df['low'].to_numpy(dtype=np.float64)
+        self._close = df['close'].to_numpy(dtype=np.float64)
+        
+        signals = None
+        if mode != "event":
+            signals = strategy.generate_signals(df)
+            if signals is None and mode == "vectorized":
+                raise ValueError(f"{type(strategy).__name__} does not implement generate_signals")
+        
+        if signals is not None:
+            trades = self._run_vectorized(signals)
+            mode = "vectorized"
+        else:
+            trades = self._run_event_driven(strategy, df)
+            mode = "event"
+        
+        return self._build_result(trades, df, mode)
+    
+    def _run_vectorized(self, signals: Dict) -> List[Dict]:
+        """
+        Simulate trades from precomputed signal arrays.
+        
+        Args:
+            signals: Dictionary with 'entry', 'stop_loss' and 'target' arrays
+            
+        Returns:
+            List of trade dictionaries
+        """
+        entry = np.asarray(signals["entry"], dtype=bool)
+        stop_loss = np.asarray(signals["stop_loss"], dtype=np.float64)
+        target = np.asarray(signals["target"], dtype=np.float64)
+        
+        valid = entry & np.isfinite(stop_loss) & np.isfinite(target) & (stop_loss != self._close)
+        # An entry needs at least one bar after it to exit on
+        valid[-1:] = False
+        candidates = np.flatnonzero(valid)
+        
+        trades = []
+        position = 0
+        while position < len(candidates):
+            i = int(candidates[position])
+            trade = self._open_trade(i, self._close[i], stop_loss[i], target[i])
+            if trade is None:
+                position += 1
+                continue
+            
+            trades.append(trade)
+            # Next entry can fill at the close of the exit bar
+            position = int(np.searchsorted(candidates, trade["exit_index"], side='left'))
+        return trades
+    
+    def _run_event_driven(self, strategy: BaseStrategy, df: pd.DataFrame) -> List[Dict]:
+        """
+        Simulate trades by calling the strategy bar by bar while flat.
+        
+        Only a BUY or SELL signal with an entry opens a trade, matching the
+        boolean 'entry' array of the vectorized path.
+        
+        The strategy's data provider is swapped for a ReplayDataProvider for
+        the duration of the run.
+        
+        Args:
+            strategy: Strategy to evaluate
+            df: DataFrame in get_historical_ohlcv format
+            
+        Returns:
+            List of trade dictionaries
+        """
+        replay = ReplayDataProvider(df, strategy.symbol, strategy.currency)
+        original_provider = strategy.data_provider
+        strategy.data_provider = replay
+        
+        trades = []
+        try:
+            i = 0
+            # The last bar is never evaluated: an entry there could not exit
+            while i < len(df) - 1:
+                replay.cursor = i
+                result = strategy.execute_strategy()
+                entry = result.get("entry") if result else None
+                action = (result.get("signal") or {}).get("action") if result else None
+                if not entry or str(action).upper() not in ENTRY_ACTIONS:
+                    i += 1
+                    continue
+                
+                trade = self._open_trade(
+                    i,
+                    entry.get("current_price", self._close[i]),
+                    entry["stop_loss"],
+                    entry["target_price"],
+                    position_size=entry.get("position_size")
+                )
+                if trade is None:
+                    i += 1
+                    continue
+                
+                trades.append(trade)
+                i = trade["exit_index"]
+        finally:
+            strategy.data_provider = original_provider
+        return trades
+    
+    def _open_trade(
+        self,
+        index: int,
+        entry_price: float,
+        stop_loss: float,
+        target: float,
+        position_size: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Size a trade and simulate it until exit.
+        
+        Args:
+            index: Bar index of the entry
+            entry_price: Fill price
+            stop_loss: Stop loss price
+            target: Target price
+            position_size: Size chosen by the strategy (default: PositionCalculator sizing)
+            
+        Returns:
+            Trade dictionary or None if the setup cannot be sized or has no size
+        """
+        try:
+            sizing = self.position_calculator.calculate_position_size(
+                current_price=float(entry_price),
+                stop_loss=float(stop_loss),
+                target_price=float(target)
+            )
+        except ValueError:
+            return None
+        
+        if position_size is None:
+            position_size = sizing["position_size"]
+        if not position_size > 0:
+            return None
+        is_long = sizing["position_type"] == PositionType.LONG.value
+        exit_index, exit_price, reason = self._find_exit(index, is_long, float(stop_loss), float(target))
+        
+        direction = 1.0 if is_long else -1.0
+        pnl = direction * (exit_price - entry_price) * position_size
+        return {
+            "entry_index": index,
+            "exit_index": exit_index,
+            "position_type": sizing["position_type"],
+            "entry_price": float(entry_price),
+            "stop_loss": float(stop_loss),
+            "target_price": float(target),
+            "exit_price": float(exit_price),
+            "exit_reason": reason,
+            "position_size": float(position_size),
+            "pnl": float(pnl),
+            "r_multiple": float(pnl / (sizing["risk_per_unit"] * position_size)),
+        }
+    
+    def _find_exit(self, index: int, is_long: bool, stop_loss: float, target: float):
+        """
+        Find the first bar after ``index`` that touches the stop or target.
+        
+        The exit fills at the level, or at the bar's open when the bar
+        already opens beyond it.
+        
+        The forward scan is vectorized over windows that double in size, so
+        long trades cost a handful of NumPy calls rather than a Python loop.
+        
+        Args:
+            index: Entry bar index
+            is_long: True for long positions
+            stop_loss: Stop loss price
+            target: Target price
+            
+        Returns:
+            Tuple of (exit bar index, exit price, exit reason)
+        """
+        n = len(self._close)
+        start = index + 1
+        window = self.INITIAL_EXIT_WINDOW
+        while start < n:
+            end = min(n, start + window)
+            high = self._high[start:end]
+            low = self._low[start:end]
+            if is_long:
+                stop_hit = low <= stop_loss
+                target_hit = high >= target
+            else:
+                stop_hit = high >= stop_loss
+                target_hit = low <= target
+            
+            hit = stop_hit | target_hit
+            if hit.any():
+                offset = int(np.argmax(hit))
+                bar = start + offset
+                open_price = self._open[bar]
+                if is_long:
+                    gap_stop, gap_target = open_price <= stop_loss, open_price >= target
+                else:
+                    gap_stop, gap_target = open_price >= stop_loss, open_price <= target
+                
+                if gap_stop:
+                    return bar, open_price, "stop"
+                if gap_target:
+                    return bar, open_price, "target"
+                if stop_hit[offset]:
+                    return bar, stop_loss, "stop"
+                return bar, target, "target"
+            
+            start = end
+            window *= 2
+        
+        return n - 1, self._close[-1], "end"
+    
+    @staticmethod
+    def _build_result(trades: List[Dict], df: pd.DataFrame, mode: str) -> BacktestResult:
+        """Assemble trades and the realized equity curve."""
+        columns = [
+            "entry_index", "exit_index", "entry_time", "exit_time", "position_type",
+            "entry_price", "stop_loss", "target_price", "exit_price", "exit_reason",
+            "position_size", "pnl", "r_multiple",
+        ]
+        trades_df = pd.DataFrame(trades)
+        if trades_df.empty:
+            trades_df = pd.DataFrame(columns=columns)
+        else:
+            timestamps = df['timestamp'].to_numpy()
+            trades_df["entry_time"] = timestamps[trades_df["entry_index"].to_numpy()]
+            trades_df["exit_time"] = timestamps[trades_df["exit_index"].to_numpy()]
+            trades_df = trades_df[columns]
+        
+        realized = np.zeros(len(df))
+        if len(trades_df):
+            np.add.at(
+                realized,
+                trades_df["exit_index"].to_numpy(dtype=np.int64),
+                trades_df["pnl"].to_numpy(dtype=np.float64)
+            )
+        equity = pd.Series(np.cumsum(realized), index=df['timestamp'], name="equity")
+        return BacktestResult(trades_df, equity, mode)
@@ -0,0 +1,435 @@
+"""Monte Carlo estimates of stop/target outcomes for a sized trade."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from ..position.position_calculator import PositionType
+
+
+MODELS = ('bootstrap', 'gbm', 'garch')
+
+# Path outcome codes
+STOP = 0
+TARGET = 1
+OPEN = 2
+
+
+def _returns_chunk(
+    rng: np.random.Generator,
+    model: Dict,
+    count: int,
+    steps: int,
+    variance: Optional[np.ndarray]
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Draw log returns for ``count`` paths over ``steps`` bars.
+    
+    Args:
+        rng: Random generator of the block
+        model: Model specification built by MonteCarloSimulator
+        count: Number of paths
+        steps: Number of bars
+        variance: Current GARCH conditional variance per path (None otherwise)
+        
+    Returns:
+        Tuple of (returns of shape (count, steps), updated variance)
+    """
+    if model['name'] == 'bootstrap':
+        history = model['returns']
+        block = model['block_length']
+        if block <= 1:
+            return history[rng.integers(0, len(history), size=(count, steps))], None
+        
+        # Moving-block bootstrap keeps short-range autocorrelation
+        blocks = -(-steps // block)
+        starts = rng.integers(0, len(history) - block + 1, size=(count, blocks, 1))
+        index = (starts + np.arange(block)).reshape(count, blocks * block)[:, :steps]
+        return history[index], None
+    
+    if model['name'] == 'gbm':
+        return rng.normal(model['mu'], model['sigma'], size=(count, steps)), None
+    
+    # GARCH(1,1): variance follows each path's own shocks
+    omega, alpha, beta = model['omega'], model['alpha'], model['beta']
+    shocks = rng.standard_normal((count, steps))
+    returns = np.empty((count, steps))
+    for step in range(steps):
+        eps = np.sqrt(variance) * shocks[:, step]
+        returns[:, step] = model['mu'] + eps
+        variance = omega + alpha * eps * eps + beta * variance
+    return returns, variance
+
+
+def _simulate_block(
+    model: Dict,
+    seed: np.random.SeedSequence,
+    count: int,
+    horizon: int,
+    time_chunk: int,
+    entry: float,
+    stop: float,
+    target: float,
+    is_long: bool
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate one block of paths until each hits its stop, target or horizon.
+    
+    Only paths still open are carried into the next time chunk, and at
+    most count x time_chunk returns exist at once.
+    
+    Returns:
+        Tuple of (outcome codes, exit bar, exit price) per path
+    """
+    rng = np.random.default_rng(seed)
+    log_stop = np.log(stop / entry)
+    log_target = np.log(target / entry)
+    
+    outcome = np.full(count, OPEN, dtype=np.int8)
+    exit_step = np.full(count, horizon, dtype=np.int32)
+    exit_price = np.empty(count)
+    log_price = np.zeros(count)
+    active = np.arange(count)
+    variance = np.full(count, model['variance']) if model['name'] == 'garch' else None
+    
+    start = 0
+    while start < horizon and active.size:
+        steps = min(time_chunk, horizon - start)
+        returns, variance = _returns_chunk(rng, model, active.size, steps, variance)
+        paths = log_price[active, None] + np.cumsum(returns, axis=1)
+        
+        if is_long:
+            hit_stop, hit_target = paths <= log_stop, paths >= log_target
+        else:
+            hit_stop, hit_target = paths >= log_stop, paths <= log_target
+        first_stop = np.where(hit_stop.any(axis=1), hit_stop.argmax(axis=1), steps)
+        first_target = np.where(hit_target.any(axis=1), hit_target.argmax(axis=1), steps)
+        
+        stopped = first_stop < first_target
+        reached = first_target < first_stop
+        for mask, code, level, first in ((stopped, STOP, stop, first_stop), (reached, TARGET, target, first_target)):
+            rows = active[mask]
+            outcome[rows] = code
+            exit_step[rows] = start + first[mask] + 1
+            exit_price[rows] = level
+        
+        log_price[active] = paths[:, -1]
+        keep = ~(stopped | reached)
+        active = active[keep]
+        if variance is not None:
+            variance = variance[keep]
+        start += steps
+    
+    exit_price[active] = entry * np.exp(log_price[active])
+    return outcome, exit_step, exit_price
+
+
+def _simulate_blocks(tasks: List[Tuple]) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Run several blocks inside a worker."""
+    return [_simulate_block(*task) for task in tasks]
+
+
+class MonteCarloResult:
+    """Per-path outcomes of a Monte Carlo trade simulation."""
+    
+    def __init__(
+        self,
+        outcome: np.ndarray,
+        exit_step: np.ndarray,
+        exit_price: np.ndarray,
+        entry: float,
+        stop: float,
+        target: float,
+        position_size: float,
+        is_long: bool,
+        horizon: int
+    ):
+        """
+        Initialize Monte Carlo result.
+        
+        Args:
+            outcome: STOP, TARGET or OPEN per path
+            exit_step: Bar of the exit (horizon for open paths)
+            exit_price: Stop or target price, or the last price of open paths
+            entry: Entry price
+            stop: Stop loss price
+            target: Target price
+            position_size: Position size in units
+            is_long: Whether the trade is long
+            horizon: Bars simulated per path
+        """
+        self.outcome = outcome
+        self.exit_step = exit_step
+        self.exit_price = exit_price
+        self.entry = entry
+        self.stop = stop
+        self.target = target
+        self.position_size = position_size
+        self.is_long = is_long
+        self.horizon = horizon
+    
+    def __len__(self) -> int:
+        return len(self.outcome)
+    
+    @property
+    def pnl(self) -> np.ndarray:
+        """P&L per path (open paths marked at their last price)."""
+        direction = 1.0 if self.is_long else -1.0
+        return direction * (self.exit_price - self.entry) * self.position_size
+    
+    @property
+    def time_to_stop(self) -> np.ndarray:
+        """Bars until the stop for paths that hit it."""
+        return self.exit_step[self.outcome == STOP]
+    
+    @property
+    def time_to_target(self) -> np.ndarray:
+        """Bars until the target for paths that hit it."""
+        return self.exit_step[self.outcome == TARGET]
+    
+    def time_distribution(self, bins: int = 20) -> pd.DataFrame:
+        """
+        Histogram of exit times by outcome.
+        
+        Args:
+            bins: Number of equal-width bins over [0, horizon]
+            
+        Returns:
+            DataFrame indexed by bin end (bars) with the fraction of all
+            paths that hit the stop and the target in each bin
+        """
+        edges = np.linspace(0, self.horizon, bins + 1)
+        total = max(len(self), 1)
+        return pd.DataFrame({
+            "stop": np.histogram(self.time_to_stop, edges)[0] / total,
+            "target": np.histogram(self.time_to_target, edges)[0] / total,
+        }, index=pd.Index(edges[1:], name="bars"))
+    
+    def summary(self) -> Dict:
+        """
+        Summarize the simulation.
+        
+        Returns:
+            Dictionary with path count, stop/target/open probabilities,
+            expected P&L and its spread, P&L percentiles and exit-time
+            statistics (in bars)
+        """
+        pnl = self.pnl
+        n = max(len(self), 1)
+        to_stop = self.time_to_stop
+        to_target = self.time_to_target
+        p05, p50, p95 = np.percentile(pnl, [5, 50, 95]) if len(pnl) else (0.0, 0.0, 0.0)
+        
+        return {
+            "num_paths": int(len(self)),
+            "prob_stop": float(len(to_stop) / n),
+            "prob_target": float(len(to_target) / n),
+            "prob_open": float(np.count_nonzero(self.outcome == OPEN) / n),
+            "expected_pnl": float(pnl.mean()) if len(pnl) else 0.0,
+            "pnl_std": float(pnl.std()) if len(pnl) else 0.0,
+            "pnl_p05": float(p05),
+            "pnl_p50": float(p50),
+            "pnl_p95": float(p95),
+            "mean_time_to_stop": float(to_stop.mean()) if len(to_stop) else None,
+            "median_time_to_stop": float(np.median(to_stop)) if len(to_stop) else None,
+            "mean_time_to_target": float(to_target.mean()) if len(to_target) else None,
+            "median_time_to_target": float(np.median(to_target)) if len(to_target) else None,
+        }
+
+
+class MonteCarloSimulator:
+    """
+    Simulate price paths from an entry until the stop, target or horizon.
+    
+    Returns are drawn by resampling historical log returns ('bootstrap',
+    optionally in blocks), from a normal distribution ('gbm', geometric
+    Brownian motion) or from a GARCH(1,1) process ('garch', volatility
+    clustering). Parameters not given are estimated from the history.
+    
+    Paths are generated in blocks of block_size paths and time_chunk bars,
+    so memory is bounded by one block per worker however many paths are
+    requested, and paths that have exited are dropped from later chunks.
+    Blocks run on a process pool; each gets its own child of one
+    SeedSequence, so results depend only on the seed and block size, not
+    on the number of workers. Exits are checked at bar closes and fill
+    exactly at the stop or target price.
+    """
+    
+    def __init__(
+        self,
+        returns: Optional[Union[np.ndarray, pd.Series]] = None,
+        model: str = 'bootstrap',
+        mu: Optional[float] = None,
+        sigma: Optional[float] = None,
+        garch_params: Optional[Tuple[float, float]] = None,
+        block_length: int = 1,
+        block_size: int = 10_000,
+        time_chunk: int = 256,
+        max_workers: Optional[int] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize Monte Carlo simulator.
+        
+        Args:
+            returns: Historical per-bar log returns (required for 'bootstrap'
+                and for estimating missing parameters)
+            model: 'bootstrap', 'gbm' or 'garch'
+            mu: Mean log return per bar (default: historical mean)
+            sigma: Log return volatility per bar (default: historical std)
+            garch_params: GARCH (alpha, beta) (default: (0.05, 0.90)); omega
+                is set so the long-run variance equals sigma squared
+            block_length: Bars per resampled block for 'bootstrap'
+            block_size: Paths generated per block
+            time_chunk: Bars generated per step within a block
+            max_workers: Worker processes (default: CPU count; 1 runs in process)
+            seed: Seed for reproducible results
+        """
+        if model not in MODELS:
+            raise ValueError(f"model must be one of {MODELS}")
+        
+        history = None
+        if returns is not None:
+            history = np.asarray(returns, dtype=np.float64)
+            history = history[np.isfinite(history)]
+            if history.size == 0:
+                raise ValueError("returns contains no finite values")
+        elif model == 'bootstrap' or mu is None or sigma is None:
+            raise ValueError("returns are required for bootstrap and for estimating mu/sigma")
+        
+        self.model = model
+        self.mu = float(history.mean()) if mu is None else mu
+        self.sigma = float(history.std()) if sigma is None else sigma
+        self.garch_params = garch_params or (0.05, 0.90)
+        if sum(self.garch_params) >= 1:
+            raise ValueError("GARCH alpha + beta must be below 1")
+        if model == 'bootstrap' and block_length > len(history):
+            raise ValueError("block_length is longer than the return history")
+        
+        self.history = history
+        self.block_length = block_length
+        self.block_size = block_size
+        self.time_chunk = time_chunk
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.seed = seed
+    
+    @classmethod
+    def from_ohlcv(cls, df: pd.DataFrame, model: str = 'bootstrap', **kwargs) -> "MonteCarloSimulator":
+        """
+        Create a simulator from get_historical_ohlcv data.
+        
+        Args:
+            df: OHLCV DataFrame; bar-to-bar close log returns are used, so
+                the horizon is measured in bars of its timeframe
+            model: 'bootstrap', 'gbm' or 'garch'
+            **kwargs: Other MonteCarloSimulator arguments
+            
+        Returns:
+            MonteCarloSimulator instance
+        """
+        close = df.sort_values('timestamp')['close'].to_numpy(dtype=np.float64)
+        return cls(np.diff(np.log(close)), model=model, **kwargs)
+    
+    def _model_spec(self) -> Dict:
+        """Picklable model description sent to the workers."""
+        spec = {'name': self.model, 'mu': self.mu, 'sigma': self.sigma}
+        if self.model == 'bootstrap':
+            spec.update(returns=self.history, block_length=self.block_length)
+        elif self.model == 'garch':
+            alpha, beta = self.garch_params
+            variance = self.sigma ** 2
+            spec.update(omega=variance * (1 - alpha - beta), alpha=alpha, beta=beta, variance=variance)
+        return spec
+    
+    def simulate(
+        self,
+        entry_price: float,
+        stop_loss: float,
+        target_price: float,
+        position_size: float = 1.0,
+        position_type: Optional[Union[PositionType, str]] = None,
+        n_paths: int = 100_000,
+        horizon: int = 1_000
+    ) -> MonteCarloResult:
+        """
+        Simulate a trade.
+        
+        Args:
+            entry_price: Entry price
+            stop_loss: Stop loss price
+            target_price: Target price
+            position_size: Position size in units (scales P&L only)
+            position_type: LONG or SHORT (default: long when entry is above stop)
+            n_paths: Number of simulated paths
+            horizon: Maximum bars to hold the trade
+            
+        Returns:
+            MonteCarloResult with one entry per path, in block order
+        """
+        if position_type is None:
+            is_long = entry_price > stop_loss
+        else:
+            value = position_type.value if isinstance(position_type, PositionType) else str(position_type).upper()
+            is_long = value == PositionType.LONG.value
+        
+        if is_long and not stop_loss < entry_price < target_price:
+            raise ValueError("A long trade needs stop < entry < target")
+        if not is_long and not target_price < entry_price < stop_loss:
+            raise ValueError("A short trade needs target < entry < stop")
+        if n_paths <= 0 or horizon <= 0:
+            raise ValueError("n_paths and horizon must be positive")
+        
+        spec = self._model_spec()
+        counts = [self.block_size] * (n_paths // self.block_size)
+        if n_paths % self.block_size:
+            counts.append(n_paths % self.block_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(counts))
+        tasks = [
+            (spec, seed, count, horizon, self.time_chunk, entry_price, stop_loss, target_price, is_long)
+            for seed, count in zip(seeds, counts)
+        ]
+        
+        workers = min(self.max_workers, len(tasks))
+        if workers <= 1:
+            blocks = _simulate_blocks(tasks)
+        else:
+            # Contiguous batches keep the result in block order
+            batch_size = -(-len(tasks) // workers)
+            batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                blocks = [block for batch in executor.map(_simulate_blocks, batches) for block in batch]
+        
+        outcome, exit_step, exit_price = (np.concatenate(parts) for parts in zip(*blocks))
+        return MonteCarloResult(
+            outcome,
+            exit_step,
+            exit_price,
+            entry_price,
+            stop_loss,
+            target_price,
+            position_size,
+            is_long,
+            horizon
+        )
+    
+    def simulate_setup(self, setup: Dict, n_paths: int = 100_000, horizon: int = 1_000) -> MonteCarloResult:
+        """
+        Simulate a PositionCalculator.calculate_position_size result.
+        
+        Args:
+            setup: Dictionary returned by calculate_position_size
+            n_paths: Number of simulated paths
+            horizon: Maximum bars to hold the trade
+            
+        Returns:
+            MonteCarloResult
+        """
+        return self.simulate(
+            setup["current_price"],
+            setup["stop_loss"],
+            setup["target_price"],
+            setup["position_size"],
+            setup["position_type"],
+            n_paths,
+            horizon
+        )
@@ -0,0 +1,302 @@
+"""Parallel parameter sweeps over backtests."""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from ..data_providers.memmap_candles import MemmapCandleFile
+from ..position.position_calculator import PositionCalculator
+from ..strategies.base_strategy import BaseStrategy
+from ..strategies.simple_strategy import SimpleStopLossStrategy
+from .engine import BacktestEngine
+
+
+_SHARED_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume_from', 'volume_to']
+
+# Per-worker state set up once by the pool initializer
+_worker_blocks: List[shared_memory.SharedMemory] = []
+_worker_df: Optional[pd.DataFrame] = None
+_worker_factory: Optional[Callable[[Dict], BaseStrategy]] = None
+_worker_engine: Optional[BacktestEngine] = None
+
+
+def simple_strategy_factory(params: Dict) -> BaseStrategy:
+    """
+    Build a SimpleStopLossStrategy from sweep parameters.
+    
+    Args:
+        params: Dictionary with 'stop_loss_pct' and 'target_pct'
+        
+    Returns:
+        Strategy instance (no data provider is needed for vectorized backtests)
+    """
+    return SimpleStopLossStrategy(
+        data_provider=None,
+        position_calculator=None,
+        stop_loss_pct=params["stop_loss_pct"],
+        target_pct=params["target_pct"]
+    )
+
+
+def _init_worker(
+    layout: List[Tuple[str, str, str]],
+    length: int,
+    factory: Callable[[Dict], BaseStrategy],
+    max_loss_amount: float
+) -> None:
+    """
+    Attach to the shared price arrays and prepare the worker's engine.
+    
+    Args:
+        layout: (column, shared memory name, dtype) for every column
+        length: Number of bars
+        factory: Strategy factory
+        max_loss_amount: Max loss per trade for position sizing
+    """
+    columns = {}
+    for column, name, dtype in layout:
+        shm = shared_memory.SharedMemory(name=name)
+        # Keep the block mapped for the worker's lifetime; the frame is a view on it
+        _worker_blocks.append(shm)
+        columns[column] = np.ndarray((length,), dtype=dtype, buffer=shm.buf)
+    
+    columns['timestamp'] = columns['timestamp'].view('datetime64[ns]')
+    _setup_worker(columns, factory, max_loss_amount)
+
+
+def _init_worker_memmap(
+    path: str,
+    factory: Callable[[Dict], BaseStrategy],
+    max_loss_amount: float
+) -> None:
+    """
+    Map a MemmapCandleFile and prepare the worker's engine.
+    
+    Args:
+        path: Directory of the candle file
+        factory: Strategy factory
+        max_loss_amount: Max loss per trade for position sizing
+    """
+    candles = MemmapCandleFile(path).load()
+    columns = {'timestamp': candles.timestamps}
+    for column in _SHARED_COLUMNS[1:]:
+        columns[column] = candles.columns[column]
+    _setup_worker(columns, factory, max_loss_amount)
+
+
+def _setup_worker(
+    columns: Dict[str, np.ndarray],
+    factory: Callable[[Dict], BaseStrategy],
+    max_loss_amount: float
+) -> None:
+    """Build the worker's frame over the mapped columns without copying."""
+    global _worker_df, _worker_factory, _worker_engine
+    
+    _worker_df = pd.DataFrame(columns, copy=False)
+    _worker_df['volume'] = _worker_df['volume_to']
+    _worker_factory = factory
+    _worker_engine = BacktestEngine(PositionCalculator(max_loss_amount=max_loss_amount))
+
+
+def _run_batch(param_sets: List[Dict]) -> List[Dict]:
+    """
+    Backtest a batch of parameter sets inside a worker.
+    
+    Args:
+        param_sets: Parameter dictionaries
+        
+    Returns:
+        One result row (parameters + summary metrics) per parameter set
+    """
+    rows = []
+    for params in param_sets:
+        strategy = _worker_factory(params)
+        strategy.position_calculator = _worker_engine.position_calculator
+        summary = _worker_engine.run(strategy, _worker_df).summary()
+        rows.append({**params, **summary})
+    return rows
+
+
+class ParameterSweep:
+    """
+    Grid or random search over strategy parameters on a process pool.
+    
+    The OHLCV arrays are placed in shared memory once (or, for a
+    MemmapCandleFile, the file itself is mapped) and every worker maps
+    them at startup without copying, so tasks only carry parameter
+    dictionaries and memory use does not grow with the worker count.
+    Parameter sets are sent in batches to keep per-task overhead low, and
+    results are streamed back as batches complete.
+    """
+    
+    def __init__(
+        self,
+        strategy_factory: Callable[[Dict], BaseStrategy] = simple_strategy_factory,
+        max_loss_amount: float = 300.0,
+        max_workers: Optional[int] = None,
+        metric: str = "total_pnl"
+    ):
+        """
+        Initialize parameter sweep.
+        
+        Args:
+            strategy_factory: Picklable callable building a strategy from a
+                parameter dictionary (default: SimpleStopLossStrategy with
+                stop_loss_pct/target_pct)
+            max_loss_amount: Max loss per trade used for position sizing
+            max_workers: Worker processes (default: CPU count)
+            metric: Summary metric used to rank results (higher is better)
+        """
+        self.strategy_factory = strategy_factory
+        self.max_loss_amount = max_loss_amount
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.metric = metric
+    
+    @staticmethod
+    def grid(param_grid: Dict[str, Sequence]) -> List[Dict]:
+        """
+        Build every combination of the given parameter values.
+        
+        Args:
+            param_grid: Mapping of parameter name to candidate values
+            
+        Returns:
+            List of parameter dictionaries
+        """
+        names = list(param_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+    
+    @staticmethod
+    def random(
+        param_space: Dict[str, Union[Tuple[float, float], Sequence]],
+        n_samples: int,
+        seed: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Sample parameter sets at random.
+        
+        Args:
+            param_space: Mapping of parameter name to a (low, high) tuple for
+                uniform sampling or a list of discrete choices
+            n_samples: Number of parameter sets
+            seed: Random seed for reproducible sweeps
+            
+        Returns:
+            List of parameter dictionaries
+        """
+        rng = np.random.default_rng(seed)
+        samples: Dict[str, np.ndarray] = {}
+        for name, space in param_space.items():
+            if isinstance(space, tuple) and len(space) == 2:
+                samples[name] = rng.uniform(space[0], space[1], n_samples)
+            else:
+                choices = list(space)
+                samples[name] = np.array(choices, dtype=object)[rng.integers(0, len(choices), n_samples)]
+        return [
+            {name: values[i].item() if hasattr(values[i], 'item') else values[i] for name, values in samples.items()}
+            for i in range(n_samples)
+        ]
+    
+    def run(
+        self,
+        df: Union[pd.DataFrame, MemmapCandleFile],
+        param_sets: List[Dict],
+        batch_size: Optional[int] = None,
+        on_result: Optional[Callable[[Dict], Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Backtest every parameter set and rank the results.
+        
+        Args:
+            df: DataFrame in get_historical_ohlcv format, or a
+                MemmapCandleFile that workers map directly from disk
+            param_sets: Parameter dictionaries (see grid and random)
+            batch_size: Parameter sets per task (default: spread evenly, about
+                four tasks per worker)
+            on_result: Optional callback receiving each result row as soon as
+                its batch finishes
+            
+        Returns:
+            DataFrame with one row per parameter set (parameters and summary
+            metrics), sorted best first by the ranking metric
+            
+        Raises:
+            ValueError: If the data is empty or lacks an OHLCV column
+        """
+        if df is None or len(df) == 0:
+            raise ValueError("DataFrame is empty or None")
+        if not param_sets:
+            return pd.DataFrame()
+        
+        if batch_size is None:
+            batch_size = max(1, -(-len(param_sets) // (self.max_workers * 4)))
+        batches = [param_sets[i:i + batch_size] for i in range(0, len(param_sets), batch_size)]
+        
+        if isinstance(df, MemmapCandleFile):
+            # Appends keep the file sorted by time, so workers can map it as is
+            blocks = []
+            initializer = _init_worker_memmap
+            initargs = (str(df.path), self.strategy_factory, self.max_loss_amount)
+        else:
+            missing = [column for column in _SHARED_COLUMNS if column not in df.columns]
+            if missing:
+                raise ValueError(f"DataFrame is missing columns: {', '.join(missing)}")
+            df = df.sort_values('timestamp').reset_index(drop=True)
+            blocks, layout = self._share_arrays(df)
+            initializer = _init_worker
+            initargs = (layout, len(df), self.strategy_factory, self.max_loss_amount)
+        
+        rows: List[Dict] = []
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(batches)),
+                initializer=initializer,
+                initargs=initargs
+            ) as executor:
+                futures = [executor.submit(_run_batch, batch) for batch in batches]
+                for future in as_completed(futures):
+                    for row in future.result():
+                        rows.append(row)
+                        if on_result is not None:
+                            on_result(row)
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+        
+        results = pd.DataFrame(rows)
+        return results.sort_values(self.metric, ascending=False).reset_index(drop=True)
+    
+    @staticmethod
+    def _share_arrays(df: pd.DataFrame) -> Tuple[List[shared_memory.SharedMemory], List[Tuple[str, str, str]]]:
+        """
+        Copy the OHLCV columns into shared memory blocks.
+        
+        Args:
+            df: DataFrame in get_historical_ohlcv format
+            
+        Returns:
+            Tuple of (shared memory blocks, layout for the worker initializer)
+        """
+        blocks = []
+        layout = []
+        try:
+            for column in _SHARED_COLUMNS:
+                if column == 'timestamp':
+                    values = df['timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+                else:
+                    values = df[column].to_numpy(dtype=np.float64)
+                
+                shm = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+                blocks.append(shm)
+                np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+                layout.append((column, shm.name, values.dtype.str))
+        except BaseException:
+            # Release the blocks made so far; nothing else will unlink them
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+            raise
+        return blocks, layout
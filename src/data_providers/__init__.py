@@ -1,5 +1,26 @@
 """Data providers for fetching crypto market data."""
-from .base_provider import BaseDataProvider
+from .base_provider import AsyncBaseDataProvider, BaseDataProvider
+from .async_cryptocompare_provider import AsyncCryptoCompareProvider, AsyncRateLimiter
+from .cached_provider import CachedDataProvider
+from .candle_store import CandleStore
+from .candles import Candles
 from .cryptocompare_provider import CryptoCompareProvider
+from .memmap_candles import MemmapCandleFile
+from .resampler import OHLCVResampler, resample_ohlcv
+from .streaming_provider import LiveCandleBuilder, StreamingCryptoCompareProvider
 
-__all__ = ["BaseDataProvider", "CryptoCompareProvider"]
+__all__ = [
+    "AsyncBaseDataProvider",
+    "AsyncCryptoCompareProvider",
+    "AsyncRateLimiter",
+    "BaseDataProvider",
+    "CachedDataProvider",
+    "CandleStore",
+    "Candles",
+    "CryptoCompareProvider",
+    "LiveCandleBuilder",
+    "MemmapCandleFile",
+    "OHLCVResampler",
+    "resample_ohlcv",
+    "StreamingCryptoCompareProvider",
+]
@@ -0,0 +1,354 @@
+"""Asyncio CryptoCompare data provider with a pooled HTTP session."""
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Union
+import aiohttp
+import pandas as pd
+from ..metrics.registry import get_registry
+from .base_provider import AsyncBaseDataProvider
+from .cryptocompare_provider import CryptoCompareProvider
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter for asyncio tasks.
+    
+    The lock is bound to the event loop that uses it, so it is created on
+    first use in each loop; the token bucket carries over between loops.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            rate: Sustained requests per second
+            burst: Maximum requests allowed back to back (default: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        
+        self.rate = rate
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def reset(self) -> None:
+        """Drop the loop-bound lock (it is recreated in the next loop)."""
+        self._lock = None
+        self._loop = None
+    
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncCryptoCompareProvider(AsyncBaseDataProvider):
+    """
+    Asyncio counterpart of CryptoCompareProvider.
+    
+    All requests share one keep-alive ``aiohttp`` session. A semaphore caps
+    the number of requests in flight and a token bucket keeps the request
+    rate under the API limit. Use it as an async context manager, or call
+    ``close()`` when done. The session and semaphore belong to the event
+    loop that opened them and are recreated when the provider is used from
+    another loop (e.g., a later ``asyncio.run()``).
+    """
+    
+    BASE_URL = "https://min-api.cryptocompare.com"
+    
+    HISTO_ENDPOINTS = {
+        "minute": "/data/v2/histominute",
+        "hour": "/data/v2/histohour",
+        "day": "/data/v2/histoday",
+    }
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = BASE_URL,
+        max_concurrency: int = 10,
+        rate_limit: float = 20.0,
+        burst: Optional[int] = None,
+        timeout: float = 10.0
+    ):
+        """
+        Initialize async CryptoCompare provider.
+        
+        Args:
+            api_key: Optional API key for higher rate limits
+            base_url: API root URL (point at a local stub server for testing)
+            max_concurrency: Maximum requests in flight (also the connection pool size)
+            rate_limit: Maximum requests per second
+            burst: Requests allowed back to back before rate limiting applies
+            timeout: Total timeout per request in seconds
+        """
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.rate_limiter = AsyncRateLimiter(rate_limit, burst)
+        # Loop-bound objects, created with the session by _get_session
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def __aenter__(self) -> "AsyncCryptoCompareProvider":
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use in the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            await self._release_session()
+        if self._session is None or self._session.closed:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def _release_session(self) -> None:
+        """
+        Close the session, including one opened by another event loop.
+        
+        A session whose loop still runs (in another thread) is closed in
+        that loop. Once its loop has closed (e.g., the end of an earlier
+        ``asyncio.run()``), its connections cannot be shut down gracefully
+        from this loop; closing then only marks the session and connector
+        closed, so aiohttp does not report an unclosed session, and the
+        sockets are released when garbage collected. Call ``close()``
+        before the loop ends to close the connections cleanly.
+        """
+        session, loop = self._session, self._loop
+        self._session = None
+        if session is None or session.closed:
+            return
+        
+        if loop is None or loop is asyncio.get_running_loop() or loop.is_closed():
+            await session.close()
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            # Idle loop: the close runs the next time that loop runs
+            loop.create_task(session.close())
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP session and drop the loop-bound state."""
+        await self._release_session()
+        self._semaphore = None
+        self._loop = None
+        self.rate_limiter.reset()
+    
+    async def _request(self, path: str, params: Dict) -> Optional[Dict]:
+        """
+        Send a GET request through the concurrency and rate limiters.
+        
+        Args:
+            path: Endpoint path (e.g., '/data/price')
+            params: Query parameters
+            
+        Returns:
+            Decoded JSON response or None on API error
+        """
+        if self.api_key:
+            params = {**params, "api_key": self.api_key}
+        
+        session = await self._get_session()
+        async with self._semaphore:
+            await self.rate_limiter.acquire()
+            async with session.get(self.base_url + path, params=params) as response:
+                response.raise_for_status()
+                body = await response.read()
+        
+        registry = get_registry()
+        if registry is not None:
+            registry.record_bytes("provider", type(self).__name__, path, len(body))
+        data = json.loads(body) if body.strip() else None
+        
+        if isinstance(data, dict) and data.get("Response") == "Error":
+            print(f"[ERROR] {data.get('Message')}")
+            return None
+        return data
+    
+    async def get_current_price(self, symbol: str, currency: str = "USD") -> Optional[float]:
+        """
+        Get current price from CryptoCompare.
+        
+        Args:
+            symbol: Crypto symbol (e.g., 'BTC', 'ETH')
+            currency: Quote currency (default: 'USD')
+            
+        Returns:
+            Current price or None if request fails
+        """
+        try:
+            data = await self._request(
+                "/data/price",
+                {"fsym": symbol.upper(), "tsyms": currency.upper()}
+            )
+            if data and currency.upper() in data:
+                return float(data[currency.upper()])
+            return None
+        except Exception as e:
+            print(f"Error fetching price for {symbol}/{currency}: {e}")
+            return None
+    
+    async def get_current_prices(
+        self,
+        symbols: List[str],
+        currencies: Union[str, List[str]] = "USD"
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Get current prices for many symbols using the pricemulti endpoint.
+        
+        Symbols are packed the same way as CryptoCompareProvider.get_current_prices
+        and the resulting requests are sent concurrently.
+        
+        Args:
+            symbols: Crypto symbols (e.g., ['BTC', 'ETH'])
+            currencies: Quote currency or list of quote currencies (default: 'USD')
+            
+        Returns:
+            Nested dictionary {SYMBOL: {CURRENCY: price}}; pairs that fail are omitted
+        """
+        if isinstance(currencies, str):
+            currencies = [currencies]
+        
+        requests = [
+            {"fsyms": ",".join(fsyms), "tsyms": ",".join(tsyms)}
+            for fsyms in CryptoCompareProvider._pack_symbols(symbols, CryptoCompareProvider.MAX_FSYMS_CHARS)
+            for tsyms in CryptoCompareProvider._pack_symbols(currencies, CryptoCompareProvider.MAX_TSYMS_CHARS)
+        ]
+        responses = await asyncio.gather(
+            *(self._request("/data/pricemulti", params) for params in requests),
+            return_exceptions=True
+        )
+        
+        prices: Dict[str, Dict[str, float]] = {}
+        for params, data in zip(requests, responses):
+            if isinstance(data, Exception):
+                print(f"Error fetching prices for {params['fsyms']}: {data}")
+                continue
+            if not data:
+                continue
+            for symbol, quotes in data.items():
+                if isinstance(quotes, dict):
+                    prices.setdefault(symbol, {}).update(
+                        {cur: float(value) for cur, value in quotes.items()}
+                    )
+        return prices
+    
+    async def get_market_data(self, symbol: str, currency: str = "USD") -> Optional[Dict]:
+        """
+        Get comprehensive market data from CryptoCompare.
+        
+        The price and daily history requests are sent concurrently.
+        
+        Args:
+            symbol: Crypto symbol
+            currency: Quote currency
+            
+        Returns:
+            Dictionary with price, volume, change data or None
+        """
+        try:
+            price, hist_data = await asyncio.gather(
+                self.get_current_price(symbol, currency),
+                self._fetch_ohlcv(symbol, currency, "day", limit=1)
+            )
+            if price is None:
+                return None
+            
+            return CryptoCompareProvider._market_data_from_history(symbol, currency, price, hist_data)
+        except Exception as e:
+            print(f"Error fetching market data for {symbol}/{currency}: {e}")
+            return None
+    
+    async def _fetch_ohlcv(
+        self,
+        symbol: str,
+        currency: str,
+        timeframe: str,
+        limit: int,
+        to_ts: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Fetch raw OHLCV bars from the API.
+        
+        Args:
+            symbol: Crypto symbol
+            currency: Quote currency
+            timeframe: Time interval - 'minute', 'hour', 'day'
+            limit: Number of data points to fetch
+            to_ts: Epoch seconds of the last bar to return (default: now)
+            
+        Returns:
+            List of bar dictionaries as returned by the API, or None
+            
+        Raises:
+            ValueError: If the timeframe is not supported
+        """
+        if timeframe not in self.HISTO_ENDPOINTS:
+            raise ValueError(f"Invalid timeframe: {timeframe}. Use 'minute', 'hour', or 'day'.")
+        
+        data = await self._request(self.HISTO_ENDPOINTS[timeframe], {
+            "fsym": symbol.upper(),
+            "tsym": currency.upper(),
+            "limit": limit,
+            "toTs": int(time.time()) if to_ts is None else to_ts,
+        })
+        if not data:
+            return None
+        return data["Data"]["Data"]
+    
+    async def get_historical_ohlcv(
+        self,
+        symbol: str,
+        currency: str = "USD",
+        timeframe: str = "hour",
+        limit: int = 100
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get historical OHLCV (Open, High, Low, Close, Volume) data.
+        
+        Args:
+            symbol: Crypto symbol (e.g., 'BTC', 'ETH')
+            currency: Quote currency (default: 'USD')
+            timeframe: Time interval - 'minute', 'hour', 'day' (default: 'hour')
+            limit: Number of data points to fetch (default: 100)
+            
+        Returns:
+            DataFrame with the same columns as CryptoCompareProvider.get_historical_ohlcv
+            or None if request fails
+        """
+        try:
+            data = await self._fetch_ohlcv(symbol, currency, timeframe, limit)
+            if not data:
+                return None
+            return CryptoCompareProvider._ohlcv_to_dataframe(data)
+        except Exception as e:
+            print(f"Error fetching historical data for {symbol}/{currency}: {e}")
+            return None
@@ -1,11 +1,38 @@
 """Base data provider interface for crypto price data."""
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
+from ..metrics.registry import instrument_methods
+
+
+# Provider methods measured while metrics are enabled (see src.metrics);
+# they print errors and return None, so a None result counts as an error.
+# Only the outermost call per provider is recorded, so get_market_data is
+# not counted again as the get_current_price it makes.
+INSTRUMENTED_METHODS = (
+    "get_current_price",
+    "get_current_prices",
+    "get_market_data",
+    "get_historical_ohlcv",
+    "get_historical_candles",
+    "get_historical_ohlcv_range",
+    "get_ohlcv_multi_timeframe",
+    "get_ohlcv_grid",
+    "get_quotes",
+    "get_live_candles",
+)
 
 
 class BaseDataProvider(ABC):
     """Abstract base class for data providers."""
     
+    # Measure INSTRUMENTED_METHODS of subclasses as 'provider' calls
+    INSTRUMENT_CALLS = True
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.INSTRUMENT_CALLS:
+            instrument_methods(cls, INSTRUMENTED_METHODS, "provider", none_is_error=True, nested=False)
+    
     @abstractmethod
     def get_current_price(self, symbol: str, currency: str = "USD") -> Optional[float]:
         """
@@ -33,3 +60,71 @@ class BaseDataProvider(ABC):
             Dictionary with market data or None
         """
         pass
+    
+    def get_current_prices(
+        self,
+        symbols: List[str],
+        currencies: Union[str, List[str]] = "USD"
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Get current prices for many symbols at once.
+        
+        The default implementation calls get_current_price once per pair;
+        providers with a batch endpoint should override it.
+        
+        Args:
+            symbols: Trading symbols (e.g., ['BTC', 'ETH'])
+            currencies: Quote currency or list of quote currencies
+            
+        Returns:
+            Nested dictionary {SYMBOL: {CURRENCY: price}}; unavailable pairs are omitted
+        """
+        if isinstance(currencies, str):
+            currencies = [currencies]
+        
+        prices: Dict[str, Dict[str, float]] = {}
+        for symbol in symbols:
+            for currency in currencies:
+                price = self.get_current_price(symbol, currency)
+                if price is not None:
+                    prices.setdefault(symbol.upper(), {})[currency.upper()] = price
+        return prices
+
+
+instrument_methods(BaseDataProvider, ["get_current_prices"], "provider", none_is_error=True, nested=False)
+
+
+class AsyncBaseDataProvider(ABC):
+    """Abstract base class for asyncio data providers."""
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_methods(cls, INSTRUMENTED_METHODS, "provider", none_is_error=True, nested=False)
+    
+    @abstractmethod
+    async def get_current_price(self, symbol: str, currency: str = "USD") -> Optional[float]:
+        """
+        Get current price for a symbol.
+        
+        Args:
+            symbol: Trading symbol (e.g., 'BTC', 'ETH')
+            currency: Quote currency (default: 'USD')
+            
+        Returns:
+            Current price or None if unavailable
+        """
+        pass
+    
+    @abstractmethod
+    async def get_market_data(self, symbol: str, currency: str = "USD") -> Optional[Dict]:
+        """
+        Get comprehensive market data.
+        
+        Args:
+            symbol: Trading symbol
+            currency: Quote currency
+            
+        Returns:
+            Dictionary with market data or None
+        """
+        pass
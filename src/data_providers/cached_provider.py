@@ -0,0 +1,275 @@
+"""In-memory caching wrapper for data providers."""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from ..metrics.registry import get_registry
+from .base_provider import BaseDataProvider
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of a call argument (lists and tuples become tuples, dicts sorted item tuples)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((name, _freeze(item)) for name, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+class _InFlight:
+    """A request currently being fetched, shared by concurrent callers."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class CachedDataProvider(BaseDataProvider):
+    """
+    Wrap a data provider with a TTL + LRU cache and request coalescing.
+    
+    Identical calls made within a method's TTL are answered from memory.
+    Concurrent identical calls that miss the cache share one upstream
+    request (single flight). Methods not listed in ``ttls`` pass straight
+    through to the wrapped provider.
+    """
+    
+    # Lookups are recorded as 'cache' metrics and the wrapped provider
+    # measures its own calls, so the wrapper is not a 'provider' as well
+    INSTRUMENT_CALLS = False
+    
+    DEFAULT_TTLS = {
+        "get_current_price": 5.0,
+        "get_market_data": 30.0,
+    }
+    
+    def __init__(
+        self,
+        provider: BaseDataProvider,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize caching provider.
+        
+        Args:
+            provider: Data provider to wrap
+            ttls: Seconds to cache each method's results, keyed by method name
+                (default: DEFAULT_TTLS). Any provider method can be listed,
+                e.g. 'get_historical_ohlcv'.
+            max_entries: Maximum cached results before least recently used
+                entries are evicted
+            clock: Monotonic time source (overridable for testing)
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        
+        self.provider = provider
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Tuple, _InFlight] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+    
+    def get_current_price(self, symbol: str, currency: str = "USD") -> Optional[float]:
+        """
+        Get current price, served from cache while fresh.
+        
+        Args:
+            symbol: Trading symbol (e.g., 'BTC', 'ETH')
+            currency: Quote currency (default: 'USD')
+            
+        Returns:
+            Current price or None if unavailable
+        """
+        return self._call("get_current_price", (symbol.upper(), currency.upper()), {})
+    
+    def get_market_data(self, symbol: str, currency: str = "USD") -> Optional[Dict]:
+        """
+        Get comprehensive market data, served from cache while fresh.
+        
+        Args:
+            symbol: Trading symbol
+            currency: Quote currency
+            
+        Returns:
+            Dictionary with market data or None
+        """
+        return self._call("get_market_data", (symbol.upper(), currency.upper()), {})
+    
+    def get_current_prices(
+        self,
+        symbols: List[str],
+        currencies: Union[str, List[str]] = "USD",
+        **kwargs
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Get prices for many symbols in one batched upstream call.
+        
+        Batches are not cached as a whole, but every returned price is stored
+        as a get_current_price entry so later single-symbol lookups hit.
+        
+        Args:
+            symbols: Trading symbols
+            currencies: Quote currency or list of quote currencies
+            **kwargs: Extra arguments for the wrapped provider
+            
+        Returns:
+            Nested dictionary {SYMBOL: {CURRENCY: price}} (or the wrapped provider's format)
+        """
+        prices = self.provider.get_current_prices(symbols, currencies, **kwargs)
+        ttl = self.ttls.get("get_current_price")
+        if not ttl or ttl <= 0 or not isinstance(prices, dict):
+            return prices
+        
+        expires = self._clock() + ttl
+        with self._lock:
+            for symbol, quotes in prices.items():
+                for currency, price in quotes.items():
+                    key = ("get_current_price", (symbol.upper(), currency.upper()), ())
+                    self._entries[key] = (expires, price)
+                    self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return prices
+    
+    def __getattr__(self, name: str):
+        """Delegate other attributes to the wrapped provider, caching listed methods."""
+        if name.startswith("_") or "provider" not in self.__dict__:
+            raise AttributeError(name)
+        
+        attr = getattr(self.provider, name)
+        if name not in self.ttls or not callable(attr):
+            return attr
+        
+        def cached_method(*args, **kwargs):
+            return self._call(name, args, kwargs)
+        
+        cached_method.__name__ = name
+        cached_method.__doc__ = attr.__doc__
+        return cached_method
+    
+    def _call(self, method: str, args: Tuple, kwargs: Dict) -> Any:
+        """
+        Run a provider method through the cache.
+        
+        Args:
+            method: Provider method name
+            args: Positional arguments
+            kwargs: Keyword arguments
+            
+        Returns:
+            Method result (a copy for mutable results)
+        """
+        ttl = self.ttls.get(method)
+        if not ttl or ttl <= 0:
+            return getattr(self.provider, method)(*args, **kwargs)
+        
+        key = (method, _freeze(args), _freeze(kwargs))
+        try:
+            hash(key)
+        except TypeError:
+            # Arguments that cannot be part of a key are not cached
+            return getattr(self.provider, method)(*args, **kwargs)
+        
+        with self._lock:
+            stats = self._stats.setdefault(method, {"hits": 0, "misses": 0, "coalesced": 0})
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                stats["hits"] += 1
+                self._record_lookup(method, "hit")
+                return self._copy(entry[1])
+            
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                stats["coalesced"] += 1
+                self._record_lookup(method, "coalesced")
+                leader = False
+            else:
+                stats["misses"] += 1
+                self._record_lookup(method, "miss")
+                flight = _InFlight()
+                self._in_flight[key] = flight
+                leader = True
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return self._copy(flight.result)
+        
+        try:
+            flight.result = getattr(self.provider, method)(*args, **kwargs)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                # Failed lookups (None) are not cached so the next call retries
+                if flight.error is None and flight.result is not None:
+                    self._entries[key] = (self._clock() + ttl, flight.result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+        
+        return self._copy(flight.result)
+    
+    def _record_lookup(self, method: str, result: str) -> None:
+        """Report a cache lookup to the active metrics registry, if any."""
+        registry = get_registry()
+        if registry is not None:
+            registry.record_cache(type(self).__name__, method, result)
+    
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        """
+        Deep-copy mutable results so callers cannot alter cached values.
+        
+        Nested containers are copied too: the dicts inside market data or
+        batched prices, and the DataFrames inside a (data, errors) tuple.
+        """
+        if value is None or isinstance(value, (int, float, str, bytes)):
+            return value
+        return copy.deepcopy(value)
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get cache statistics per method.
+        
+        Returns:
+            Dictionary mapping method name to hits, misses, coalesced and hit_rate
+        """
+        with self._lock:
+            result = {}
+            for method, counts in self._stats.items():
+                total = counts["hits"] + counts["misses"] + counts["coalesced"]
+                served = counts["hits"] + counts["coalesced"]
+                result[method] = {
+                    **counts,
+                    "hit_rate": served / total if total else 0.0,
+                }
+            return result
+    
+    def invalidate(self, method: Optional[str] = None) -> None:
+        """
+        Drop cached results.
+        
+        Args:
+            method: Only drop results of this method (None drops everything)
+        """
+        with self._lock:
+            if method is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == method]:
+                    del self._entries[key]
@@ -0,0 +1,188 @@
+"""Persistent on-disk store for closed OHLCV candles."""
+import shutil
+from pathlib import Path
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+class CandleStore:
+    """
+    Columnar on-disk store of closed candles keyed by (symbol, currency, timeframe).
+    
+    Each key maps to a directory holding one MemmapCandleFile, so the store
+    can be read back without parsing and extended by a data provider that
+    only fetches the bars it is missing: new bars are written at the end of
+    the column files instead of rewriting the series.
+    """
+    
+    TIMEFRAME_SECONDS = {
+        "minute": 60,
+        "hour": 3600,
+        "day": 86400,
+    }
+    
+    COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume_from', 'volume_to']
+    
+    def __init__(self, root_dir: str = ".candle_cache"):
+        """
+        Initialize candle store.
+        
+        Args:
+            root_dir: Directory where candle files are kept (created on demand)
+        """
+        self.root_dir = Path(root_dir)
+    
+    def _key_dir(self, symbol: str, currency: str, timeframe: str) -> Path:
+        """Get the directory holding the columns for one series."""
+        return self.root_dir / f"{symbol.upper()}_{currency.upper()}" / timeframe
+    
+    def _file(self, symbol: str, currency: str, timeframe: str) -> "MemmapCandleFile":
+        """Get the candle file of one series."""
+        # memmap_candles builds on this module, so import it on use
+        from .memmap_candles import MemmapCandleFile
+        return MemmapCandleFile(self._key_dir(symbol, currency, timeframe))
+    
+    @staticmethod
+    def to_epoch_seconds(timestamps: pd.Series) -> np.ndarray:
+        """
+        Convert a datetime column to integer epoch seconds.
+        
+        Args:
+            timestamps: Series of datetime64 values
+            
+        Returns:
+            int64 array of seconds since the epoch
+        """
+        return ((timestamps - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+    
+    @staticmethod
+    def to_dataframe(columns: dict) -> pd.DataFrame:
+        """
+        Build a DataFrame in the format returned by ``get_historical_ohlcv``.
+        
+        Args:
+            columns: Mapping of column name to array, including 'time' in epoch seconds
+            
+        Returns:
+            DataFrame with columns: timestamp, open, high, low, close,
+            volume_from, volume_to, volume
+        """
+        df = pd.DataFrame({
+            'timestamp': pd.to_datetime(columns['time'], unit='s'),
+            'open': columns['open'],
+            'high': columns['high'],
+            'low': columns['low'],
+            'close': columns['close'],
+            'volume_from': columns['volume_from'],
+            'volume_to': columns['volume_to'],
+        })
+        df['volume'] = df['volume_to']
+        return df
+    
+    def load(self, symbol: str, currency: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """
+        Load all stored candles for a series.
+        
+        Args:
+            symbol: Crypto symbol (e.g., 'BTC')
+            currency: Quote currency (e.g., 'USD')
+            timeframe: Time interval ('minute', 'hour', 'day')
+            
+        Returns:
+            DataFrame sorted by timestamp, or None if nothing is stored
+        """
+        candle_file = self._file(symbol, currency, timeframe)
+        if not candle_file.exists():
+            return None
+        
+        try:
+            candles = candle_file.load()
+            if len(candles) == 0:
+                return None
+            return candles.to_dataframe()
+        except (OSError, ValueError) as e:
+            print(f"Error reading candle store for {symbol}/{currency} {timeframe}: {e}")
+            return None
+    
+    def last_time(self, symbol: str, currency: str, timeframe: str) -> Optional[int]:
+        """
+        Get the open time of the newest stored candle.
+        
+        Args:
+            symbol: Crypto symbol
+            currency: Quote currency
+            timeframe: Time interval
+            
+        Returns:
+            Epoch seconds of the last stored candle or None
+        """
+        candle_file = self._file(symbol, currency, timeframe)
+        if not candle_file.exists():
+            return None
+        times = candle_file.load().time
+        return int(times[-1]) if len(times) else None
+    
+    def write(self, symbol: str, currency: str, timeframe: str, df: pd.DataFrame) -> None:
+        """
+        Replace the stored series with the given candles.
+        
+        Args:
+            symbol: Crypto symbol
+            currency: Quote currency
+            timeframe: Time interval
+            df: DataFrame in ``get_historical_ohlcv`` format
+        """
+        self._file(symbol, currency, timeframe).write(df)
+    
+    def append(self, symbol: str, currency: str, timeframe: str, df: pd.DataFrame) -> None:
+        """
+        Merge candles into the stored series.
+        
+        Bars newer than the stored series are written at the end of the
+        column files and a bar at the last stored time replaces it, so a tail
+        refresh costs O(new bars). Candles are closed and immutable, so other
+        bars already stored are kept as they are. Only bars the store lacks
+        further back (older history or gaps) make it merge and rewrite the
+        series.
+        
+        Args:
+            symbol: Crypto symbol
+            currency: Quote currency
+            timeframe: Time interval
+            df: DataFrame in ``get_historical_ohlcv`` format
+        """
+        if df is None or df.empty:
+            return
+        
+        candle_file = self._file(symbol, currency, timeframe)
+        if candle_file.exists() and len(candle_file):
+            stored_times = candle_file.load().time
+            times = self.to_epoch_seconds(df['timestamp'])
+            older = times[times < stored_times[-1]]
+            # Stored times are sorted, so membership is a binary search per bar
+            positions = np.searchsorted(stored_times, older)
+            if np.array_equal(stored_times[positions], older):
+                candle_file.append(df)
+                return
+            df = pd.concat([candle_file.to_dataframe(), df], ignore_index=True)
+        candle_file.write(df)
+    
+    def clear(self, symbol: Optional[str] = None, currency: str = "USD", timeframe: Optional[str] = None) -> None:
+        """
+        Delete stored candles.
+        
+        Args:
+            symbol: Symbol to clear (None clears the whole store)
+            currency: Quote currency of the symbol
+            timeframe: Timeframe to clear (None clears all timeframes of the symbol)
+        """
+        if symbol is None:
+            target = self.root_dir
+        elif timeframe is None:
+            target = self.root_dir / f"{symbol.upper()}_{currency.upper()}"
+        else:
+            target = self._key_dir(symbol, currency, timeframe)
+        
+        if target.exists():
+            shutil.rmtree(target)
@@ -0,0 +1,263 @@
+"""Compact columnar OHLCV container backed by contiguous NumPy arrays."""
+from typing import Dict, Iterator, List, Optional, Union
+import numpy as np
+import pandas as pd
+from .candle_store import CandleStore
+
+
+# API field name for each column
+_API_FIELDS = {
+    'time': 'time',
+    'open': 'open',
+    'high': 'high',
+    'low': 'low',
+    'close': 'close',
+    'volume_from': 'volumefrom',
+    'volume_to': 'volumeto',
+}
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume_from', 'volume_to']
+
+
+class Candles:
+    """
+    OHLCV bars as one contiguous array per column.
+    
+    Times are int64 epoch seconds and prices/volumes share one float dtype
+    (float64 by default, float32 to halve memory). There is no duplicated
+    ``volume`` column; it is added only by to_dataframe(). Slicing with a
+    step-less slice, window() and tail() return views that share memory
+    with the original, so strategies and indicators can work on recent
+    history without copying it.
+    """
+    
+    def __init__(
+        self,
+        time: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume_from: np.ndarray,
+        volume_to: np.ndarray,
+        dtype: Union[str, np.dtype, None] = None
+    ):
+        """
+        Initialize candle container.
+        
+        Arrays that already have the target dtype are used without copying.
+        
+        Args:
+            time: Bar open times in epoch seconds
+            open: Open prices
+            high: High prices
+            low: Low prices
+            close: Close prices
+            volume_from: Volume in base units
+            volume_to: Volume in quote units
+            dtype: Float dtype for prices and volumes (default: dtype of close,
+                or float64 for non-float input)
+        """
+        if dtype is None:
+            close_dtype = np.asarray(close).dtype
+            dtype = close_dtype if close_dtype in (np.float32, np.float64) else np.float64
+        self.dtype = np.dtype(dtype)
+        
+        self.time = np.asarray(time, dtype=np.int64)
+        self.open = np.asarray(open, dtype=self.dtype)
+        self.high = np.asarray(high, dtype=self.dtype)
+        self.low = np.asarray(low, dtype=self.dtype)
+        self.close = np.asarray(close, dtype=self.dtype)
+        self.volume_from = np.asarray(volume_from, dtype=self.dtype)
+        self.volume_to = np.asarray(volume_to, dtype=self.dtype)
+        
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All candle columns must have the same length")
+    
+    @classmethod
+    def empty(cls, dtype: Union[str, np.dtype] = np.float64) -> "Candles":
+        """Create a container with no bars."""
+        return cls(np.empty(0, np.int64), *[np.empty(0, dtype) for _ in PRICE_COLUMNS], dtype=dtype)
+    
+    @classmethod
+    def from_api(cls, data: List[Dict], dtype: Union[str, np.dtype] = np.float64) -> "Candles":
+        """
+        Build candles straight from the API's list of bar dictionaries.
+        
+        Each column is filled in one pass into its final dtype, with no
+        intermediate DataFrame.
+        
+        Args:
+            data: Bars as returned by the histominute/histohour/histoday endpoints
+            dtype: Float dtype for prices and volumes
+            
+        Returns:
+            Candles in API order
+        """
+        count = len(data)
+        columns = {
+            col: np.fromiter(
+                (bar[field] for bar in data),
+                dtype=np.int64 if col == 'time' else dtype,
+                count=count
+            )
+            for col, field in _API_FIELDS.items()
+        }
+        return cls(**columns, dtype=dtype)
+    
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, dtype: Union[str, np.dtype] = np.float64) -> "Candles":
+        """
+        Build candles from a DataFrame in get_historical_ohlcv format.
+        
+        Args:
+            df: OHLCV DataFrame
+            dtype: Float dtype for prices and volumes
+            
+        Returns:
+            Candles in DataFrame row order
+        """
+        if df is None or df.empty:
+            return cls.empty(dtype)
+        
+        columns = {col: df[col].to_numpy(dtype=dtype) for col in PRICE_COLUMNS}
+        return cls(CandleStore.to_epoch_seconds(df['timestamp']), **columns, dtype=dtype)
+    
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Mapping of column name to array (the arrays themselves, not copies)."""
+        return {
+            'time': self.time,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume_from': self.volume_from,
+            'volume_to': self.volume_to,
+        }
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Bar open times as datetime64[s] (a view of the time column)."""
+        return self.time.view('datetime64[s]')
+    
+    @property
+    def nbytes(self) -> int:
+        """Total memory used by the column arrays."""
+        return sum(values.nbytes for values in self.columns.values())
+    
+    def __len__(self) -> int:
+        return len(self.time)
+    
+    def __repr__(self) -> str:
+        return f"Candles(len={len(self)}, dtype={self.dtype})"
+    
+    def __getitem__(self, index) -> "Candles":
+        """
+        Select bars by slice, index array or boolean mask.
+        
+        Step-less slices return views; index arrays and masks copy.
+        """
+        if isinstance(index, (int, np.integer)):
+            index = slice(index, index + 1 or None)
+        return Candles(**{col: values[index] for col, values in self.columns.items()}, dtype=self.dtype)
+    
+    def window(self, start: int, stop: Optional[int] = None) -> "Candles":
+        """
+        Get a zero-copy view of bars [start, stop).
+        
+        Args:
+            start: First bar index (negative counts from the end)
+            stop: End bar index, exclusive (default: end of data)
+            
+        Returns:
+            Candles sharing memory with this container
+        """
+        return self[start:stop]
+    
+    def tail(self, n: int) -> "Candles":
+        """
+        Get a zero-copy view of the last n bars.
+        
+        Args:
+            n: Number of bars
+            
+        Returns:
+            Candles sharing memory with this container
+        """
+        return self[max(0, len(self) - n):]
+    
+    def sliding_windows(self, column: str, size: int) -> np.ndarray:
+        """
+        Get every window of ``size`` consecutive values as rows of a 2-D view.
+        
+        Args:
+            column: Column name (e.g., 'close')
+            size: Window length
+            
+        Returns:
+            Read-only array of shape (len - size + 1, size) without copying
+        """
+        return np.lib.stride_tricks.sliding_window_view(self.columns[column], size)
+    
+    def iter_windows(self, size: int, step: int = 1) -> Iterator["Candles"]:
+        """
+        Iterate over zero-copy windows of ``size`` bars.
+        
+        Args:
+            size: Window length
+            step: Bars between window starts
+            
+        Yields:
+            Candles views, oldest window first
+        """
+        for start in range(0, len(self) - size + 1, step):
+            yield self[start:start + size]
+    
+    def astype(self, dtype: Union[str, np.dtype]) -> "Candles":
+        """
+        Convert prices and volumes to another float dtype.
+        
+        Args:
+            dtype: Target float dtype
+            
+        Returns:
+            New Candles (self if the dtype already matches)
+        """
+        if np.dtype(dtype) == self.dtype:
+            return self
+        return Candles(**self.columns, dtype=dtype)
+    
+    def copy(self) -> "Candles":
+        """Get a copy that does not share memory with this container."""
+        return Candles(**{col: values.copy() for col, values in self.columns.items()}, dtype=self.dtype)
+    
+    @staticmethod
+    def concat(parts: List["Candles"]) -> "Candles":
+        """
+        Join candle containers end to end.
+        
+        Args:
+            parts: Containers to join (at least one)
+            
+        Returns:
+            New Candles with the dtype of the first part
+        """
+        if not parts:
+            raise ValueError("Nothing to concatenate")
+        dtype = parts[0].dtype
+        return Candles(
+            **{col: np.concatenate([part.columns[col] for part in parts]) for col in _API_FIELDS},
+            dtype=dtype
+        )
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Convert to the DataFrame format returned by get_historical_ohlcv.
+        
+        Returns:
+            DataFrame with columns: timestamp, open, high, low, close,
+            volume_from, volume_to, volume
+        """
+        return CandleStore.to_dataframe(self.columns)
@@ -1,23 +1,39 @@
 """CryptoCompare API data provider implementation."""
 import cryptocompare
-from typing import Dict, Optional, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, List, Tuple, Union
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from .base_provider import BaseDataProvider
+from .candle_store import CandleStore
+from .candles import Candles
+from .resampler import RESAMPLE_SECONDS, base_timeframe_for, resample_ohlcv
 
 
 class CryptoCompareProvider(BaseDataProvider):
     """Data provider using CryptoCompare library."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Most bars the histo endpoints return per request
+    MAX_BARS_PER_REQUEST = 2000
+    
+    # pricemulti length limits for the comma-separated fsyms/tsyms parameters
+    MAX_FSYMS_CHARS = 300
+    MAX_TSYMS_CHARS = 100
+    
+    def __init__(self, api_key: Optional[str] = None, candle_store: Optional[CandleStore] = None):
         """
         Initialize CryptoCompare provider.
         
         Args:
             api_key: Optional API key for higher rate limits
+            candle_store: Optional on-disk store; when set, closed candles are
+                served from disk and only the missing tail is fetched
         """
         if api_key:
             cryptocompare.cryptocompare._set_api_key_parameter(api_key)
+        self.candle_store = candle_store
     
     def get_current_price(self, symbol: str, currency: str = "USD") -> Optional[float]:
         """
@@ -39,6 +55,81 @@ class CryptoCompareProvider(BaseDataProvider):
             print(f"Error fetching price for {symbol}/{currency}: {e}")
             return None
     
+    def get_current_prices(
+        self,
+        symbols: List[str],
+        currencies: Union[str, List[str]] = "USD",
+        as_dataframe: bool = False
+    ) -> Union[Dict[str, Dict[str, float]], pd.DataFrame]:
+        """
+        Get current prices for many symbols using the pricemulti endpoint.
+        
+        Symbols and currencies are packed into as few requests as the API's
+        parameter length limits allow, so 100 pairs typically take one or
+        two requests.
+        
+        Args:
+            symbols: Crypto symbols (e.g., ['BTC', 'ETH'])
+            currencies: Quote currency or list of quote currencies (default: 'USD')
+            as_dataframe: Return a DataFrame (symbols x currencies) instead of a dict
+            
+        Returns:
+            Nested dictionary {SYMBOL: {CURRENCY: price}} or DataFrame;
+            pairs that fail are omitted
+        """
+        if isinstance(currencies, str):
+            currencies = [currencies]
+        
+        fsym_chunks = self._pack_symbols(symbols, self.MAX_FSYMS_CHARS)
+        tsym_chunks = self._pack_symbols(currencies, self.MAX_TSYMS_CHARS)
+        
+        prices: Dict[str, Dict[str, float]] = {}
+        for fsyms in fsym_chunks:
+            for tsyms in tsym_chunks:
+                try:
+                    data = cryptocompare.get_price(fsyms, currency=tsyms)
+                except Exception as e:
+                    print(f"Error fetching prices for {','.join(fsyms)}: {e}")
+                    continue
+                if not data:
+                    continue
+                for symbol, quotes in data.items():
+                    if isinstance(quotes, dict):
+                        prices.setdefault(symbol, {}).update(
+                            {cur: float(value) for cur, value in quotes.items()}
+                        )
+        
+        if as_dataframe:
+            return pd.DataFrame.from_dict(prices, orient='index')
+        return prices
+    
+    @staticmethod
+    def _pack_symbols(symbols: List[str], max_chars: int) -> List[List[str]]:
+        """
+        Split symbols into groups whose comma-joined length fits a URL parameter limit.
+        
+        Args:
+            symbols: Symbols to pack (upper-cased and deduplicated, order kept)
+            max_chars: Maximum length of each comma-joined group
+            
+        Returns:
+            List of symbol groups
+        """
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        length = 0
+        for symbol in dict.fromkeys(s.upper() for s in symbols):
+            extra = len(symbol) + (1 if current else 0)
+            if current and length + extra > max_chars:
+                chunks.append(current)
+                current, length = [], 0
+                extra = len(symbol)
+            current.append(symbol)
+            length += extra
+        if current:
+            chunks.append(current)
+        return chunks
+    
     def get_market_data(self, symbol: str, currency: str = "USD") -> Optional[Dict]:
         """
         Get comprehensive market data from CryptoCompare.
@@ -60,41 +151,63 @@ class CryptoCompareProvider(BaseDataProvider):
             hist_data = cryptocompare.get_historical_price_day(
                 symbol.upper(), 
                 currency.upper(), 
-                limit=1
+                limit=1,
+                toTs=int(time.time())
             )
             
-            if not hist_data:
-                return {
-                    "symbol": symbol.upper(),
-                    "currency": currency.upper(),
-                    "price": price,
-                    "volume_24h": None,
-                    "change_24h": None,
-                    "change_pct_24h": None,
-                    "high_24h": None,
-                    "low_24h": None,
-                    "market_cap": None,
-                }
-            
-            latest = hist_data[0] if hist_data else {}
-            open_price = latest.get('open', price)
-            change_24h = price - open_price if open_price else None
-            change_pct_24h = ((price - open_price) / open_price * 100) if open_price else None
+            return self._market_data_from_history(symbol, currency, price, hist_data)
+        except Exception as e:
+            print(f"Error fetching market data for {symbol}/{currency}: {e}")
+            return None
+    
+    @staticmethod
+    def _market_data_from_history(
+        symbol: str,
+        currency: str,
+        price: float,
+        hist_data: Optional[List[Dict]]
+    ) -> Dict:
+        """
+        Build the market data dictionary from a price and daily history.
+        
+        Args:
+            symbol: Crypto symbol
+            currency: Quote currency
+            price: Current price
+            hist_data: Daily bars from the histoday endpoint (may be empty)
             
+        Returns:
+            Dictionary with price, volume, change data
+        """
+        if not hist_data:
             return {
                 "symbol": symbol.upper(),
                 "currency": currency.upper(),
                 "price": price,
-                "volume_24h": latest.get('volumeto'),
-                "change_24h": change_24h,
-                "change_pct_24h": change_pct_24h,
-                "high_24h": latest.get('high'),
-                "low_24h": latest.get('low'),
-                "market_cap": None,  # Not directly available in basic API
+                "volume_24h": None,
+                "change_24h": None,
+                "change_pct_24h": None,
+                "high_24h": None,
+                "low_24h": None,
+                "market_cap": None,
             }
-        except Exception as e:
-            print(f"Error fetching market data for {symbol}/{currency}: {e}")
-            return None
+        
+        latest = hist_data[0] if hist_data else {}
+        open_price = latest.get('open', price)
+        change_24h = price - open_price if open_price else None
+        change_pct_24h = ((price - open_price) / open_price * 100) if open_price else None
+        
+        return {
+            "symbol": symbol.upper(),
+            "currency": currency.upper(),
+            "price": price,
+            "volume_24h": latest.get('volumeto'),
+            "change_24h": change_24h,
+            "change_pct_24h": change_pct_24h,
+            "high_24h": latest.get('high'),
+            "low_24h": latest.get('low'),
+            "market_cap": None,  # Not directly available in basic API
+        }
     
     def get_historical_ohlcv(
         self, 
@@ -117,72 +230,532 @@ class CryptoCompareProvider(BaseDataProvider):
             or None if request fails
         """
         try:
-            symbol_upper = symbol.upper()
-            currency_upper = currency.upper()
-            
-            # Choose appropriate API method based on timeframe
-            if timeframe == "minute":
-                data = cryptocompare.get_historical_price_minute(
-                    symbol_upper, currency_upper, limit=limit
-                )
-            elif timeframe == "hour":
-                data = cryptocompare.get_historical_price_hour(
-                    symbol_upper, currency_upper, limit=limit
-                )
-            elif timeframe == "day":
-                data = cryptocompare.get_historical_price_day(
-                    symbol_upper, currency_upper, limit=limit
-                )
-            else:
-                print(f"Invalid timeframe: {timeframe}. Use 'minute', 'hour', or 'day'.")
-                return None
+            return self._load_historical_ohlcv(symbol, currency, timeframe, limit)
+        except Exception as e:
+            print(f"Error fetching historical data for {symbol}/{currency}: {e}")
+            return None
+    
+    def get_historical_candles(
+        self,
+        symbol: str,
+        currency: str = "USD",
+        timeframe: str = "hour",
+        limit: int = 100,
+        dtype: Union[str, np.dtype] = np.float64
+    ) -> Optional[Candles]:
+        """
+        Get historical OHLCV data as a compact Candles container.
+        
+        Without a candle store the API response is converted straight into
+        arrays, skipping the DataFrame entirely.
+        
+        Args:
+            symbol: Crypto symbol (e.g., 'BTC', 'ETH')
+            currency: Quote currency (default: 'USD')
+            timeframe: Time interval - 'minute', 'hour', 'day' (default: 'hour')
+            limit: Number of data points to fetch
+            dtype: Float dtype for prices and volumes (np.float32 halves memory)
             
+        Returns:
+            Candles or None if request fails
+        """
+        try:
+            if self.candle_store is not None:
+                df = self._get_historical_ohlcv_stored(symbol, currency, timeframe, limit)
+                return None if df is None else Candles.from_dataframe(df, dtype)
+            
+            data = self._fetch_ohlcv(symbol, currency, timeframe, limit)
             if not data:
                 return None
+            return Candles.from_api(data, dtype)
+        except Exception as e:
+            print(f"Error fetching historical data for {symbol}/{currency}: {e}")
+            return None
+    
+    def _load_historical_ohlcv(
+        self,
+        symbol: str,
+        currency: str,
+        timeframe: str,
+        limit: int
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load OHLCV data through the candle store if set, letting errors propagate.
+        
+        Args:
+            symbol: Crypto symbol
+            currency: Quote currency
+            timeframe: Time interval - 'minute', 'hour', 'day'
+            limit: Number of data points to fetch
             
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
+        Returns:
+            DataFrame in get_historical_ohlcv format, or None if no data was returned
+        """
+        if self.candle_store is not None:
+            return self._get_historical_ohlcv_stored(symbol, currency, timeframe, limit)
+        
+        data = self._fetch_ohlcv(symbol, currency, timeframe, limit)
+        if not data:
+            return None
+        
+        return self._ohlcv_to_dataframe(data)
+    
+    def _fetch_ohlcv(
+        self,
+        symbol: str,
+        currency: str,
+        timeframe: str,
+        limit: int,
+        to_ts: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Fetch raw OHLCV bars from the API.
+        
+        Args:
+            symbol: Crypto symbol
+            currency: Quote currency
+            timeframe: Time interval - 'minute', 'hour', 'day'
+            limit: Number of data points to fetch
+            to_ts: Epoch seconds of the last bar to return (default: now)
             
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['time'], unit='s')
+        Returns:
+            List of bar dictionaries as returned by the API, or None
             
-            # Select and rename relevant columns
-            df = df[['timestamp', 'open', 'high', 'low', 'close', 'volumefrom', 'volumeto']]
-            df.columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume_from', 'volume_to']
+        Raises:
+            ValueError: If the timeframe is not supported
+        """
+        symbol_upper = symbol.upper()
+        currency_upper = currency.upper()
+        
+        # The library's toTs default is frozen at import time, so always pass it
+        if to_ts is None:
+            to_ts = int(time.time())
+        
+        # Choose appropriate API method based on timeframe
+        if timeframe == "minute":
+            fetch = cryptocompare.get_historical_price_minute
+        elif timeframe == "hour":
+            fetch = cryptocompare.get_historical_price_hour
+        elif timeframe == "day":
+            fetch = cryptocompare.get_historical_price_day
+        else:
+            raise ValueError(f"Invalid timeframe: {timeframe}. Use 'minute', 'hour', or 'day'.")
+        
+        return fetch(symbol_upper, currency_upper, limit=limit, toTs=to_ts)
+    
+    @staticmethod
+    def _ohlcv_to_dataframe(data: List[Dict]) -> pd.DataFrame:
+        """
+        Convert raw API bars to the OHLCV DataFrame format.
+        
+        Args:
+            data: List of bar dictionaries from the API
             
-            # Add volume column (using volumeto which is in quote currency)
-            df['volume'] = df['volume_to']
+        Returns:
+            DataFrame with columns: timestamp, open, high, low, close,
+            volume_from, volume_to, volume
+        """
+        # Columns are read straight from the bar dicts into arrays; volume
+        # duplicates volume_to (quote currency) for compatibility
+        return Candles.from_api(data).to_dataframe()
+    
+    def _get_historical_ohlcv_stored(
+        self,
+        symbol: str,
+        currency: str,
+        timeframe: str,
+        limit: int
+    ) -> Optional[pd.DataFrame]:
+        """
+        Serve OHLCV data from the candle store, fetching only the missing tail.
+        
+        Closed candles are persisted; the in-progress candle is always taken
+        from the fresh response and never written to disk.
+        
+        Args:
+            symbol: Crypto symbol
+            currency: Quote currency
+            timeframe: Time interval - 'minute', 'hour', 'day'
+            limit: Number of data points requested
             
-            return df
+        Returns:
+            DataFrame in the same format as an uncached request, or None
+        """
+        if timeframe not in CandleStore.TIMEFRAME_SECONDS:
+            raise ValueError(f"Invalid timeframe: {timeframe}. Use 'minute', 'hour', or 'day'.")
+        
+        step = CandleStore.TIMEFRAME_SECONDS[timeframe]
+        now = int(time.time())
+        current_open = now - now % step
+        first_wanted = current_open - limit * step
+        
+        stored = self.candle_store.load(symbol, currency, timeframe)
+        stored_times = None
+        if stored is not None:
+            stored_times = CandleStore.to_epoch_seconds(stored['timestamp'])
+        
+        # Only fetch the tail when the store already reaches back far enough
+        # and its newest candle overlaps the window
+        fetch_limit = limit
+        if (
+            stored_times is not None
+            and stored_times[0] <= first_wanted
+            and stored_times[-1] >= first_wanted
+        ):
+            fetch_limit = max(1, int((current_open - stored_times[-1]) // step))
+        
+        data = self._fetch_ohlcv(symbol, currency, timeframe, fetch_limit, to_ts=now)
+        if not data:
+            return None
+        fresh = self._ohlcv_to_dataframe(data)
+        fresh_times = CandleStore.to_epoch_seconds(fresh['timestamp'])
+        
+        closed = fresh[fresh_times < current_open]
+        if fetch_limit == limit:
+            # Keep older stored history unless the fresh window leaves a gap
+            if stored_times is not None and fresh_times[0] <= stored_times[-1] + step:
+                self.candle_store.append(symbol, currency, timeframe, closed)
+            else:
+                self.candle_store.write(symbol, currency, timeframe, closed)
+            combined = fresh
+        else:
+            self.candle_store.append(symbol, currency, timeframe, closed)
+            combined = pd.concat(
+                [stored[stored_times >= first_wanted], fresh],
+                ignore_index=True
+            )
+            combined = combined.drop_duplicates('timestamp', keep='last')
+        
+        combined_times = CandleStore.to_epoch_seconds(combined['timestamp'])
+        combined = combined[combined_times >= first_wanted]
+        return combined.sort_values('timestamp').reset_index(drop=True)
+    
+    def get_historical_ohlcv_range(
+        self,
+        symbol: str,
+        currency: str = "USD",
+        timeframe: str = "hour",
+        start: Union[datetime, pd.Timestamp, int, None] = None,
+        end: Union[datetime, pd.Timestamp, int, None] = None,
+        max_workers: int = 4,
+        page_size: int = MAX_BARS_PER_REQUEST,
+        on_page: Optional[Callable[[pd.DataFrame], None]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get historical OHLCV data for a time range of any length.
+        
+        The range is split into pages anchored on ``toTs`` and fetched
+        concurrently. Page boundaries are deduplicated, so the result is one
+        contiguous series sorted by timestamp.
+        
+        Args:
+            symbol: Crypto symbol (e.g., 'BTC', 'ETH')
+            currency: Quote currency (default: 'USD')
+            timeframe: Time interval - 'minute', 'hour', 'day' (default: 'hour')
+            start: First bar time (datetime or epoch seconds; naive means UTC)
+            end: Last bar time (default: now)
+            max_workers: Maximum pages fetched at the same time (default: 4)
+            page_size: Bars per request (default/max: 2000)
+            on_page: Optional callback receiving each page in chronological
+                order. Pages are not accumulated, so memory stays flat for
+                very long ranges.
             
+        Returns:
+            DataFrame with the same columns as get_historical_ohlcv, or None
+            if the request fails, no data exists, or pages were streamed to
+            on_page
+        """
+        if timeframe not in CandleStore.TIMEFRAME_SECONDS:
+            print(f"Invalid timeframe: {timeframe}. Use 'minute', 'hour', or 'day'.")
+            return None
+        if start is None:
+            print("A start time is required for range requests.")
+            return None
+        
+        step = CandleStore.TIMEFRAME_SECONDS[timeframe]
+        page_size = max(1, min(page_size, self.MAX_BARS_PER_REQUEST))
+        start_ts = self._to_epoch(start)
+        end_ts = int(time.time()) if end is None else self._to_epoch(end)
+        
+        # Align to bar open times: first bar at or after start, last at or before end
+        first_bar = -(-start_ts // step) * step
+        last_bar = end_ts - end_ts % step
+        if first_bar > last_bar:
+            return None
+        
+        # Plan pages backwards from the last bar; each page is (to_ts, limit)
+        # and the API returns limit + 1 bars ending at to_ts
+        pages = []
+        to_ts = last_bar
+        while to_ts >= first_bar:
+            bars = min(page_size, (to_ts - first_bar) // step + 1)
+            pages.append((to_ts, bars - 1))
+            to_ts -= bars * step
+        pages.reverse()
+        
+        frames = []
+        last_time = first_bar - step
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                # Keep at most max_workers pages in flight and consume them in
+                # order so streamed pages are never held longer than needed
+                pending = []
+                page_iter = iter(pages)
+                for page in page_iter:
+                    pending.append(executor.submit(
+                        self._fetch_ohlcv, symbol, currency, timeframe, page[1], page[0]
+                    ))
+                    if len(pending) >= max_workers:
+                        break
+                
+                while pending:
+                    data = pending.pop(0).result()
+                    next_page = next(page_iter, None)
+                    if next_page is not None:
+                        pending.append(executor.submit(
+                            self._fetch_ohlcv, symbol, currency, timeframe, next_page[1], next_page[0]
+                        ))
+                    
+                    if not data:
+                        continue
+                    
+                    page_df = self._ohlcv_to_dataframe(data)
+                    page_times = CandleStore.to_epoch_seconds(page_df['timestamp'])
+                    keep = (page_times > last_time) & (page_times <= last_bar)
+                    page_df = page_df[keep].sort_values('timestamp').reset_index(drop=True)
+                    if page_df.empty:
+                        continue
+                    last_time = int(page_times[keep].max())
+                    
+                    if on_page is not None:
+                        on_page(page_df)
+                    else:
+                        frames.append(page_df)
         except Exception as e:
-            print(f"Error fetching historical data for {symbol}/{currency}: {e}")
+            print(f"Error fetching historical range for {symbol}/{currency}: {e}")
             return None
+        
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
+    
+    @staticmethod
+    def _to_epoch(value: Union[datetime, pd.Timestamp, int, float]) -> int:
+        """
+        Convert a datetime or epoch value to integer epoch seconds.
+        
+        Args:
+            value: datetime, pandas Timestamp or epoch seconds (naive datetimes are UTC)
+            
+        Returns:
+            Epoch seconds
+        """
+        if isinstance(value, (int, float)):
+            return int(value)
+        return int(pd.Timestamp(value).timestamp())
     
     def get_ohlcv_multi_timeframe(
         self,
         symbol: str,
         currency: str = "USD",
-        timeframes: Optional[List[str]] = None
+        timeframes: Optional[List[str]] = None,
+        limit: int = 100,
+        max_workers: Optional[int] = None,
+        base_timeframe: Optional[str] = None
     ) -> Dict[str, pd.DataFrame]:
         """
         Get OHLCV data for multiple timeframes.
         
+        Source series are fetched concurrently, so wall time is roughly the
+        slowest request instead of the sum of all of them. Timeframes the API
+        does not offer ('5m', '15m', '4h', '1w', ...) are built locally by
+        resampling a finer series.
+        
         Args:
             symbol: Crypto symbol
             currency: Quote currency
             timeframes: List of timeframes (default: ['hour', 'day'])
+            limit: Number of data points per timeframe (default: 100)
+            max_workers: Maximum concurrent requests (default: one per source series)
+            base_timeframe: Optional API timeframe ('minute', 'hour', 'day') to
+                fetch once and derive every coarser timeframe from, instead of
+                requesting each one separately
             
         Returns:
             Dictionary mapping timeframe to DataFrame
         """
         if timeframes is None:
             timeframes = ['hour', 'day']
+        if not timeframes:
+            return {}
+        if base_timeframe is not None and base_timeframe not in CandleStore.TIMEFRAME_SECONDS:
+            print(f"Invalid base timeframe: {base_timeframe}. Use 'minute', 'hour', or 'day'.")
+            return {}
         
-        result = {}
         for tf in timeframes:
-            df = self.get_historical_ohlcv(symbol, currency, tf)
+            if tf not in RESAMPLE_SECONDS:
+                print(f"Invalid timeframe: {tf}. Use one of {list(RESAMPLE_SECONDS)}.")
+        sources, needed = self._plan_sources(timeframes, limit, base_timeframe)
+        
+        with ThreadPoolExecutor(max_workers=max_workers or max(1, len(needed))) as executor:
+            futures = {
+                source: executor.submit(self._get_source_ohlcv, symbol, currency, source, bars)
+                for source, bars in needed.items()
+            }
+        
+        source_data = {}
+        for source, future in futures.items():
+            try:
+                source_data[source] = future.result()
+            except Exception as e:
+                print(f"Error fetching historical data for {symbol}/{currency}: {e}")
+                source_data[source] = None
+        
+        result = {}
+        for tf, source in sources.items():
+            df = source_data[source]
             if df is not None:
-                result[tf] = df
+                result[tf] = self._from_source(df, tf, source, limit)
         
         return result
+    
+    @staticmethod
+    def _plan_sources(
+        timeframes: List[str],
+        limit: int,
+        base_timeframe: Optional[str] = None
+    ) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """
+        Decide which API series each timeframe is built from.
+        
+        Args:
+            timeframes: Requested timeframes (unknown ones are left out)
+            limit: Number of data points per timeframe
+            base_timeframe: Optional API timeframe to derive every coarser
+                timeframe from
+            
+        Returns:
+            Tuple of (sources, needed): sources maps timeframe -> API
+            timeframe, needed maps API timeframe -> bars to fetch (enough
+            for the coarsest timeframe built from it)
+        """
+        sources = {}
+        for tf in timeframes:
+            if tf not in RESAMPLE_SECONDS:
+                continue
+            seconds = RESAMPLE_SECONDS[tf]
+            if base_timeframe is not None:
+                base_seconds = CandleStore.TIMEFRAME_SECONDS[base_timeframe]
+                if seconds >= base_seconds and seconds % base_seconds == 0:
+                    sources[tf] = base_timeframe
+                    continue
+            sources[tf] = tf if tf in CandleStore.TIMEFRAME_SECONDS else base_timeframe_for(tf)
+        
+        needed = {}
+        for tf, source in sources.items():
+            ratio = RESAMPLE_SECONDS[tf] // CandleStore.TIMEFRAME_SECONDS[source]
+            needed[source] = max(needed.get(source, 0), (limit + 1) * ratio - 1)
+        return sources, needed
+    
+    @staticmethod
+    def _from_source(df: pd.DataFrame, timeframe: str, source: str, limit: int) -> pd.DataFrame:
+        """Last limit + 1 bars of ``timeframe``, resampled from the ``source`` series if they differ."""
+        if timeframe != source:
+            df = resample_ohlcv(df, timeframe)
+        return df.tail(limit + 1).reset_index(drop=True)
+    
+    def _get_source_ohlcv(
+        self,
+        symbol: str,
+        currency: str,
+        timeframe: str,
+        bars: int
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get a base series, paging through the range API when one request is not enough.
+        
+        Args:
+            symbol: Crypto symbol
+            currency: Quote currency
+            timeframe: API timeframe
+            bars: Number of data points wanted (the API returns one extra)
+            
+        Returns:
+            DataFrame in get_historical_ohlcv format or None
+            
+        Raises:
+            Exception: Errors of a single request propagate (the range API
+                reports its own and returns None)
+        """
+        if bars < self.MAX_BARS_PER_REQUEST:
+            return self._load_historical_ohlcv(symbol, currency, timeframe, bars)
+        
+        step = CandleStore.TIMEFRAME_SECONDS[timeframe]
+        now = int(time.time())
+        return self.get_historical_ohlcv_range(
+            symbol, currency, timeframe, start=now - now % step - bars * step, end=now
+        )
+    
+    def get_ohlcv_grid(
+        self,
+        symbols: List[str],
+        currency: str = "USD",
+        timeframes: Optional[List[str]] = None,
+        limit: int = 100,
+        max_workers: int = 8
+    ) -> Tuple[Dict[str, Dict[str, pd.DataFrame]], Dict[str, Dict[str, str]]]:
+        """
+        Get OHLCV data for a grid of symbols x timeframes in parallel.
+        
+        Timeframes are handled as in get_ohlcv_multi_timeframe: each symbol
+        fetches one series per API timeframe and derived timeframes ('4h',
+        '1w', ...) are resampled from it. Failed items are reported in the
+        errors dictionary rather than silently dropped.
+        
+        Args:
+            symbols: Crypto symbols
+            currency: Quote currency
+            timeframes: List of timeframes (default: ['hour', 'day'])
+            limit: Number of data points per timeframe (default: 100)
+            max_workers: Maximum concurrent requests (default: 8)
+            
+        Returns:
+            Tuple of (data, errors): data maps symbol -> timeframe -> DataFrame,
+            errors maps symbol -> timeframe -> error message
+        """
+        if timeframes is None:
+            timeframes = ['hour', 'day']
+        
+        data: Dict[str, Dict[str, pd.DataFrame]] = {}
+        errors: Dict[str, Dict[str, str]] = {}
+        sources, needed = self._plan_sources(timeframes, limit)
+        items = [(symbol, source, bars) for symbol in symbols for source, bars in needed.items()]
+        
+        futures = {}
+        if items:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+                futures = {
+                    (symbol, source): executor.submit(self._get_source_ohlcv, symbol, currency, source, bars)
+                    for symbol, source, bars in items
+                }
+        
+        for symbol in symbols:
+            for tf in timeframes:
+                source = sources.get(tf)
+                if source is None:
+                    errors.setdefault(symbol, {})[tf] = f"Invalid timeframe: {tf}. Use one of {list(RESAMPLE_SECONDS)}."
+                    continue
+                try:
+                    df = futures[(symbol, source)].result()
+                    if df is not None:
+                        df = self._from_source(df, tf, source, limit)
+                except Exception as e:
+                    errors.setdefault(symbol, {})[tf] = str(e) or type(e).__name__
+                    continue
+                if df is None:
+                    errors.setdefault(symbol, {})[tf] = "No data returned"
+                else:
+                    data.setdefault(symbol, {})[tf] = df
+        
+        return data, errors
@@ -0,0 +1,203 @@
+"""Memory-mapped, appendable on-disk candle files."""
+import json
+import os
+from pathlib import Path
+from typing import Dict, Union
+import numpy as np
+import pandas as pd
+from .candle_store import CandleStore
+from .candles import Candles
+
+
+class MemmapCandleFile:
+    """
+    One OHLCV series stored as raw column files that are opened with np.memmap.
+    
+    The directory holds ``meta.json`` (dtype and committed bar count) and
+    one ``<column>.bin`` per column of CandleStore.COLUMNS. Opening is
+    instant whatever the size, and every process that maps the same file
+    shares a single copy in the OS page cache, so backtest and sweep
+    workers do not each load their own history.
+    
+    Appends write only the new bars at the end of each column file and
+    then commit the new length in meta.json with an atomic rename. Readers
+    never see bars beyond the committed length, and maps opened before an
+    append stay valid.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path: Union[str, Path], dtype: Union[str, np.dtype] = np.float64):
+        """
+        Initialize candle file.
+        
+        Args:
+            path: Directory of the series (created on first write)
+            dtype: Float dtype for prices and volumes when the file is created;
+                an existing file keeps the dtype it was written with
+        """
+        self.path = Path(path)
+        self._create_dtype = np.dtype(dtype)
+    
+    @property
+    def _meta_path(self) -> Path:
+        return self.path / "meta.json"
+    
+    def _column_path(self, column: str) -> Path:
+        return self.path / f"{column}.bin"
+    
+    def exists(self) -> bool:
+        """Whether the series has been written."""
+        return self._meta_path.exists()
+    
+    def _read_meta(self) -> Dict:
+        with open(self._meta_path) as f:
+            return json.load(f)
+    
+    def _write_meta(self, length: int, dtype: np.dtype) -> None:
+        tmp_path = self.path / "meta.json.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": self.VERSION, "dtype": dtype.str, "length": int(length)}, f)
+        os.replace(tmp_path, self._meta_path)
+    
+    @property
+    def dtype(self) -> np.dtype:
+        """Float dtype of prices and volumes."""
+        return np.dtype(self._read_meta()["dtype"]) if self.exists() else self._create_dtype
+    
+    def __len__(self) -> int:
+        return int(self._read_meta()["length"]) if self.exists() else 0
+    
+    def _column_dtype(self, column: str, dtype: np.dtype) -> np.dtype:
+        return np.dtype(np.int64) if column == 'time' else dtype
+    
+    def _as_candles(self, data: Union[Candles, pd.DataFrame], dtype: np.dtype) -> Candles:
+        """Convert input to time-sorted Candles of the file's dtype."""
+        if isinstance(data, pd.DataFrame):
+            candles = Candles.from_dataframe(data, dtype)
+        else:
+            candles = data.astype(dtype)
+        
+        if len(candles) > 1 and np.any(np.diff(candles.time) <= 0):
+            order = np.argsort(candles.time, kind='stable')
+            candles = candles[order]
+            # Keep the last version of repeated timestamps
+            keep = np.r_[candles.time[1:] != candles.time[:-1], True]
+            candles = candles[keep]
+        return candles
+    
+    def write(self, data: Union[Candles, pd.DataFrame]) -> None:
+        """
+        Replace the series with the given candles.
+        
+        Args:
+            data: Candles or DataFrame in get_historical_ohlcv format
+        """
+        dtype = self._create_dtype
+        candles = self._as_candles(data, dtype)
+        self.path.mkdir(parents=True, exist_ok=True)
+        
+        # Hide the series while the column files are replaced
+        self._write_meta(0, dtype)
+        for column, values in candles.columns.items():
+            tmp_path = self.path / f"{column}.bin.tmp"
+            np.ascontiguousarray(values, dtype=self._column_dtype(column, dtype)).tofile(tmp_path)
+            os.replace(tmp_path, self._column_path(column))
+        self._write_meta(len(candles), dtype)
+    
+    def append(self, data: Union[Candles, pd.DataFrame]) -> int:
+        """
+        Add candles at the end of the series without rewriting it.
+        
+        A bar with the same time as the last stored bar replaces it in
+        place (e.g. the in-progress candle); bars older than that are
+        ignored.
+        
+        Args:
+            data: Candles or DataFrame in get_historical_ohlcv format
+            
+        Returns:
+            Number of bars added
+        """
+        if not self.exists():
+            self.write(data)
+            return len(self)
+        
+        meta = self._read_meta()
+        dtype = np.dtype(meta["dtype"])
+        length = int(meta["length"])
+        candles = self._as_candles(data, dtype)
+        if len(candles) == 0:
+            return 0
+        if length == 0:
+            self.write(candles)
+            return len(candles)
+        
+        last_time = int(self.load().time[-1])
+        same = np.flatnonzero(candles.time == last_time)
+        if len(same):
+            for column, values in candles.columns.items():
+                column_dtype = self._column_dtype(column, dtype)
+                last = np.memmap(
+                    self._column_path(column),
+                    dtype=column_dtype,
+                    mode='r+',
+                    offset=(length - 1) * column_dtype.itemsize,
+                    shape=(1,)
+                )
+                last[0] = values[same[0]]
+                last.flush()
+        
+        new = candles[candles.time > last_time]
+        if len(new) == 0:
+            return 0
+        
+        for column, values in new.columns.items():
+            column_dtype = self._column_dtype(column, dtype)
+            with open(self._column_path(column), "r+b") as f:
+                # Write at the committed end; anything past it is a torn earlier append
+                f.seek(length * column_dtype.itemsize)
+                f.write(np.ascontiguousarray(values, dtype=column_dtype).tobytes())
+                f.truncate()
+        self._write_meta(length + len(new), dtype)
+        return len(new)
+    
+    def load(self, mode: str = 'r') -> Candles:
+        """
+        Map the series into memory without reading it.
+        
+        Args:
+            mode: np.memmap mode ('r' read-only, 'r+' writable in place,
+                'c' copy-on-write)
+            
+        Returns:
+            Candles whose columns are memory-mapped arrays
+        """
+        if not self.exists():
+            raise FileNotFoundError(f"No candle file at {self.path}")
+        
+        meta = self._read_meta()
+        dtype = np.dtype(meta["dtype"])
+        length = int(meta["length"])
+        if length == 0:
+            return Candles.empty(dtype)
+        
+        columns = {
+            column: np.memmap(
+                self._column_path(column),
+                dtype=self._column_dtype(column, dtype),
+                mode=mode,
+                shape=(length,)
+            )
+            for column in CandleStore.COLUMNS
+        }
+        return Candles(**columns, dtype=dtype)
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Load the series as a DataFrame in get_historical_ohlcv format.
+        
+        Returns:
+            DataFrame (copied into memory)
+        """
+        return self.load().to_dataframe()
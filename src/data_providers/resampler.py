@@ -0,0 +1,202 @@
+"""Derive higher-timeframe OHLCV bars from a finer base series."""
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from .candle_store import CandleStore
+
+
+# Bar length in seconds for every timeframe the resampler can build
+RESAMPLE_SECONDS = {
+    "minute": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "hour": 3600,
+    "1h": 3600,
+    "4h": 14400,
+    "day": 86400,
+    "1d": 86400,
+    "1w": 604800,
+}
+
+# Weekly bars open on Monday 00:00 UTC; the epoch fell on a Thursday
+_BUCKET_OFFSETS = {
+    "1w": 4 * 86400,
+}
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume_from', 'volume_to', 'volume']
+
+
+def base_timeframe_for(timeframe: str) -> str:
+    """
+    Pick the API timeframe a derived timeframe should be built from.
+    
+    Args:
+        timeframe: Target timeframe (e.g., '15m', '4h', '1w')
+        
+    Returns:
+        The coarsest native timeframe ('minute', 'hour', 'day') that divides it
+        
+    Raises:
+        ValueError: If the timeframe is unknown
+    """
+    if timeframe not in RESAMPLE_SECONDS:
+        raise ValueError(f"Unknown timeframe: {timeframe}. Use one of {list(RESAMPLE_SECONDS)}.")
+    
+    seconds = RESAMPLE_SECONDS[timeframe]
+    for native in ("day", "hour", "minute"):
+        native_seconds = CandleStore.TIMEFRAME_SECONDS[native]
+        if native_seconds <= seconds and seconds % native_seconds == 0:
+            return native
+    raise ValueError(f"Timeframe {timeframe} cannot be built from API data")
+
+
+def _bucket_starts(times: np.ndarray, timeframe: str) -> np.ndarray:
+    """Map epoch seconds to the open time of their target bar."""
+    period = RESAMPLE_SECONDS[timeframe]
+    offset = _BUCKET_OFFSETS.get(timeframe, 0)
+    return (times - offset) // period * period + offset
+
+
+def _aggregate(times: np.ndarray, columns: Dict[str, np.ndarray], timeframe: str) -> Dict[str, np.ndarray]:
+    """
+    Aggregate sorted base bars into target bars.
+    
+    Args:
+        times: Sorted epoch seconds of base bars
+        columns: open, high, low, close, volume_from, volume_to arrays
+        timeframe: Target timeframe
+        
+    Returns:
+        Dictionary of aggregated arrays including 'time'
+    """
+    buckets = _bucket_starts(times, timeframe)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(times)] - 1
+    
+    return {
+        'time': buckets[starts],
+        'open': columns['open'][starts],
+        'high': np.maximum.reduceat(columns['high'], starts),
+        'low': np.minimum.reduceat(columns['low'], starts),
+        'close': columns['close'][ends],
+        'volume_from': np.add.reduceat(columns['volume_from'], starts),
+        'volume_to': np.add.reduceat(columns['volume_to'], starts),
+    }
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Build higher-timeframe bars from a finer OHLCV series.
+    
+    Bars are aggregated as open=first, high=max, low=min, close=last, with
+    volume_from and volume_to summed. Each bar is labelled with its open
+    time; weekly bars open on Monday 00:00 UTC.
+    
+    Args:
+        df: DataFrame in get_historical_ohlcv format
+        timeframe: Target timeframe ('5m', '15m', '30m', 'hour', '4h', 'day', '1w', ...)
+        
+    Returns:
+        DataFrame in get_historical_ohlcv format (the last bar may be partial)
+        
+    Raises:
+        ValueError: If the timeframe is unknown
+    """
+    if timeframe not in RESAMPLE_SECONDS:
+        raise ValueError(f"Unknown timeframe: {timeframe}. Use one of {list(RESAMPLE_SECONDS)}.")
+    if df is None or df.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    
+    df = df.sort_values('timestamp')
+    times = CandleStore.to_epoch_seconds(df['timestamp'])
+    columns = {
+        col: df[col].to_numpy(dtype=np.float64)
+        for col in ['open', 'high', 'low', 'close', 'volume_from', 'volume_to']
+    }
+    return CandleStore.to_dataframe(_aggregate(times, columns, timeframe))
+
+
+class OHLCVResampler:
+    """
+    Incrementally maintain higher-timeframe bars from streaming base bars.
+    
+    Completed bars are kept as they are finalised; only the base bars of
+    the current, still-open bar are held and re-aggregated on update.
+    """
+    
+    def __init__(self, timeframe: str):
+        """
+        Initialize incremental resampler.
+        
+        Args:
+            timeframe: Target timeframe (e.g., '4h')
+        """
+        if timeframe not in RESAMPLE_SECONDS:
+            raise ValueError(f"Unknown timeframe: {timeframe}. Use one of {list(RESAMPLE_SECONDS)}.")
+        
+        self.timeframe = timeframe
+        self._completed: Dict[str, List] = {col: [] for col in CandleStore.COLUMNS}
+        self._pending: Optional[pd.DataFrame] = None
+        self._pending_bucket: Optional[int] = None
+    
+    def update(self, base_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feed new or updated base bars.
+        
+        Base bars that repeat a timestamp of the current open bar replace the
+        earlier version (e.g. the in-progress base candle). Bars older than
+        the current open bar are ignored because that bar is already final.
+        
+        Args:
+            base_df: New base bars in get_historical_ohlcv format
+            
+        Returns:
+            Target bars changed by this update: newly completed bars followed
+            by the current partial bar
+        """
+        if base_df is None or base_df.empty:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        
+        base_df = base_df.sort_values('timestamp')
+        if self._pending_bucket is not None:
+            times = CandleStore.to_epoch_seconds(base_df['timestamp'])
+            base_df = base_df[_bucket_starts(times, self.timeframe) >= self._pending_bucket]
+            if base_df.empty:
+                return pd.DataFrame(columns=OHLCV_COLUMNS)
+        
+        if self._pending is not None:
+            base_df = pd.concat([self._pending, base_df], ignore_index=True)
+            base_df = base_df.drop_duplicates('timestamp', keep='last').sort_values('timestamp')
+        
+        bars = resample_ohlcv(base_df, self.timeframe)
+        bar_times = CandleStore.to_epoch_seconds(bars['timestamp'])
+        
+        # Every bar except the newest is complete and moves to the finished list
+        for col in CandleStore.COLUMNS:
+            values = bar_times[:-1] if col == 'time' else bars[col].to_numpy()[:-1]
+            self._completed[col].extend(values.tolist())
+        
+        self._pending_bucket = int(bar_times[-1])
+        base_times = CandleStore.to_epoch_seconds(base_df['timestamp'])
+        self._pending = base_df[_bucket_starts(base_times, self.timeframe) == self._pending_bucket]
+        return bars.reset_index(drop=True)
+    
+    def to_dataframe(self, include_partial: bool = True) -> pd.DataFrame:
+        """
+        Get all target bars built so far.
+        
+        Args:
+            include_partial: Include the current, still-open bar (default: True)
+            
+        Returns:
+            DataFrame in get_historical_ohlcv format
+        """
+        completed = CandleStore.to_dataframe({
+            col: np.asarray(values, dtype=np.int64 if col == 'time' else np.float64)
+            for col, values in self._completed.items()
+        })
+        if not include_partial or self._pending is None or self._pending.empty:
+            return completed
+        partial = resample_ohlcv(self._pending, self.timeframe)
+        return pd.concat([completed, partial], ignore_index=True)
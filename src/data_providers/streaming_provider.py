@@ -0,0 +1,667 @@
+"""Real-time CryptoCompare price streaming over a persistent WebSocket."""
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+import websockets
+from .base_provider import BaseDataProvider
+from .candle_store import CandleStore
+from .resampler import OHLCV_COLUMNS, RESAMPLE_SECONDS, _bucket_starts
+
+
+# CryptoCompare streamer message types
+_TYPE_AGGREGATE = "5"
+_ERROR_TYPES = {"401", "429", "500"}
+
+
+class LiveCandleBuilder:
+    """
+    Build OHLCV candles for one timeframe from a stream of ticks.
+    
+    Only the open candle is mutated; completed candles are kept in a
+    bounded deque, so every tick costs O(1).
+    """
+    
+    def __init__(self, timeframe: str = "minute", max_candles: int = 1000):
+        """
+        Initialize candle builder.
+        
+        Args:
+            timeframe: Candle timeframe ('minute', '5m', 'hour', '4h', 'day', ...)
+            max_candles: Completed candles to keep
+        """
+        if timeframe not in RESAMPLE_SECONDS:
+            raise ValueError(f"Unknown timeframe: {timeframe}. Use one of {list(RESAMPLE_SECONDS)}.")
+        
+        self.timeframe = timeframe
+        self.completed: deque = deque(maxlen=max_candles)
+        self.current: Optional[Dict] = None
+    
+    def update(
+        self,
+        price: float,
+        timestamp: int,
+        volume_from: float = 0.0,
+        volume_to: float = 0.0
+    ) -> Optional[Dict]:
+        """
+        Apply one tick.
+        
+        Ticks older than the open candle are ignored.
+        
+        Args:
+            price: Trade or index price
+            timestamp: Tick time in epoch seconds
+            volume_from: Traded volume in base units
+            volume_to: Traded volume in quote units
+            
+        Returns:
+            The candle completed by this tick, or None
+        """
+        bucket = int(_bucket_starts(int(timestamp), self.timeframe))
+        candle = self.current
+        
+        if candle is not None and bucket < candle['time']:
+            return None
+        
+        if candle is not None and bucket == candle['time']:
+            candle['high'] = max(candle['high'], price)
+            candle['low'] = min(candle['low'], price)
+            candle['close'] = price
+            candle['volume_from'] += volume_from
+            candle['volume_to'] += volume_to
+            return None
+        
+        closed = candle
+        if closed is not None:
+            self.completed.append(closed)
+        self.current = {
+            'time': bucket,
+            'open': price,
+            'high': price,
+            'low': price,
+            'close': price,
+            'volume_from': volume_from,
+            'volume_to': volume_to,
+        }
+        return closed
+    
+    def to_dataframe(self, include_partial: bool = True) -> pd.DataFrame:
+        """
+        Get the candles built so far.
+        
+        Args:
+            include_partial: Include the open candle (default: True)
+            
+        Returns:
+            DataFrame in get_historical_ohlcv format
+        """
+        candles = list(self.completed)
+        if include_partial and self.current is not None:
+            candles.append(dict(self.current))
+        if not candles:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        
+        columns = {col: [candle[col] for candle in candles] for col in CandleStore.COLUMNS}
+        return CandleStore.to_dataframe(columns)
+
+
+class StreamingCryptoCompareProvider(BaseDataProvider):
+    """
+    Data provider fed by CryptoCompare's streaming API.
+    
+    Subscribes to the aggregate index (CCCAGG) of every requested pair
+    over one WebSocket, keeps the latest quote of each pair in memory and
+    builds live candles from the ticks, so get_current_price never makes a
+    network call. Updates are pushed to listeners registered with
+    add_listener() and to async iterators from updates().
+    
+    The connection is re-established with exponential backoff and jitter
+    after drops or missed heartbeats, and all subscriptions are replayed.
+    Run it in a background thread with start()/stop(), or await run() in
+    an existing event loop.
+    """
+    
+    STREAM_URL = "wss://streamer.cryptocompare.com/v2"
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        url: str = STREAM_URL,
+        fallback: Optional[BaseDataProvider] = None,
+        timeframes: Iterable[str] = ("minute",),
+        max_candles: int = 1000,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        heartbeat_timeout: float = 60.0
+    ):
+        """
+        Initialize streaming provider.
+        
+        Args:
+            api_key: CryptoCompare API key (required by the public streamer)
+            url: WebSocket URL (point at a local mock server for testing)
+            fallback: Provider used for pairs without a tick yet and for
+                historical data (e.g., CryptoCompareProvider)
+            timeframes: Timeframes to build live candles for
+            max_candles: Completed live candles kept per pair and timeframe
+            initial_backoff: First reconnect delay in seconds
+            max_backoff: Maximum reconnect delay in seconds
+            heartbeat_timeout: Reconnect if no message arrives for this long
+        """
+        self.api_key = api_key
+        self.url = url
+        self.fallback = fallback
+        self.timeframes = list(timeframes)
+        self.max_candles = max_candles
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.heartbeat_timeout = heartbeat_timeout
+        
+        for timeframe in self.timeframes:
+            if timeframe not in RESAMPLE_SECONDS:
+                raise ValueError(f"Unknown timeframe: {timeframe}. Use one of {list(RESAMPLE_SECONDS)}.")
+        
+        self.reconnects = 0
+        self._lock = threading.Lock()
+        self._quotes: Dict[Tuple[str, str], Dict] = {}
+        self._candles: Dict[Tuple[str, str], Dict[str, LiveCandleBuilder]] = {}
+        self._subscriptions: List[str] = []
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._queues: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+        self._closing = False
+        self._wake: Optional[asyncio.Event] = None
+        self._connected = threading.Event()
+    
+    @staticmethod
+    def _subscription(symbol: str, currency: str) -> str:
+        return f"{_TYPE_AGGREGATE}~CCCAGG~{symbol.upper()}~{currency.upper()}"
+    
+    def subscribe(self, symbols: Iterable[str], currency: str = "USD") -> None:
+        """
+        Start streaming the given pairs.
+        
+        Can be called before or after connecting; pairs are resubscribed
+        automatically after a reconnect.
+        
+        Args:
+            symbols: Trading symbols (e.g., ['BTC', 'ETH'])
+            currency: Quote currency (default: 'USD')
+        """
+        new = []
+        with self._lock:
+            for symbol in symbols:
+                sub = self._subscription(symbol, currency)
+                if sub not in self._subscriptions:
+                    self._subscriptions.append(sub)
+                    new.append(sub)
+        if new:
+            self._send_threadsafe({"action": "SubAdd", "subs": new})
+    
+    def unsubscribe(self, symbols: Iterable[str], currency: str = "USD") -> None:
+        """
+        Stop streaming the given pairs.
+        
+        Args:
+            symbols: Trading symbols
+            currency: Quote currency (default: 'USD')
+        """
+        removed = []
+        with self._lock:
+            for symbol in symbols:
+                sub = self._subscription(symbol, currency)
+                if sub in self._subscriptions:
+                    self._subscriptions.remove(sub)
+                    removed.append(sub)
+        if removed:
+            self._send_threadsafe({"action": "SubRemove", "subs": removed})
+    
+    def add_listener(self, callback: Callable[[Dict], None]) -> None:
+        """
+        Register a callback for every price update.
+        
+        Callbacks run on the streaming event loop and should return quickly.
+        The update dictionary has symbol, currency, price, timestamp, volume
+        and closed_candles ({timeframe: candle} for candles completed by
+        this tick).
+        
+        Args:
+            callback: Function receiving each update dictionary
+        """
+        with self._lock:
+            self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[Dict], None]) -> None:
+        """
+        Unregister a callback added with add_listener().
+        
+        Args:
+            callback: Previously registered function
+        """
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+    
+    async def updates(self, max_queue: int = 1000) -> AsyncIterator[Dict]:
+        """
+        Iterate over price updates in the caller's event loop.
+        
+        If the consumer falls behind, the oldest queued updates are dropped.
+        Iteration ends when the provider is closed.
+        
+        Args:
+            max_queue: Updates buffered for this iterator
+            
+        Yields:
+            Update dictionaries (see add_listener)
+        """
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=max_queue))
+        with self._lock:
+            self._queues.append(entry)
+        try:
+            while True:
+                update = await entry[1].get()
+                if update is None:
+                    return
+                yield update
+        finally:
+            with self._lock:
+                if entry in self._queues:
+                    self._queues.remove(entry)
+    
+    @property
+    def connected(self) -> bool:
+        """Whether the WebSocket is currently open."""
+        return self._connected.is_set()
+    
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the WebSocket is open.
+        
+        Args:
+            timeout: Seconds to wait (None waits forever)
+            
+        Returns:
+            True if connected
+        """
+        return self._connected.wait(timeout)
+    
+    def start(self) -> "StreamingCryptoCompareProvider":
+        """
+        Run the stream in a background thread.
+        
+        Returns:
+            self, for chaining
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        
+        self._closing = False
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()), daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Close the stream started with start() and wait for the thread.
+        
+        Args:
+            timeout: Seconds to wait for the thread to exit
+        """
+        self._closing = True
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                asyncio.run_coroutine_threadsafe(self.close(), loop)
+            except RuntimeError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def __enter__(self) -> "StreamingCryptoCompareProvider":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+    
+    async def close(self) -> None:
+        """Close the stream from inside its event loop."""
+        self._closing = True
+        if self._wake is not None:
+            self._wake.set()
+        if self._ws is not None:
+            await self._ws.close()
+    
+    async def run(self) -> None:
+        """
+        Connect, subscribe and process messages until close() is called.
+        
+        Dropped connections are retried with exponential backoff and
+        jitter; the delay resets once a connection succeeds.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        backoff = self.initial_backoff
+        url = f"{self.url}?api_key={self.api_key}" if self.api_key else self.url
+        
+        try:
+            while not self._closing:
+                try:
+                    async with websockets.connect(url) as ws:
+                        self._ws = ws
+                        self._connected.set()
+                        backoff = self.initial_backoff
+                        with self._lock:
+                            subs = list(self._subscriptions)
+                        if subs:
+                            await ws.send(json.dumps({"action": "SubAdd", "subs": subs}))
+                        
+                        while not self._closing:
+                            raw = await asyncio.wait_for(ws.recv(), self.heartbeat_timeout)
+                            self._handle_message(raw)
+                except (websockets.WebSocketException, OSError, asyncio.TimeoutError) as e:
+                    if self._closing:
+                        break
+                    print(f"[WARN] Stream disconnected ({type(e).__name__}); reconnecting in {backoff:.1f}s")
+                finally:
+                    self._ws = None
+                    self._connected.clear()
+                
+                if self._closing:
+                    break
+                
+                self.reconnects += 1
+                try:
+                    # Jitter spreads reconnects of many clients after an outage
+                    await asyncio.wait_for(self._wake.wait(), backoff * random.uniform(0.5, 1.0))
+                except asyncio.TimeoutError:
+                    pass
+                backoff = min(self.max_backoff, backoff * 2)
+        finally:
+            self._loop = None
+            self._broadcast(None)
+    
+    def _send_threadsafe(self, message: Dict) -> None:
+        """Send a control message if connected; otherwise it is sent on connect."""
+        loop, ws = self._loop, self._ws
+        if loop is None or ws is None:
+            return
+        
+        async def send():
+            try:
+                await ws.send(json.dumps(message))
+            except websockets.ConnectionClosed:
+                pass
+        
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            loop.create_task(send())
+        else:
+            asyncio.run_coroutine_threadsafe(send(), loop)
+    
+    def _handle_message(self, raw) -> None:
+        """
+        Process one streamer message.
+        
+        Args:
+            raw: JSON text received from the WebSocket
+        """
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            print(f"[WARN] Ignoring malformed stream message: {raw!r}")
+            return
+        if not isinstance(message, dict):
+            print(f"[WARN] Ignoring non-object stream message: {raw!r}")
+            return
+        
+        msg_type = str(message.get("TYPE"))
+        if msg_type == _TYPE_AGGREGATE:
+            self._apply_tick(message)
+        elif msg_type in _ERROR_TYPES:
+            print(f"[ERROR] Stream error {msg_type}: {message.get('MESSAGE')} {message.get('INFO', '')}".rstrip())
+    
+    def _apply_tick(self, message: Dict) -> None:
+        """
+        Merge an aggregate update into the quote table and live candles.
+        
+        Aggregate messages only carry fields that changed, so they are
+        merged into the previous quote. Volume is counted only when the
+        message reports a trade (LASTVOLUME).
+        
+        Args:
+            message: Decoded TYPE 5 message
+        """
+        symbol = str(message.get("FROMSYMBOL", "")).upper()
+        currency = str(message.get("TOSYMBOL", "")).upper()
+        if not symbol or not currency:
+            return
+        
+        price = message.get("PRICE")
+        if price is not None:
+            # Validate before merging so a bad field cannot corrupt the quote
+            try:
+                price = float(price)
+                timestamp = int(message.get("LASTUPDATE") or time.time())
+                volume_from = float(message.get("LASTVOLUME", 0.0) or 0.0)
+                volume_to = float(message.get("LASTVOLUMETO", 0.0) or 0.0)
+            except (TypeError, ValueError):
+                print(f"[WARN] Ignoring stream update with invalid fields: {message!r}")
+                return
+        
+        key = (symbol, currency)
+        closed_candles = {}
+        with self._lock:
+            quote = self._quotes.setdefault(key, {})
+            quote.update(message)
+            if price is None:
+                return
+            
+            builders = self._candles.get(key)
+            if builders is None:
+                builders = {tf: LiveCandleBuilder(tf, self.max_candles) for tf in self.timeframes}
+                self._candles[key] = builders
+            for timeframe, builder in builders.items():
+                closed = builder.update(price, timestamp, volume_from, volume_to)
+                if closed is not None:
+                    closed_candles[timeframe] = closed
+        
+        self._broadcast({
+            "symbol": symbol,
+            "currency": currency,
+            "price": price,
+            "timestamp": timestamp,
+            "volume": volume_from,
+            "closed_candles": closed_candles,
+        })
+    
+    def _broadcast(self, update: Optional[Dict]) -> None:
+        """Deliver an update to listeners and iterators (None ends iterators)."""
+        with self._lock:
+            listeners = list(self._listeners)
+            queues = list(self._queues)
+        
+        if update is not None:
+            for callback in listeners:
+                try:
+                    callback(update)
+                except Exception as e:
+                    print(f"[ERROR] Stream listener failed: {e}")
+        
+        for loop, queue in queues:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, update)
+            except RuntimeError:
+                # The consumer's loop has already closed
+                pass
+    
+    @staticmethod
+    def _offer(queue: asyncio.Queue, update: Optional[Dict]) -> None:
+        """Queue an update, dropping the oldest one if the consumer is behind."""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(update)
+    
+    def get_current_price(self, symbol: str, currency: str = "USD") -> Optional[float]:
+        """
+        Get the last streamed price.
+        
+        Args:
+            symbol: Trading symbol (e.g., 'BTC', 'ETH')
+            currency: Quote currency (default: 'USD')
+            
+        Returns:
+            Latest price, the fallback provider's price if no tick has
+            arrived yet, or None
+        """
+        with self._lock:
+            quote = self._quotes.get((symbol.upper(), currency.upper()))
+            price = quote.get("PRICE") if quote else None
+        
+        if price is not None:
+            return float(price)
+        if self.fallback is not None:
+            return self.fallback.get_current_price(symbol, currency)
+        return None
+    
+    def get_market_data(self, symbol: str, currency: str = "USD") -> Optional[Dict]:
+        """
+        Get market data from the streamed quote.
+        
+        Args:
+            symbol: Trading symbol
+            currency: Quote currency
+            
+        Returns:
+            Dictionary in CryptoCompareProvider.get_market_data format, the
+            fallback provider's data if no tick has arrived yet, or None
+        """
+        symbol, currency = symbol.upper(), currency.upper()
+        with self._lock:
+            quote = dict(self._quotes.get((symbol, currency), {}))
+        
+        if quote.get("PRICE") is None:
+            if self.fallback is not None:
+                return self.fallback.get_market_data(symbol, currency)
+            return None
+        
+        price = float(quote["PRICE"])
+        open_24h = quote.get("OPEN24HOUR")
+        change = price - open_24h if open_24h else None
+        return {
+            "symbol": symbol,
+            "currency": currency,
+            "price": price,
+            "volume_24h": quote.get("VOLUME24HOURTO"),
+            "change_24h": change,
+            "change_pct_24h": change / open_24h * 100 if change is not None else None,
+            "high_24h": quote.get("HIGH24HOUR"),
+            "low_24h": quote.get("LOW24HOUR"),
+            "market_cap": None,
+            "last_update": quote.get("LASTUPDATE"),
+        }
+    
+    def get_quotes(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        Get a copy of the whole last-quote table.
+        
+        Returns:
+            Nested dictionary {SYMBOL: {CURRENCY: latest merged stream fields}}
+        """
+        with self._lock:
+            table: Dict[str, Dict[str, Dict]] = {}
+            for (symbol, currency), quote in self._quotes.items():
+                table.setdefault(symbol, {})[currency] = dict(quote)
+            return table
+    
+    def get_live_candles(
+        self,
+        symbol: str,
+        currency: str = "USD",
+        timeframe: str = "minute",
+        include_partial: bool = True
+    ) -> pd.DataFrame:
+        """
+        Get candles built from streamed ticks.
+        
+        Args:
+            symbol: Trading symbol
+            currency: Quote currency
+            timeframe: One of the timeframes given at construction
+            include_partial: Include the open candle (default: True)
+            
+        Returns:
+            DataFrame in get_historical_ohlcv format (empty before the first tick)
+        """
+        if timeframe not in self.timeframes:
+            raise ValueError(f"Live candles are not built for {timeframe}. Use one of {self.timeframes}.")
+        
+        with self._lock:
+            builders = self._candles.get((symbol.upper(), currency.upper()))
+            if builders is None:
+                return pd.DataFrame(columns=OHLCV_COLUMNS)
+            return builders[timeframe].to_dataframe(include_partial)
+    
+    def get_historical_ohlcv(
+        self,
+        symbol: str,
+        currency: str = "USD",
+        timeframe: str = "hour",
+        limit: int = 100
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get historical bars with the live candles applied on top.
+        
+        History comes from the fallback provider and stays authoritative.
+        A live candle for the last historical bar only updates that bar's
+        high, low and close (the API's open and volume are kept, since the
+        live candle only covers ticks since the stream connected); newer
+        live candles extend the series.
+        
+        Args:
+            symbol: Trading symbol
+            currency: Quote currency
+            timeframe: Time interval
+            limit: Number of data points
+            
+        Returns:
+            DataFrame in get_historical_ohlcv format or None
+        """
+        history = None
+        if self.fallback is not None and hasattr(self.fallback, "get_historical_ohlcv"):
+            history = self.fallback.get_historical_ohlcv(symbol, currency, timeframe, limit)
+        
+        live = None
+        if timeframe in self.timeframes:
+            live = self.get_live_candles(symbol, currency, timeframe)
+        
+        if live is None or live.empty:
+            return history
+        if history is None or history.empty:
+            return live.tail(limit + 1).reset_index(drop=True)
+        
+        history = history.reset_index(drop=True)
+        last = len(history) - 1
+        last_time = history['timestamp'].iloc[last]
+        current = live[live['timestamp'] == last_time]
+        if not current.empty:
+            bar = current.iloc[-1]
+            history = history.copy()
+            history.loc[last, 'high'] = max(history.loc[last, 'high'], bar['high'])
+            history.loc[last, 'low'] = min(history.loc[last, 'low'], bar['low'])
+            history.loc[last, 'close'] = bar['close']
+        
+        merged = pd.concat([history, live[live['timestamp'] > last_time]], ignore_index=True)
+        return merged.tail(limit + 1).reset_index(drop=True)
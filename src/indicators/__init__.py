@@ -0,0 +1,22 @@
+"""Technical indicators in batch (vectorized) and streaming (O(1) update) form."""
+from .batch import atr, bollinger_bands, ema, macd, rsi, sma, true_range, vwap
+from .streaming import ATR, EMA, MACD, RSI, SMA, VWAP, BollingerBands, StreamingIndicator
+
+__all__ = [
+    "atr",
+    "bollinger_bands",
+    "ema",
+    "macd",
+    "rsi",
+    "sma",
+    "true_range",
+    "vwap",
+    "ATR",
+    "EMA",
+    "MACD",
+    "RSI",
+    "SMA",
+    "VWAP",
+    "BollingerBands",
+    "StreamingIndicator",
+]
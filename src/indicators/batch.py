@@ -0,0 +1,189 @@
+"""Vectorized technical indicators computed over whole price arrays."""
+from typing import Tuple, Union
+import numpy as np
+import pandas as pd
+
+
+ArrayLike = Union[np.ndarray, pd.Series, list]
+
+
+def _as_array(values: ArrayLike) -> np.ndarray:
+    """Convert input to a float64 NumPy array without copying when possible."""
+    return np.asarray(values, dtype=np.float64)
+
+
+def _wilder(values: np.ndarray, period: int, seed_end: int) -> np.ndarray:
+    """
+    Wilder smoothing seeded with a simple average.
+    
+    The first output at ``seed_end`` is the mean of the ``period`` values
+    ending there; later outputs follow avg = avg_prev + (x - avg_prev) / period.
+    
+    Args:
+        values: Input series
+        period: Smoothing period
+        seed_end: Index of the last value in the seed window
+        
+    Returns:
+        Smoothed series with NaN before seed_end
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) <= seed_end:
+        return out
+    
+    seed = values[seed_end - period + 1:seed_end + 1].mean()
+    tail = np.r_[seed, values[seed_end + 1:]]
+    out[seed_end:] = pd.Series(tail).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    return out
+
+
+def sma(close: ArrayLike, period: int) -> np.ndarray:
+    """
+    Simple moving average.
+    
+    Args:
+        close: Close prices
+        period: Window length
+        
+    Returns:
+        Array with NaN for the first period - 1 values
+    """
+    return pd.Series(_as_array(close)).rolling(window=period).mean().to_numpy()
+
+
+def ema(close: ArrayLike, period: int) -> np.ndarray:
+    """
+    Exponential moving average seeded with the first value (alpha = 2 / (period + 1)).
+    
+    Args:
+        close: Close prices
+        period: EMA span
+        
+    Returns:
+        Array of the same length as close
+    """
+    return pd.Series(_as_array(close)).ewm(span=period, adjust=False).mean().to_numpy()
+
+
+def rsi(close: ArrayLike, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index with Wilder smoothing.
+    
+    Args:
+        close: Close prices
+        period: Lookback period (default: 14)
+        
+    Returns:
+        Array in [0, 100] with NaN for the first ``period`` values
+    """
+    close = _as_array(close)
+    change = np.diff(close, prepend=np.nan)
+    gains = np.where(change > 0, change, 0.0)
+    losses = np.where(change < 0, -change, 0.0)
+    
+    avg_gain = _wilder(gains, period, period)
+    avg_loss = _wilder(losses, period, period)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        result = 100 - 100 / (1 + rs)
+    # No losses in the window means maximum strength
+    return np.where((avg_loss == 0) & ~np.isnan(avg_gain), 100.0, result)
+
+
+def true_range(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+    """
+    True range of every bar (high - low for the first bar).
+    
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        
+    Returns:
+        Array of true ranges
+    """
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    prev_close = np.r_[np.nan, close[:-1]]
+    ranges = np.vstack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    return np.nanmax(ranges, axis=0)
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    """
+    Average True Range with Wilder smoothing.
+    
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        period: Lookback period (default: 14)
+        
+    Returns:
+        Array with NaN for the first period - 1 values
+    """
+    return _wilder(true_range(high, low, close), period, period - 1)
+
+
+def bollinger_bands(
+    close: ArrayLike,
+    period: int = 20,
+    num_std: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands around a simple moving average (population standard deviation).
+    
+    Args:
+        close: Close prices
+        period: Window length (default: 20)
+        num_std: Band width in standard deviations (default: 2)
+        
+    Returns:
+        Tuple of (middle, upper, lower) arrays
+    """
+    rolling = pd.Series(_as_array(close)).rolling(window=period)
+    middle = rolling.mean().to_numpy()
+    std = rolling.std(ddof=0).to_numpy()
+    return middle, middle + num_std * std, middle - num_std * std
+
+
+def vwap(high: ArrayLike, low: ArrayLike, close: ArrayLike, volume: ArrayLike) -> np.ndarray:
+    """
+    Cumulative volume-weighted average price from the typical price.
+    
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        volume: Volume in base units (e.g. volume_from)
+        
+    Returns:
+        Array of VWAP values (NaN until some volume has traded)
+    """
+    typical = (_as_array(high) + _as_array(low) + _as_array(close)) / 3
+    volume = _as_array(volume)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.cumsum(typical * volume) / np.cumsum(volume)
+
+
+def macd(
+    close: ArrayLike,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving Average Convergence Divergence.
+    
+    Args:
+        close: Close prices
+        fast: Fast EMA span (default: 12)
+        slow: Slow EMA span (default: 26)
+        signal: Signal line EMA span (default: 9)
+        
+    Returns:
+        Tuple of (macd, signal, histogram) arrays
+    """
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
@@ -0,0 +1,394 @@
+"""Streaming technical indicators updated in O(1) per new candle."""
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+
+class StreamingIndicator(ABC):
+    """
+    Abstract base class for incrementally updated indicators.
+    
+    Each update costs O(1) and the full state can be checkpointed with
+    state_dict() and restored with load_state() or from_state(), so a live
+    process can resume without replaying history. Streaming values match
+    the batch functions in ``indicators.batch`` for the same input.
+    """
+    
+    @abstractmethod
+    def update(self, *args) -> Optional[float]:
+        """
+        Feed the next candle.
+        
+        Returns:
+            Current indicator value, or None while warming up
+        """
+        pass
+    
+    @property
+    def value(self):
+        """Latest indicator value (None while warming up)."""
+        return self._value
+    
+    def state_dict(self) -> Dict:
+        """
+        Get a JSON-serializable checkpoint of the indicator state.
+        
+        Returns:
+            Dictionary of constructor parameters and running state
+        """
+        state = {}
+        for key, item in self.__dict__.items():
+            if isinstance(item, deque):
+                item = list(item)
+            elif isinstance(item, StreamingIndicator):
+                item = item.state_dict()
+            state[key] = item
+        return {"type": type(self).__name__, "state": state}
+    
+    def load_state(self, checkpoint: Dict) -> None:
+        """
+        Restore state saved by state_dict().
+        
+        Args:
+            checkpoint: Dictionary returned by state_dict()
+        """
+        if checkpoint.get("type") != type(self).__name__:
+            raise ValueError(f"Checkpoint is for {checkpoint.get('type')}, not {type(self).__name__}")
+        
+        for key, item in checkpoint["state"].items():
+            current = self.__dict__.get(key)
+            if isinstance(current, deque):
+                item = deque(item, maxlen=current.maxlen)
+            elif isinstance(current, StreamingIndicator):
+                current.load_state(item)
+                continue
+            self.__dict__[key] = item
+    
+    @classmethod
+    def from_state(cls, checkpoint: Dict) -> "StreamingIndicator":
+        """
+        Build an indicator from a checkpoint.
+        
+        Args:
+            checkpoint: Dictionary returned by state_dict()
+            
+        Returns:
+            Indicator instance in the saved state
+        """
+        indicator_cls = next(
+            (sub for sub in _all_subclasses(StreamingIndicator) if sub.__name__ == checkpoint.get("type")),
+            None
+        )
+        if indicator_cls is None:
+            raise ValueError(f"Unknown indicator type: {checkpoint.get('type')}")
+        if cls is not StreamingIndicator and indicator_cls is not cls:
+            raise ValueError(f"Checkpoint is for {indicator_cls.__name__}, not {cls.__name__}")
+        
+        params = {key: checkpoint["state"][key] for key in indicator_cls._PARAMS}
+        indicator = indicator_cls(**params)
+        indicator.load_state(checkpoint)
+        return indicator
+
+
+def _all_subclasses(cls):
+    for sub in cls.__subclasses__():
+        yield sub
+        yield from _all_subclasses(sub)
+
+
+class SMA(StreamingIndicator):
+    """Simple moving average over a fixed window."""
+    
+    _PARAMS = ("period",)
+    
+    def __init__(self, period: int):
+        """
+        Initialize SMA.
+        
+        Args:
+            period: Window length
+        """
+        self.period = period
+        self._window = deque(maxlen=period)
+        self._sum = 0.0
+        self._value = None
+    
+    def update(self, close: float) -> Optional[float]:
+        """
+        Feed the next close.
+        
+        Args:
+            close: Close price
+            
+        Returns:
+            Average of the last ``period`` closes, or None while warming up
+        """
+        if len(self._window) == self.period:
+            self._sum -= self._window[0]
+        self._window.append(close)
+        self._sum += close
+        self._value = self._sum / self.period if len(self._window) == self.period else None
+        return self._value
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average seeded with the first value."""
+    
+    _PARAMS = ("period",)
+    
+    def __init__(self, period: int):
+        """
+        Initialize EMA.
+        
+        Args:
+            period: EMA span (alpha = 2 / (period + 1))
+        """
+        self.period = period
+        self._alpha = 2 / (period + 1)
+        self._value = None
+    
+    def update(self, close: float) -> float:
+        """
+        Feed the next close.
+        
+        Args:
+            close: Close price
+            
+        Returns:
+            Current EMA
+        """
+        if self._value is None:
+            self._value = close
+        else:
+            self._value = self._value * (1 - self._alpha) + close * self._alpha
+        return self._value
+
+
+class _Wilder(StreamingIndicator):
+    """Wilder smoothing seeded with the average of the first ``period`` values."""
+    
+    _PARAMS = ("period",)
+    
+    def __init__(self, period: int):
+        self.period = period
+        self._count = 0
+        self._seed_sum = 0.0
+        self._value = None
+    
+    def update(self, x: float) -> Optional[float]:
+        if self._value is not None:
+            alpha = 1 / self.period
+            self._value = self._value * (1 - alpha) + x * alpha
+            return self._value
+        
+        self._count += 1
+        self._seed_sum += x
+        if self._count == self.period:
+            self._value = self._seed_sum / self.period
+        return self._value
+
+
+class RSI(StreamingIndicator):
+    """Relative Strength Index with Wilder smoothing."""
+    
+    _PARAMS = ("period",)
+    
+    def __init__(self, period: int = 14):
+        """
+        Initialize RSI.
+        
+        Args:
+            period: Lookback period (default: 14)
+        """
+        self.period = period
+        self._prev_close = None
+        self._gain = _Wilder(period)
+        self._loss = _Wilder(period)
+        self._value = None
+    
+    def update(self, close: float) -> Optional[float]:
+        """
+        Feed the next close.
+        
+        Args:
+            close: Close price
+            
+        Returns:
+            RSI in [0, 100], or None while warming up
+        """
+        if self._prev_close is None:
+            self._prev_close = close
+            return None
+        
+        change = close - self._prev_close
+        self._prev_close = close
+        avg_gain = self._gain.update(change if change > 0 else 0.0)
+        avg_loss = self._loss.update(-change if change < 0 else 0.0)
+        
+        if avg_gain is None:
+            self._value = None
+        elif avg_loss == 0:
+            self._value = 100.0
+        else:
+            self._value = 100 - 100 / (1 + avg_gain / avg_loss)
+        return self._value
+
+
+class ATR(StreamingIndicator):
+    """Average True Range with Wilder smoothing."""
+    
+    _PARAMS = ("period",)
+    
+    def __init__(self, period: int = 14):
+        """
+        Initialize ATR.
+        
+        Args:
+            period: Lookback period (default: 14)
+        """
+        self.period = period
+        self._prev_close = None
+        self._range = _Wilder(period)
+        self._value = None
+    
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        """
+        Feed the next candle.
+        
+        Args:
+            high: High price
+            low: Low price
+            close: Close price
+            
+        Returns:
+            Current ATR, or None while warming up
+        """
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self._value = self._range.update(tr)
+        return self._value
+
+
+class BollingerBands(StreamingIndicator):
+    """Bollinger Bands from running window sums."""
+    
+    _PARAMS = ("period", "num_std")
+    
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        """
+        Initialize Bollinger Bands.
+        
+        Args:
+            period: Window length (default: 20)
+            num_std: Band width in standard deviations (default: 2)
+        """
+        self.period = period
+        self.num_std = num_std
+        self._window = deque(maxlen=period)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._value = None
+    
+    def update(self, close: float) -> Optional[Tuple[float, float, float]]:
+        """
+        Feed the next close.
+        
+        Args:
+            close: Close price
+            
+        Returns:
+            Tuple of (middle, upper, lower), or None while warming up
+        """
+        if len(self._window) == self.period:
+            old = self._window[0]
+            self._sum -= old
+            self._sum_sq -= old * old
+        self._window.append(close)
+        self._sum += close
+        self._sum_sq += close * close
+        
+        if len(self._window) < self.period:
+            self._value = None
+            return None
+        
+        mean = self._sum / self.period
+        std = math.sqrt(max(0.0, self._sum_sq / self.period - mean * mean))
+        self._value = (mean, mean + self.num_std * std, mean - self.num_std * std)
+        return self._value
+
+
+class VWAP(StreamingIndicator):
+    """Cumulative volume-weighted average price from the typical price."""
+    
+    _PARAMS = ()
+    
+    def __init__(self):
+        """Initialize VWAP."""
+        self._pv = 0.0
+        self._volume = 0.0
+        self._value = None
+    
+    def update(self, high: float, low: float, close: float, volume: float) -> Optional[float]:
+        """
+        Feed the next candle.
+        
+        Args:
+            high: High price
+            low: Low price
+            close: Close price
+            volume: Volume in base units
+            
+        Returns:
+            Current VWAP, or None until some volume has traded
+        """
+        self._pv += (high + low + close) / 3 * volume
+        self._volume += volume
+        self._value = self._pv / self._volume if self._volume else None
+        return self._value
+    
+    def reset(self) -> None:
+        """Start a new VWAP session."""
+        self._pv = 0.0
+        self._volume = 0.0
+        self._value = None
+
+
+class MACD(StreamingIndicator):
+    """Moving Average Convergence Divergence."""
+    
+    _PARAMS = ("fast", "slow", "signal")
+    
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        """
+        Initialize MACD.
+        
+        Args:
+            fast: Fast EMA span (default: 12)
+            slow: Slow EMA span (default: 26)
+            signal: Signal line EMA span (default: 9)
+        """
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        self._fast_ema = EMA(fast)
+        self._slow_ema = EMA(slow)
+        self._signal_ema = EMA(signal)
+        self._value = None
+    
+    def update(self, close: float) -> Tuple[float, float, float]:
+        """
+        Feed the next close.
+        
+        Args:
+            close: Close price
+            
+        Returns:
+            Tuple of (macd, signal, histogram)
+        """
+        macd_line = self._fast_ema.update(close) - self._slow_ema.update(close)
+        signal_line = self._signal_ema.update(macd_line)
+        self._value = (macd_line, signal_line, macd_line - signal_line)
+        return self._value
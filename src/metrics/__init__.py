@@ -0,0 +1,27 @@
+"""Latency, error, payload and cache metrics for providers and strategies."""
+from .registry import (
+    DEFAULT_BUCKETS,
+    Histogram,
+    MetricsRegistry,
+    disable_metrics,
+    enable_metrics,
+    get_registry,
+    instrument_methods,
+    instrumented,
+)
+from .sinks import InMemorySink, JsonLinesSink, MetricsSink, PrometheusFileSink
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "Histogram",
+    "MetricsRegistry",
+    "disable_metrics",
+    "enable_metrics",
+    "get_registry",
+    "instrument_methods",
+    "instrumented",
+    "InMemorySink",
+    "JsonLinesSink",
+    "MetricsSink",
+    "PrometheusFileSink",
+]
@@ -0,0 +1,476 @@
+"""Latency histograms and counters for instrumented provider and strategy calls."""
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Latency bucket upper bounds in seconds (a final +Inf bucket is implicit)
+DEFAULT_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Registry receiving measurements; None means instrumentation is off
+_active_registry: Optional["MetricsRegistry"] = None
+
+# Instrumented calls in progress in this thread or task, as (id(instance),
+# operation) and (id(instance), None) pairs (see _enter_call)
+_active_calls: ContextVar[frozenset] = ContextVar("active_instrumented_calls", default=frozenset())
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum and max."""
+    
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+    
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize histogram.
+        
+        Args:
+            bounds: Increasing bucket upper bounds
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, value: float) -> None:
+        """Add one observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+    
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, observations at or below it) per bucket, ending with +Inf."""
+        result = []
+        running = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by interpolating inside its bucket.
+        
+        Args:
+            q: Quantile between 0 and 1
+            
+        Returns:
+            Estimated value, or None without observations
+        """
+        if self.count == 0:
+            return None
+        
+        rank = q * self.count
+        running = 0
+        lower = 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and running + count >= rank:
+                return min(lower + (bound - lower) * (rank - running) / count, self.max)
+            running += count
+            lower = bound
+        return self.max
+
+
+class _CallStats:
+    """Measurements of one (component, owner, operation)."""
+    
+    __slots__ = ("latency", "errors", "items", "bytes", "cache")
+    
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.latency = Histogram(bounds)
+        self.errors = 0
+        self.items = 0
+        self.bytes = 0
+        self.cache = {"hit": 0, "miss": 0, "coalesced": 0}
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of call measurements, flushed to pluggable sinks.
+    
+    Every measurement is keyed by component ('provider' or 'strategy'),
+    owner (the concrete class name) and operation (the method name).
+    Calls record latency, errors and result size; providers that see raw
+    responses (the async provider) also record response bytes, and caches
+    record hits and misses.
+    """
+    
+    def __init__(
+        self,
+        sinks: Optional[Iterable["MetricsSink"]] = None,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        """
+        Initialize metrics registry.
+        
+        Args:
+            sinks: Destinations written by flush() (see src.metrics.sinks)
+            buckets: Latency bucket upper bounds in seconds
+        """
+        self.sinks = list(sinks or [])
+        self.buckets = tuple(buckets)
+        self._stats: Dict[Tuple[str, str, str], _CallStats] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _get(self, key: Tuple[str, str, str]) -> _CallStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _CallStats(self.buckets)
+        return stats
+    
+    def record_call(
+        self,
+        component: str,
+        owner: str,
+        operation: str,
+        seconds: float,
+        error: bool = False,
+        items: int = 0
+    ) -> None:
+        """
+        Record one call.
+        
+        Args:
+            component: 'provider', 'strategy' or another subsystem name
+            owner: Class (or instance) name
+            operation: Method name
+            seconds: Wall time of the call
+            error: Whether the call failed
+            items: Size of the result (rows, entries)
+        """
+        with self._lock:
+            stats = self._get((component, owner, operation))
+            stats.latency.observe(seconds)
+            stats.items += items
+            if error:
+                stats.errors += 1
+    
+    def record_cache(self, owner: str, operation: str, result: str) -> None:
+        """
+        Record a cache lookup.
+        
+        Args:
+            owner: Caching class name
+            operation: Cached method name
+            result: 'hit', 'miss' or 'coalesced'
+        """
+        with self._lock:
+            self._get(("cache", owner, operation)).cache[result] += 1
+    
+    def record_bytes(self, component: str, owner: str, operation: str, nbytes: int) -> None:
+        """
+        Record a response payload size.
+        
+        Args:
+            component: Subsystem name (e.g., 'provider')
+            owner: Class name
+            operation: Request name (e.g., the endpoint path)
+            nbytes: Payload size in bytes
+        """
+        with self._lock:
+            self._get((component, owner, operation)).bytes += nbytes
+    
+    def snapshot(self) -> List[Dict]:
+        """
+        Get the current measurements.
+        
+        Returns:
+            One dictionary per (component, owner, operation) with 'count',
+            'errors', 'error_rate', 'total_seconds', 'max_seconds',
+            'p50_seconds', 'p95_seconds', 'p99_seconds', 'items', 'bytes',
+            'cache' (hit/miss/coalesced counts and hit_rate) and 'buckets'
+            (cumulative (upper bound, count) pairs)
+        """
+        timestamp = datetime.utcnow().isoformat()
+        with self._lock:
+            entries = []
+            for (component, owner, operation), stats in sorted(self._stats.items()):
+                latency = stats.latency
+                lookups = sum(stats.cache.values())
+                entries.append({
+                    "timestamp": timestamp,
+                    "component": component,
+                    "owner": owner,
+                    "operation": operation,
+                    "count": latency.count,
+                    "errors": stats.errors,
+                    "error_rate": stats.errors / latency.count if latency.count else 0.0,
+                    "total_seconds": latency.total,
+                    "max_seconds": latency.max,
+                    "p50_seconds": latency.quantile(0.5),
+                    "p95_seconds": latency.quantile(0.95),
+                    "p99_seconds": latency.quantile(0.99),
+                    "items": stats.items,
+                    "bytes": stats.bytes,
+                    "cache": {
+                        **stats.cache,
+                        "hit_rate": (stats.cache["hit"] + stats.cache["coalesced"]) / lookups if lookups else None,
+                    },
+                    "buckets": latency.cumulative(),
+                })
+        return entries
+    
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Get measurements keyed by 'component.owner.operation'.
+        
+        Returns:
+            Dictionary of snapshot() entries without the bucket counts
+        """
+        return {
+            f"{entry['component']}.{entry['owner']}.{entry['operation']}": {
+                name: value for name, value in entry.items() if name != "buckets"
+            }
+            for entry in self.snapshot()
+        }
+    
+    def reset(self) -> None:
+        """Discard every measurement."""
+        with self._lock:
+            self._stats.clear()
+    
+    def flush(self) -> None:
+        """Write the current measurements to every sink."""
+        entries = self.snapshot()
+        for sink in self.sinks:
+            try:
+                sink.emit(entries)
+            except Exception as e:
+                print(f"Error writing metrics to {type(sink).__name__}: {e}")
+    
+    def start(self, interval: float) -> None:
+        """
+        Flush to the sinks every ``interval`` seconds on a background thread.
+        
+        Args:
+            interval: Seconds between flushes
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        
+        def run():
+            while not self._stop.wait(interval):
+                self.flush()
+        
+        self._thread = threading.Thread(target=run, name="metrics-flush", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop periodic flushing and write a final flush."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+def enable_metrics(
+    registry: Optional[MetricsRegistry] = None,
+    sinks: Optional[Iterable["MetricsSink"]] = None,
+    flush_interval: Optional[float] = None
+) -> MetricsRegistry:
+    """
+    Turn instrumentation on for every provider and strategy.
+    
+    Args:
+        registry: Registry to record into (default: a new one)
+        sinks: Sinks for a new registry
+        flush_interval: Flush to the sinks periodically (seconds)
+        
+    Returns:
+        The active registry
+    """
+    global _active_registry
+    
+    if registry is None:
+        registry = MetricsRegistry(sinks)
+    if flush_interval:
+        registry.start(flush_interval)
+    _active_registry = registry
+    return registry
+
+
+def disable_metrics() -> Optional[MetricsRegistry]:
+    """
+    Turn instrumentation off, stopping periodic flushes with a final flush.
+    
+    Returns:
+        The registry that was active, or None
+    """
+    global _active_registry
+    
+    registry, _active_registry = _active_registry, None
+    if registry is not None:
+        registry.stop()
+    return registry
+
+
+def get_registry() -> Optional[MetricsRegistry]:
+    """Get the active registry (None while instrumentation is off)."""
+    return _active_registry
+
+
+def _result_items(result: Any) -> int:
+    """Rows or entries in a call result."""
+    if result is None:
+        return 0
+    if isinstance(result, (int, float, str)):
+        return 1
+    try:
+        return len(result)
+    except TypeError:
+        return 1
+
+
+def _result_present(result: Any) -> int:
+    """One item per non-None result."""
+    return 0 if result is None else 1
+
+
+def _enter_call(instance: Any, operation: str, nested: bool):
+    """
+    Mark an instrumented call as in progress.
+    
+    Returns:
+        Token for _active_calls.reset, or None if an enclosing call on the
+        same instance already measures this one (the same operation, e.g.
+        an override calling super(); or any operation when ``nested`` is
+        False)
+    """
+    active = _active_calls.get()
+    instance_id = id(instance)
+    if (instance_id, operation if nested else None) in active:
+        return None
+    return _active_calls.set(active | {(instance_id, operation), (instance_id, None)})
+
+
+def instrumented(
+    component: str,
+    none_is_error: bool = False,
+    count_items: bool = True,
+    nested: bool = True
+) -> Callable[[Callable], Callable]:
+    """
+    Decorate a method so its calls are measured while metrics are enabled.
+    
+    The owner is the class of ``self`` at call time, so inherited methods
+    are reported under the concrete class. Only the outermost call of an
+    operation on an instance is recorded, so overrides that call super()
+    (each wrapped by instrument_methods) count once. While metrics are
+    disabled the only cost is one global lookup per call.
+    
+    Args:
+        component: Component label (e.g., 'provider', 'strategy')
+        none_is_error: Count a None result as an error (for methods that
+            print errors and return None)
+        count_items: Record the length of each result as items; if False,
+            every non-None result counts as one item (signals, setups)
+        nested: Record calls made from inside another instrumented call on
+            the same instance; if False only the outermost call is
+            recorded (e.g., get_market_data but not the get_current_price
+            it calls)
+        
+    Returns:
+        Decorator for sync or async methods
+    """
+    def decorate(method: Callable) -> Callable:
+        operation = method.__name__
+        size = _result_items if count_items else _result_present
+        
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                registry = _active_registry
+                if registry is None:
+                    return await method(self, *args, **kwargs)
+                token = _enter_call(self, operation, nested)
+                if token is None:
+                    return await method(self, *args, **kwargs)
+                
+                start = time.perf_counter()
+                try:
+                    result = await method(self, *args, **kwargs)
+                except BaseException:
+                    registry.record_call(component, type(self).__name__, operation, time.perf_counter() - start, True)
+                    raise
+                finally:
+                    _active_calls.reset(token)
+                registry.record_call(
+                    component, type(self).__name__, operation, time.perf_counter() - start,
+                    none_is_error and result is None, size(result)
+                )
+                return result
+            
+            async_wrapper.__instrumented__ = True
+            return async_wrapper
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            registry = _active_registry
+            if registry is None:
+                return method(self, *args, **kwargs)
+            token = _enter_call(self, operation, nested)
+            if token is None:
+                return method(self, *args, **kwargs)
+            
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except BaseException:
+                registry.record_call(component, type(self).__name__, operation, time.perf_counter() - start, True)
+                raise
+            finally:
+                _active_calls.reset(token)
+            registry.record_call(
+                component, type(self).__name__, operation, time.perf_counter() - start,
+                none_is_error and result is None, size(result)
+            )
+            return result
+        
+        wrapper.__instrumented__ = True
+        return wrapper
+    
+    return decorate
+
+
+def instrument_methods(
+    cls: type,
+    methods: Iterable[str],
+    component: str,
+    none_is_error: bool = False,
+    count_items: bool = True,
+    nested: bool = True
+) -> None:
+    """
+    Wrap the named methods defined directly on ``cls`` with instrumented().
+    
+    Used from __init_subclass__ hooks so every subclass is measured
+    without decorating each override.
+    
+    Args:
+        cls: Class to patch
+        methods: Method names
+        component: Component label
+        none_is_error: Count a None result as an error
+        count_items: Record result lengths as items (see instrumented())
+        nested: Record calls made inside another instrumented call on the
+            same instance (see instrumented())
+    """
+    for name in methods:
+        method = cls.__dict__.get(name)
+        if callable(method) and not getattr(method, "__instrumented__", False):
+            setattr(cls, name, instrumented(component, none_is_error, count_items, nested)(method))
@@ -0,0 +1,149 @@
+"""Destinations for metrics snapshots."""
+import json
+import math
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+class MetricsSink(ABC):
+    """Abstract base class for metrics destinations."""
+    
+    @abstractmethod
+    def emit(self, entries: List[Dict]) -> None:
+        """
+        Write one snapshot.
+        
+        Args:
+            entries: MetricsRegistry.snapshot() entries
+        """
+        pass
+
+
+class InMemorySink(MetricsSink):
+    """Keep the most recent snapshots in process (dashboards, tests, notebooks)."""
+    
+    def __init__(self, max_snapshots: int = 100):
+        """
+        Initialize in-memory sink.
+        
+        Args:
+            max_snapshots: Number of snapshots kept
+        """
+        self.snapshots = deque(maxlen=max_snapshots)
+    
+    def emit(self, entries: List[Dict]) -> None:
+        self.snapshots.append(entries)
+    
+    @property
+    def latest(self) -> Optional[List[Dict]]:
+        """Most recent snapshot, or None before the first flush."""
+        return self.snapshots[-1] if self.snapshots else None
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else repr(bound)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class PrometheusFileSink(MetricsSink):
+    """
+    Write the Prometheus text exposition format to a file.
+    
+    Point node_exporter's textfile collector at the directory to scrape it.
+    The file is replaced atomically so a scrape never reads half a write.
+    """
+    
+    def __init__(self, path: Union[str, Path], prefix: str = "redemption"):
+        """
+        Initialize Prometheus file sink.
+        
+        Args:
+            path: Output file (conventionally ending in .prom)
+            prefix: Metric name prefix
+        """
+        self.path = Path(path)
+        self.prefix = prefix
+    
+    def render(self, entries: List[Dict]) -> str:
+        """
+        Format a snapshot as Prometheus text.
+        
+        Args:
+            entries: MetricsRegistry.snapshot() entries
+            
+        Returns:
+            Exposition text
+        """
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_call_seconds Call latency in seconds.",
+            f"# TYPE {p}_call_seconds histogram",
+        ]
+        counters = {
+            "errors": [f"# HELP {p}_call_errors_total Failed calls.", f"# TYPE {p}_call_errors_total counter"],
+            "items": [f"# HELP {p}_result_items_total Rows or entries returned.", f"# TYPE {p}_result_items_total counter"],
+            "bytes": [f"# HELP {p}_response_bytes_total Response payload bytes.", f"# TYPE {p}_response_bytes_total counter"],
+            "cache": [f"# HELP {p}_cache_requests_total Cache lookups by result.", f"# TYPE {p}_cache_requests_total counter"],
+        }
+        
+        for entry in entries:
+            labels = (
+                f'component="{_escape(entry["component"])}",'
+                f'owner="{_escape(entry["owner"])}",'
+                f'operation="{_escape(entry["operation"])}"'
+            )
+            if entry["count"]:
+                for bound, count in entry["buckets"]:
+                    lines.append(f'{p}_call_seconds_bucket{{{labels},le="{_format_bound(bound)}"}} {count}')
+                lines.append(f"{p}_call_seconds_sum{{{labels}}} {entry['total_seconds']!r}")
+                lines.append(f"{p}_call_seconds_count{{{labels}}} {entry['count']}")
+                counters["errors"].append(f"{p}_call_errors_total{{{labels}}} {entry['errors']}")
+                counters["items"].append(f"{p}_result_items_total{{{labels}}} {entry['items']}")
+            if entry["bytes"]:
+                counters["bytes"].append(f"{p}_response_bytes_total{{{labels}}} {entry['bytes']}")
+            for result in ("hit", "miss", "coalesced"):
+                if entry["cache"][result]:
+                    counters["cache"].append(
+                        f'{p}_cache_requests_total{{{labels},result="{result}"}} {entry["cache"][result]}'
+                    )
+        
+        for block in counters.values():
+            lines.extend(block)
+        return "\n".join(lines) + "\n"
+    
+    def emit(self, entries: List[Dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(self.render(entries), encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+
+class JsonLinesSink(MetricsSink):
+    """Append one JSON object per entry and flush to a file (log shippers, offline analysis)."""
+    
+    def __init__(self, path: Union[str, Path], include_buckets: bool = False):
+        """
+        Initialize JSON lines sink.
+        
+        Args:
+            path: Output file, appended to
+            include_buckets: Also write the cumulative bucket counts
+        """
+        self.path = Path(path)
+        self.include_buckets = include_buckets
+    
+    def emit(self, entries: List[Dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                if not self.include_buckets:
+                    entry = {name: value for name, value in entry.items() if name != "buckets"}
+                else:
+                    entry = {**entry, "buckets": [[_format_bound(b), c] for b, c in entry["buckets"]]}
+                f.write(json.dumps(entry) + "\n")
@@ -1,4 +1,14 @@
 """Position sizing and management."""
+from .perp_calculator import DEFAULT_MARGIN_TIERS, MarginTiers, PerpPositionCalculator
+from .portfolio_risk import PortfolioRisk, historical_var
 from .position_calculator import PositionCalculator, PositionType
 
-__all__ = ["PositionCalculator", "PositionType"]
+__all__ = [
+    "DEFAULT_MARGIN_TIERS",
+    "MarginTiers",
+    "PerpPositionCalculator",
+    "PortfolioRisk",
+    "PositionCalculator",
+    "PositionType",
+    "historical_var",
+]
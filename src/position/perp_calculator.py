@@ -0,0 +1,322 @@
+"""Leverage, margin, fee and liquidation-aware sizing for perpetual futures."""
+from typing import Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from .position_calculator import PositionCalculator, PositionType
+
+
+# Illustrative USDT-margined tiers (notional cap, maintenance margin rate,
+# max leverage); load the real table for your exchange and contract
+DEFAULT_MARGIN_TIERS = [
+    (50_000, 0.004, 125),
+    (500_000, 0.005, 100),
+    (8_000_000, 0.01, 50),
+    (50_000_000, 0.025, 20),
+    (80_000_000, 0.05, 10),
+    (100_000_000, 0.1, 5),
+    (200_000_000, 0.125, 4),
+    (300_000_000, 0.15, 3),
+    (500_000_000, 0.25, 2),
+]
+
+
+class MarginTiers:
+    """
+    Tiered maintenance margin table.
+    
+    Each tier covers position notional up to its cap and has a maintenance
+    margin rate and a maximum leverage. The maintenance amount of each tier
+    is derived so maintenance margin (notional * rate - amount) is
+    continuous across tier boundaries, as exchanges define it.
+    """
+    
+    def __init__(self, tiers: Sequence[Tuple[float, float, float]] = DEFAULT_MARGIN_TIERS):
+        """
+        Initialize margin tiers.
+        
+        Args:
+            tiers: (notional cap, maintenance margin rate, max leverage) per
+                tier, in increasing notional order
+        """
+        if not tiers:
+            raise ValueError("At least one margin tier is required")
+        
+        table = np.asarray(tiers, dtype=np.float64)
+        self.caps = table[:, 0]
+        self.rates = table[:, 1]
+        self.max_leverage = table[:, 2]
+        if np.any(np.diff(self.caps) <= 0):
+            raise ValueError("Tier caps must be increasing")
+        
+        # amount_i = amount_{i-1} + floor_i * (rate_i - rate_{i-1})
+        floors = np.r_[0.0, self.caps[:-1]]
+        self.amounts = np.cumsum(floors * np.diff(self.rates, prepend=self.rates[0]))
+    
+    def lookup(self, notional: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the tier of each notional.
+        
+        Args:
+            notional: Position notional values
+            
+        Returns:
+            Tuple of (maintenance rate, maintenance amount, max leverage,
+            in-table mask); notionals above the last cap get the last tier
+            and in-table False
+        """
+        notional = np.asarray(notional, dtype=np.float64)
+        index = np.searchsorted(self.caps, notional, side='left')
+        in_table = index < len(self.caps)
+        index = np.minimum(index, len(self.caps) - 1)
+        return self.rates[index], self.amounts[index], self.max_leverage[index], in_table
+
+
+class PerpPositionCalculator(PositionCalculator):
+    """
+    Size USDT-margined perpetual positions with isolated margin.
+    
+    The loss budget covers the move to the stop plus the entry fee, the
+    taker fee on the stop exit and the funding expected while the trade is
+    held, so hitting the stop costs max_loss_amount all in. Each setup also
+    gets its margin, tiered maintenance margin and liquidation price, and
+    is rejected when the stop sits at or beyond liquidation (the position
+    would be liquidated before the stop fills) or the leverage is above
+    what the notional's tier allows.
+    
+    Funding is a rate per interval paid by longs to shorts when positive;
+    only funding that is paid counts as risk, received funding is ignored.
+    """
+    
+    def __init__(
+        self,
+        max_loss_amount: float,
+        leverage: float = 10.0,
+        taker_fee: float = 0.0005,
+        maker_fee: float = 0.0002,
+        funding_rate: float = 0.0001,
+        funding_interval_hours: float = 8.0,
+        holding_hours: float = 0.0,
+        maker_entry: bool = False,
+        margin_tiers: Optional[MarginTiers] = None
+    ):
+        """
+        Initialize perpetual position calculator.
+        
+        Args:
+            max_loss_amount: Maximum amount willing to lose per trade,
+                including fees and funding
+            leverage: Default leverage
+            taker_fee: Taker fee rate (entries by default, and stop exits)
+            maker_fee: Maker fee rate (target exits, and entries if maker_entry)
+            funding_rate: Expected funding rate per funding interval
+            funding_interval_hours: Hours between funding payments
+            holding_hours: Default expected holding time for funding
+            maker_entry: Entries are limit orders paying the maker fee
+            margin_tiers: Maintenance margin table (default: DEFAULT_MARGIN_TIERS)
+        """
+        super().__init__(max_loss_amount)
+        if leverage <= 0:
+            raise ValueError("Leverage must be positive")
+        
+        self.leverage = leverage
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.funding_rate = funding_rate
+        self.funding_interval_hours = funding_interval_hours
+        self.holding_hours = holding_hours
+        self.maker_entry = maker_entry
+        self.margin_tiers = margin_tiers or MarginTiers()
+    
+    def calculate_position_size(
+        self,
+        current_price: float,
+        stop_loss: float,
+        target_price: float,
+        position_type: Optional[PositionType] = None,
+        leverage: Optional[float] = None,
+        holding_hours: Optional[float] = None
+    ) -> dict:
+        """
+        Calculate a perpetual position size with margin and liquidation.
+        
+        Args:
+            current_price: Current market price (entry)
+            stop_loss: Stop loss price
+            target_price: Target profit price
+            position_type: Optional position type (auto-determined if None)
+            leverage: Leverage for this trade (default: calculator leverage)
+            holding_hours: Expected holding time (default: calculator value)
+            
+        Returns:
+            Dictionary with the PositionCalculator fields plus leverage,
+            notional, initial_margin, maintenance_margin,
+            maintenance_margin_rate, liquidation_price, entry_fee,
+            exit_fee (maker fee at the target), funding_cost and
+            max_leverage; entry_cost is the margin plus the entry fee
+            
+        Raises:
+            ValueError: If the stop equals the price, lies beyond the
+                liquidation price, or the leverage is too high for the tier
+        """
+        if current_price == stop_loss:
+            raise ValueError("Stop loss cannot equal current price")
+        
+        columns = self._size_arrays(
+            np.array([current_price], dtype=np.float64),
+            np.array([stop_loss], dtype=np.float64),
+            np.array([target_price], dtype=np.float64),
+            position_type if position_type is None else [position_type],
+            leverage,
+            holding_hours
+        )
+        row = {name: values[0].item() if isinstance(values[0], np.generic) else values[0] for name, values in columns.items()}
+        if not row.pop("valid"):
+            raise ValueError(row["reason"])
+        row.pop("reason")
+        return row
+    
+    def calculate_position_sizes(
+        self,
+        current_price: Union[pd.DataFrame, np.ndarray, list],
+        stop_loss: Optional[Union[np.ndarray, list]] = None,
+        target_price: Optional[Union[np.ndarray, list]] = None,
+        position_type: Optional[Union[PositionType, np.ndarray, list]] = None,
+        leverage: Optional[Union[float, np.ndarray, list]] = None,
+        holding_hours: Optional[Union[float, np.ndarray, list]] = None
+    ) -> pd.DataFrame:
+        """
+        Size many perpetual setups at once with vectorized NumPy arithmetic.
+        
+        Rows that cannot be taken come back with valid=False and the reason
+        ('zero risk', 'stop beyond liquidation', 'leverage above tier
+        maximum' or 'notional above margin tiers'); their numbers are still
+        filled in where they can be computed.
+        
+        Args:
+            current_price: Array of current prices, or a DataFrame with
+                'current_price', 'stop_loss', 'target_price' and optionally
+                'position_type', 'leverage' and 'holding_hours' columns
+            stop_loss: Array of stop loss prices (ignored for DataFrame input)
+            target_price: Array of target prices (ignored for DataFrame input)
+            position_type: Optional PositionType for every row, or an array of
+                PositionType / 'LONG' / 'SHORT' values (auto-determined if None)
+            leverage: Leverage for every row or per row (default: calculator leverage)
+            holding_hours: Expected holding time for every row or per row
+            
+        Returns:
+            DataFrame with one row per setup, the columns of
+            calculate_position_size, and 'valid' and 'reason'
+        """
+        if isinstance(current_price, pd.DataFrame):
+            frame = current_price
+            current_price = frame['current_price']
+            stop_loss = frame['stop_loss']
+            target_price = frame['target_price']
+            if position_type is None and 'position_type' in frame.columns:
+                position_type = frame['position_type']
+            if leverage is None and 'leverage' in frame.columns:
+                leverage = frame['leverage']
+            if holding_hours is None and 'holding_hours' in frame.columns:
+                holding_hours = frame['holding_hours']
+        
+        return pd.DataFrame(self._size_arrays(
+            np.asarray(current_price, dtype=np.float64),
+            np.asarray(stop_loss, dtype=np.float64),
+            np.asarray(target_price, dtype=np.float64),
+            position_type,
+            leverage,
+            holding_hours
+        ))
+    
+    def _size_arrays(
+        self,
+        current: np.ndarray,
+        stop: np.ndarray,
+        target: np.ndarray,
+        position_type: Optional[Union[PositionType, np.ndarray, list]],
+        leverage: Optional[Union[float, np.ndarray, list]],
+        holding_hours: Optional[Union[float, np.ndarray, list]]
+    ) -> Dict[str, np.ndarray]:
+        """Compute every output column of calculate_position_sizes."""
+        lev = np.broadcast_to(np.asarray(self.leverage if leverage is None else leverage, dtype=np.float64), current.shape)
+        hours = np.broadcast_to(
+            np.asarray(self.holding_hours if holding_hours is None else holding_hours, dtype=np.float64),
+            current.shape
+        )
+        is_long = self.position_types_to_long(current, stop, position_type)
+        side = np.where(is_long, 1.0, -1.0)
+        
+        entry_rate = self.maker_fee if self.maker_entry else self.taker_fee
+        # Funding paid per unit over the holding time (received funding is not counted)
+        funding_per_unit = np.maximum(
+            side * self.funding_rate * current * hours / self.funding_interval_hours,
+            0.0
+        )
+        
+        # Everything lost per unit if the stop is hit
+        move_per_unit = np.abs(current - stop)
+        risk_per_unit = move_per_unit + current * entry_rate + stop * self.taker_fee + funding_per_unit
+        valid = move_per_unit != 0
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            safe_risk = np.where(valid, risk_per_unit, np.nan)
+            position_size = self.max_loss_amount / safe_risk
+            
+            notional = position_size * current
+            initial_margin = notional / lev
+            entry_fee = notional * entry_rate
+            stop_fee = position_size * stop * self.taker_fee
+            exit_fee = position_size * target * self.maker_fee
+            funding_cost = position_size * funding_per_unit
+            
+            rate, amount, max_leverage, in_table = self.margin_tiers.lookup(np.nan_to_num(notional))
+            maintenance_margin = notional * rate - amount
+            
+            # Isolated margin: equity (margin + PnL) falls to maintenance margin
+            long_liquidation = (notional - initial_margin - amount) / (position_size * (1.0 - rate))
+            short_liquidation = (notional + initial_margin + amount) / (position_size * (1.0 + rate))
+            liquidation_price = np.maximum(np.where(is_long, long_liquidation, short_liquidation), 0.0)
+            
+            potential_loss = position_size * move_per_unit + entry_fee + stop_fee + funding_cost
+            potential_profit = position_size * np.abs(target - current) - entry_fee - exit_fee - funding_cost
+            risk_reward_ratio = potential_profit / potential_loss
+        
+        stop_beyond_liquidation = np.where(is_long, stop <= liquidation_price, stop >= liquidation_price)
+        above_tiers = ~in_table
+        too_much_leverage = lev > max_leverage
+        
+        # Later assignments win, so the most basic problem is reported
+        reason = np.full(current.shape, None, dtype=object)
+        reason[above_tiers] = "notional above margin tiers"
+        reason[too_much_leverage] = "leverage above tier maximum"
+        reason[stop_beyond_liquidation] = "stop beyond liquidation"
+        reason[~valid] = "zero risk"
+        valid = valid & ~above_tiers & ~too_much_leverage & ~stop_beyond_liquidation
+        
+        types = np.where(is_long, PositionType.LONG.value, PositionType.SHORT.value).astype(object)
+        types[move_per_unit == 0] = None
+        
+        return {
+            "position_type": types,
+            "position_size": position_size,
+            "current_price": current,
+            "stop_loss": stop,
+            "target_price": target,
+            "risk_per_unit": safe_risk,
+            "potential_loss": potential_loss,
+            "potential_profit": potential_profit,
+            "risk_reward_ratio": risk_reward_ratio,
+            "entry_cost": initial_margin + entry_fee,
+            "leverage": lev.copy(),
+            "notional": notional,
+            "initial_margin": initial_margin,
+            "maintenance_margin": maintenance_margin,
+            "maintenance_margin_rate": rate,
+            "liquidation_price": liquidation_price,
+            "entry_fee": entry_fee,
+            "exit_fee": exit_fee,
+            "funding_cost": funding_cost,
+            "max_leverage": max_leverage,
+            "valid": valid,
+            "reason": reason,
+        }
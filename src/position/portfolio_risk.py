@@ -0,0 +1,538 @@
+"""Portfolio-level exposure, worst-case loss and VaR across open positions."""
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from .position_calculator import PositionType
+
+
+def historical_var(scenario_pnl: np.ndarray, confidence: float = 0.95) -> Tuple[float, float]:
+    """
+    Historical value at risk and conditional value at risk.
+    
+    Args:
+        scenario_pnl: Portfolio profit/loss in each historical scenario
+        confidence: Confidence level (e.g., 0.95 or 0.99)
+        
+    Returns:
+        Tuple of (VaR, CVaR) as positive loss amounts (0.0 if no scenarios)
+    """
+    pnl = np.asarray(scenario_pnl, dtype=np.float64)
+    if pnl.size == 0:
+        return 0.0, 0.0
+    
+    cutoff = np.quantile(pnl, 1.0 - confidence)
+    tail = pnl[pnl <= cutoff]
+    var = max(0.0, -float(cutoff))
+    cvar = max(0.0, -float(tail.mean())) if tail.size else var
+    return var, cvar
+
+
+class PortfolioRisk:
+    """
+    Aggregate risk of many open positions, recomputed with array arithmetic.
+    
+    Positions live in preallocated NumPy columns (symbol code, side, size,
+    entry, stop, leverage) and prices in one array indexed by symbol code,
+    so a price tick is a vectorized assignment and a full re-risk is a few
+    bincount and matrix-vector operations regardless of how many positions
+    are open. Removing a position moves the last row into its slot, keeping
+    the columns dense.
+    
+    Exposure is signed notional (long positive, short negative). The
+    worst-case loss of a position is what it loses from the current price
+    to its stop. VaR and CVaR are historical: the per-symbol net exposure
+    is applied to every row of a return matrix set with set_returns().
+    """
+    
+    def __init__(
+        self,
+        equity: Optional[float] = None,
+        max_total_loss: Optional[float] = None,
+        max_symbol_loss: Optional[float] = None,
+        max_gross_exposure: Optional[float] = None,
+        max_net_exposure: Optional[float] = None,
+        max_symbol_exposure: Optional[float] = None,
+        max_margin_usage: Optional[float] = None,
+        max_var: Optional[float] = None,
+        var_confidence: float = 0.95,
+        capacity: int = 64
+    ):
+        """
+        Initialize portfolio risk engine.
+        
+        Every limit is optional; None disables it.
+        
+        Args:
+            equity: Account equity, required for max_margin_usage
+            max_total_loss: Maximum summed loss if every stop is hit
+            max_symbol_loss: Maximum loss to stops per symbol
+            max_gross_exposure: Maximum summed absolute notional
+            max_net_exposure: Maximum absolute net notional
+            max_symbol_exposure: Maximum absolute net notional per symbol
+            max_margin_usage: Maximum margin used as a fraction of equity
+            max_var: Maximum historical VaR at var_confidence
+            var_confidence: Confidence level for VaR and CVaR
+            capacity: Initial number of position rows to allocate
+        """
+        if max_margin_usage is not None and not equity:
+            raise ValueError("equity is required for max_margin_usage")
+        if not 0 < var_confidence < 1:
+            raise ValueError("var_confidence must be between 0 and 1")
+        
+        self.equity = equity
+        self.limits = {
+            "total_loss": max_total_loss,
+            "symbol_loss": max_symbol_loss,
+            "gross_exposure": max_gross_exposure,
+            "net_exposure": max_net_exposure,
+            "symbol_exposure": max_symbol_exposure,
+            "margin_usage": max_margin_usage,
+            "var": max_var,
+        }
+        self.var_confidence = var_confidence
+        
+        # Position columns; rows [0, _count) are live
+        capacity = max(1, capacity)
+        self._count = 0
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._codes = np.zeros(capacity, dtype=np.int64)
+        self._sides = np.zeros(capacity, dtype=np.float64)
+        self._sizes = np.zeros(capacity, dtype=np.float64)
+        self._entries = np.zeros(capacity, dtype=np.float64)
+        self._stops = np.zeros(capacity, dtype=np.float64)
+        self._leverage = np.zeros(capacity, dtype=np.float64)
+        self._rows: Dict[int, int] = {}
+        self._next_id = 1
+        
+        # Per-symbol state, indexed by symbol code
+        self._symbols: List[str] = []
+        self._codes_by_symbol: Dict[str, int] = {}
+        self._prices = np.full(8, np.nan)
+        
+        # Return matrix columns ordered by symbol code (zeros for symbols without history)
+        self._returns: Optional[pd.DataFrame] = None
+        self._aligned_returns: Optional[np.ndarray] = None
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols seen so far, in symbol-code order."""
+        return list(self._symbols)
+    
+    def _symbol_code(self, symbol: str) -> int:
+        symbol = symbol.upper()
+        code = self._codes_by_symbol.get(symbol)
+        if code is None:
+            code = len(self._symbols)
+            self._symbols.append(symbol)
+            self._codes_by_symbol[symbol] = code
+            if code >= len(self._prices):
+                self._prices = np.concatenate([self._prices, np.full(len(self._prices), np.nan)])
+            self._aligned_returns = None
+        return code
+    
+    def _grow(self) -> None:
+        """Double the capacity of the position columns."""
+        for name in ("_ids", "_codes", "_sides", "_sizes", "_entries", "_stops", "_leverage"):
+            column = getattr(self, name)
+            grown = np.zeros(len(column) * 2, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+    
+    @staticmethod
+    def _side(position_type: Union[PositionType, str]) -> float:
+        value = position_type.value if isinstance(position_type, PositionType) else str(position_type).upper()
+        if value not in (PositionType.LONG.value, PositionType.SHORT.value):
+            raise ValueError(f"Invalid position type: {position_type}")
+        return 1.0 if value == PositionType.LONG.value else -1.0
+    
+    def add_position(
+        self,
+        symbol: str,
+        position_type: Union[PositionType, str],
+        size: float,
+        entry_price: float,
+        stop_loss: float,
+        leverage: float = 1.0
+    ) -> int:
+        """
+        Record an open position.
+        
+        The symbol's price is initialised to the entry price if no price
+        has been set yet.
+        
+        Args:
+            symbol: Trading symbol
+            position_type: PositionType or 'LONG' / 'SHORT'
+            size: Position size in units (positive)
+            entry_price: Entry price
+            stop_loss: Stop loss price
+            leverage: Leverage used; margin is notional / leverage
+            
+        Returns:
+            Position id
+        """
+        if size <= 0:
+            raise ValueError("size must be positive")
+        if leverage <= 0:
+            raise ValueError("leverage must be positive")
+        
+        side = self._side(position_type)
+        code = self._symbol_code(symbol)
+        if np.isnan(self._prices[code]):
+            self._prices[code] = entry_price
+        
+        if self._count == len(self._ids):
+            self._grow()
+        
+        row = self._count
+        position_id = self._next_id
+        self._next_id += 1
+        self._ids[row] = position_id
+        self._codes[row] = code
+        self._sides[row] = side
+        self._sizes[row] = size
+        self._entries[row] = entry_price
+        self._stops[row] = stop_loss
+        self._leverage[row] = leverage
+        self._rows[position_id] = row
+        self._count += 1
+        return position_id
+    
+    def add_setup(self, symbol: str, setup: Dict, leverage: float = 1.0) -> int:
+        """
+        Record a position sized by PositionCalculator.calculate_position_size.
+        
+        Args:
+            symbol: Trading symbol
+            setup: Dictionary returned by calculate_position_size
+            leverage: Leverage used
+            
+        Returns:
+            Position id
+        """
+        return self.add_position(
+            symbol,
+            setup["position_type"],
+            setup["position_size"],
+            setup["current_price"],
+            setup["stop_loss"],
+            leverage
+        )
+    
+    def remove_position(self, position_id: int) -> bool:
+        """
+        Remove a closed position.
+        
+        Args:
+            position_id: Id returned by add_position
+            
+        Returns:
+            True if the position was open
+        """
+        row = self._rows.pop(position_id, None)
+        if row is None:
+            return False
+        
+        last = self._count - 1
+        if row != last:
+            for column in (self._ids, self._codes, self._sides, self._sizes, self._entries, self._stops, self._leverage):
+                column[row] = column[last]
+            self._rows[int(self._ids[row])] = row
+        self._count = last
+        return True
+    
+    def update_position(
+        self,
+        position_id: int,
+        size: Optional[float] = None,
+        stop_loss: Optional[float] = None
+    ) -> bool:
+        """
+        Change the size or stop of an open position.
+        
+        Args:
+            position_id: Id returned by add_position
+            size: New size in units
+            stop_loss: New stop loss price
+            
+        Returns:
+            True if the position was found
+        """
+        row = self._rows.get(position_id)
+        if row is None:
+            return False
+        if size is not None:
+            if size <= 0:
+                raise ValueError("size must be positive")
+            self._sizes[row] = size
+        if stop_loss is not None:
+            self._stops[row] = stop_loss
+        return True
+    
+    def update_prices(self, prices: Mapping[str, float]) -> None:
+        """
+        Set current prices.
+        
+        Args:
+            prices: Mapping of symbol to price (e.g., one symbol's quote
+                currency from get_current_prices)
+        """
+        for symbol, price in prices.items():
+            if price is not None:
+                self._prices[self._symbol_code(symbol)] = price
+    
+    def set_returns(self, returns: pd.DataFrame) -> None:
+        """
+        Set the historical return matrix used for VaR and CVaR.
+        
+        Args:
+            returns: DataFrame of simple returns, one row per scenario (e.g.,
+                daily) and one column per symbol; symbols without a column
+                contribute no VaR
+        """
+        self._returns = returns.rename(columns=lambda column: str(column).upper())
+        self._aligned_returns = None
+    
+    def _returns_matrix(self, extra_symbol: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        Return matrix with columns in symbol-code order (cached until symbols change).
+        
+        Args:
+            extra_symbol: Unregistered symbol appended as a last column (not cached)
+        """
+        if self._returns is None:
+            return None
+        if extra_symbol is not None:
+            aligned = self._returns.reindex(columns=self._symbols + [extra_symbol]).fillna(0.0)
+            return np.ascontiguousarray(aligned.to_numpy(dtype=np.float64))
+        if self._aligned_returns is None or self._aligned_returns.shape[1] != len(self._symbols):
+            aligned = self._returns.reindex(columns=self._symbols).fillna(0.0)
+            self._aligned_returns = np.ascontiguousarray(aligned.to_numpy(dtype=np.float64))
+        return self._aligned_returns
+    
+    def _symbol_arrays(self) -> Dict[str, np.ndarray]:
+        """Per-symbol net exposure, gross exposure, loss to stop, margin and PnL."""
+        n = self._count
+        symbols = len(self._symbols)
+        codes = self._codes[:n]
+        sides = self._sides[:n]
+        sizes = self._sizes[:n]
+        prices = self._prices[codes]
+        
+        notional = sizes * prices
+        # Loss from the current price to the stop, zero once the price is already beyond the stop
+        stop_loss = np.maximum(sides * sizes * (prices - self._stops[:n]), 0.0)
+        
+        return {
+            "net_exposure": np.bincount(codes, sides * notional, minlength=symbols),
+            "gross_exposure": np.bincount(codes, notional, minlength=symbols),
+            "loss_to_stop": np.bincount(codes, stop_loss, minlength=symbols),
+            "margin": np.bincount(codes, notional / self._leverage[:n], minlength=symbols),
+            "unrealized_pnl": np.bincount(codes, sides * sizes * (prices - self._entries[:n]), minlength=symbols),
+        }
+    
+    def _totals(self, arrays: Dict[str, np.ndarray], extra_symbol: Optional[str] = None) -> Dict[str, float]:
+        """Portfolio totals, VaR and limit breaches from per-symbol arrays (see _returns_matrix)."""
+        net = arrays["net_exposure"]
+        totals = {
+            "gross_exposure": float(arrays["gross_exposure"].sum()),
+            "net_exposure": float(net.sum()),
+            "total_loss_to_stop": float(arrays["loss_to_stop"].sum()),
+            "margin_used": float(arrays["margin"].sum()),
+            "unrealized_pnl": float(arrays["unrealized_pnl"].sum()),
+            "margin_usage": None,
+            "var": None,
+            "cvar": None,
+        }
+        if self.equity:
+            totals["margin_usage"] = totals["margin_used"] / self.equity
+        
+        returns = self._returns_matrix(extra_symbol)
+        if returns is not None:
+            totals["var"], totals["cvar"] = historical_var(returns @ net, self.var_confidence)
+        
+        checks = self._limit_values(arrays, totals)
+        totals["breaches"] = [
+            name for name, value in checks.items()
+            if self.limits[name] is not None and value is not None and value > self.limits[name]
+        ]
+        return totals
+    
+    @staticmethod
+    def _limit_values(arrays: Dict[str, np.ndarray], totals: Dict) -> Dict[str, Optional[float]]:
+        """Value compared against each limit, keyed like self.limits."""
+        return {
+            "total_loss": totals["total_loss_to_stop"],
+            "symbol_loss": float(arrays["loss_to_stop"].max(initial=0.0)),
+            "gross_exposure": totals["gross_exposure"],
+            "net_exposure": abs(totals["net_exposure"]),
+            "symbol_exposure": float(np.abs(arrays["net_exposure"]).max(initial=0.0)),
+            "margin_usage": totals["margin_usage"],
+            "var": totals["var"],
+        }
+    
+    def risk(self) -> Dict:
+        """
+        Recompute portfolio risk at current prices.
+        
+        Returns:
+            Dictionary with portfolio totals (gross_exposure, net_exposure,
+            total_loss_to_stop, margin_used, margin_usage, unrealized_pnl,
+            var, cvar), 'breaches' (names of exceeded limits),
+            'positions' (open count) and 'by_symbol' (DataFrame indexed by
+            symbol)
+        """
+        arrays = self._symbol_arrays()
+        result = self._totals(arrays)
+        result["positions"] = self._count
+        
+        by_symbol = pd.DataFrame(arrays, index=pd.Index(self._symbols, name="symbol"))
+        by_symbol["price"] = self._prices[:len(self._symbols)]
+        result["by_symbol"] = by_symbol[by_symbol["gross_exposure"] != 0]
+        return result
+    
+    def positions(self) -> pd.DataFrame:
+        """
+        Get open positions with their current exposure.
+        
+        Returns:
+            DataFrame indexed by position id
+        """
+        n = self._count
+        codes = self._codes[:n]
+        sides = self._sides[:n]
+        prices = self._prices[codes]
+        return pd.DataFrame({
+            "symbol": np.array(self._symbols, dtype=object)[codes] if n else np.array([], dtype=object),
+            "position_type": np.where(sides > 0, PositionType.LONG.value, PositionType.SHORT.value),
+            "position_size": self._sizes[:n],
+            "entry_price": self._entries[:n],
+            "stop_loss": self._stops[:n],
+            "leverage": self._leverage[:n],
+            "price": prices,
+            "exposure": sides * self._sizes[:n] * prices,
+            "unrealized_pnl": sides * self._sizes[:n] * (prices - self._entries[:n]),
+        }, index=pd.Index(self._ids[:n].copy(), name="position_id"))
+    
+    def check_trade(
+        self,
+        symbol: str,
+        position_type: Union[PositionType, str],
+        size: float,
+        price: float,
+        stop_loss: float,
+        leverage: float = 1.0
+    ) -> Dict:
+        """
+        Check a new trade against the portfolio limits without adding it.
+        
+        Nothing is recorded: a symbol not seen before is not registered and
+        no price is stored until the position is added.
+        
+        Args:
+            symbol: Trading symbol
+            position_type: PositionType or 'LONG' / 'SHORT'
+            size: Proposed size in units
+            price: Expected entry price
+            stop_loss: Stop loss price
+            leverage: Leverage to be used
+            
+        Returns:
+            Dictionary with 'allowed', 'breaches' (limits the portfolio would
+            exceed with the trade and that the trade moves further from,
+            including limits already exceeded before it), 'max_size'
+            (largest size within the exposure, loss and margin limits) and
+            'after' (portfolio totals with the trade)
+        """
+        side = self._side(position_type)
+        symbol = symbol.upper()
+        arrays = self._symbol_arrays()
+        before = self._totals(arrays)
+        
+        code = self._codes_by_symbol.get(symbol)
+        extra_symbol = None
+        if code is None:
+            # Evaluate an unseen symbol in a temporary empty slot after the known ones
+            extra_symbol = symbol
+            code = len(self._symbols)
+            arrays = {name: np.append(values, 0.0) for name, values in arrays.items()}
+        
+        notional_per_unit = price
+        loss_per_unit = max(side * (price - stop_loss), 0.0)
+        
+        after_arrays = {name: values.copy() for name, values in arrays.items()}
+        after_arrays["net_exposure"][code] += side * size * notional_per_unit
+        after_arrays["gross_exposure"][code] += size * notional_per_unit
+        after_arrays["loss_to_stop"][code] += size * loss_per_unit
+        after_arrays["margin"][code] += size * notional_per_unit / leverage
+        after = self._totals(after_arrays, extra_symbol)
+        
+        # A limit already exceeded still blocks trades that make it worse
+        before_values = self._limit_values(arrays, before)
+        after_values = self._limit_values(after_arrays, after)
+        breaches = [
+            name for name in after["breaches"]
+            if before_values[name] is None or after_values[name] > before_values[name]
+        ]
+        return {
+            "allowed": not breaches,
+            "breaches": breaches,
+            "max_size": self._max_size(arrays, code, side, notional_per_unit, loss_per_unit, leverage),
+            "after": after,
+        }
+    
+    def check_setup(self, symbol: str, setup: Dict, leverage: float = 1.0) -> Dict:
+        """
+        Check a PositionCalculator.calculate_position_size result against the limits.
+        
+        Args:
+            symbol: Trading symbol
+            setup: Dictionary returned by calculate_position_size
+            leverage: Leverage to be used
+            
+        Returns:
+            Same dictionary as check_trade
+        """
+        return self.check_trade(
+            symbol,
+            setup["position_type"],
+            setup["position_size"],
+            setup["current_price"],
+            setup["stop_loss"],
+            leverage
+        )
+    
+    def _max_size(
+        self,
+        arrays: Dict[str, np.ndarray],
+        code: int,
+        side: float,
+        notional_per_unit: float,
+        loss_per_unit: float,
+        leverage: float
+    ) -> float:
+        """Largest size that keeps every linear limit satisfied (VaR is not included)."""
+        net_total = float(arrays["net_exposure"].sum())
+        net_symbol = float(arrays["net_exposure"][code])
+        
+        # (headroom, amount each unit uses) per limit
+        headroom = []
+        limits = self.limits
+        if limits["total_loss"] is not None:
+            headroom.append((limits["total_loss"] - arrays["loss_to_stop"].sum(), loss_per_unit))
+        if limits["symbol_loss"] is not None:
+            headroom.append((limits["symbol_loss"] - arrays["loss_to_stop"][code], loss_per_unit))
+        if limits["gross_exposure"] is not None:
+            headroom.append((limits["gross_exposure"] - arrays["gross_exposure"].sum(), notional_per_unit))
+        if limits["net_exposure"] is not None:
+            headroom.append((limits["net_exposure"] - side * net_total, notional_per_unit))
+        if limits["symbol_exposure"] is not None:
+            headroom.append((limits["symbol_exposure"] - side * net_symbol, notional_per_unit))
+        if limits["margin_usage"] is not None:
+            headroom.append((limits["margin_usage"] * self.equity - arrays["margin"].sum(), notional_per_unit / leverage))
+        
+        sizes = [max(room, 0.0) / per_unit for room, per_unit in headroom if per_unit > 0]
+        return float(min(sizes)) if sizes else float("inf")
@@ -1,6 +1,8 @@
 """Position sizing calculator for perpetual trading."""
 from enum import Enum
-from typing import Optional
+from typing import Optional, Union
+import numpy as np
+import pandas as pd
 
 
 class PositionType(Enum):
@@ -94,6 +96,106 @@ class PositionCalculator:
             "entry_cost": position_size * current_price
         }
     
+    @staticmethod
+    def position_types_to_long(
+        current: np.ndarray,
+        stop: np.ndarray,
+        position_type: Optional[Union[PositionType, np.ndarray, list]] = None
+    ) -> np.ndarray:
+        """
+        Resolve position types for a batch of trades.
+        
+        Args:
+            current: Array of current prices
+            stop: Array of stop loss prices
+            position_type: None (long when price is above stop), one
+                PositionType for every row, or an array of PositionType /
+                'LONG' / 'SHORT' values
+            
+        Returns:
+            Boolean array, True for long positions
+        """
+        if position_type is None:
+            return current > stop
+        if isinstance(position_type, PositionType):
+            return np.full(current.shape, position_type == PositionType.LONG)
+        return np.array([
+            (pt.value if isinstance(pt, PositionType) else pt) == PositionType.LONG.value
+            for pt in position_type
+        ], dtype=bool)
+    
+    def calculate_position_sizes(
+        self,
+        current_price: Union[pd.DataFrame, np.ndarray, list],
+        stop_loss: Optional[Union[np.ndarray, list]] = None,
+        target_price: Optional[Union[np.ndarray, list]] = None,
+        position_type: Optional[Union[PositionType, np.ndarray, list]] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate position sizes for many candidate trades at once.
+        
+        Produces the same numbers as calculate_position_size row by row, but
+        with vectorized NumPy arithmetic. Rows where the stop equals the
+        current price cannot be sized; instead of raising they come back
+        with valid=False and NaN numeric fields.
+        
+        Args:
+            current_price: Array of current prices, or a DataFrame with
+                'current_price', 'stop_loss', 'target_price' and optionally
+                'position_type' columns
+            stop_loss: Array of stop loss prices (ignored for DataFrame input)
+            target_price: Array of target prices (ignored for DataFrame input)
+            position_type: Optional PositionType for every row, or an array of
+                PositionType / 'LONG' / 'SHORT' values (auto-determined if None)
+            
+        Returns:
+            DataFrame with one row per trade and the same columns as
+            calculate_position_size, plus a boolean 'valid' column
+        """
+        if isinstance(current_price, pd.DataFrame):
+            frame = current_price
+            current_price = frame['current_price']
+            stop_loss = frame['stop_loss']
+            target_price = frame['target_price']
+            if position_type is None and 'position_type' in frame.columns:
+                position_type = frame['position_type']
+        
+        current = np.asarray(current_price, dtype=np.float64)
+        stop = np.asarray(stop_loss, dtype=np.float64)
+        target = np.asarray(target_price, dtype=np.float64)
+        
+        is_long = self.position_types_to_long(current, stop, position_type)
+        
+        # Same arithmetic as the scalar path so results match exactly
+        risk_per_unit = np.abs(current - stop)
+        potential_profit = np.abs(target - current)
+        valid = risk_per_unit != 0
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            safe_risk = np.where(valid, risk_per_unit, np.nan)
+            position_size = self.max_loss_amount / safe_risk
+            risk_reward_ratio = potential_profit / safe_risk
+            potential_loss = position_size * safe_risk
+            potential_profit_amount = position_size * potential_profit
+            entry_cost = position_size * current
+        
+        types = np.where(is_long, PositionType.LONG.value, PositionType.SHORT.value).astype(object)
+        types[~valid] = None
+        
+        return pd.DataFrame({
+            "position_type": types,
+            "position_size": position_size,
+            "current_price": current,
+            "stop_loss": stop,
+            "target_price": target,
+            "risk_per_unit": safe_risk,
+            "potential_loss": potential_loss,
+            "potential_profit": potential_profit_amount,
+            "risk_reward_ratio": risk_reward_ratio,
+            "entry_cost": entry_cost,
+            "valid": valid,
+        })
+    
     def update_max_loss(self, new_max_loss: float):
         """
         Update maximum loss amount.
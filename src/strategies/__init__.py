@@ -1,5 +1,7 @@
 """Trading strategies for perpetual futures."""
 from .base_strategy import BaseStrategy
+from .market_snapshot import MarketSnapshot
+from .scheduler import StrategyScheduler
 from .simple_strategy import SimpleStopLossStrategy
 
-__all__ = ["BaseStrategy", "SimpleStopLossStrategy"]
+__all__ = ["BaseStrategy", "MarketSnapshot", "SimpleStopLossStrategy", "StrategyScheduler"]
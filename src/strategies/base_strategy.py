@@ -1,13 +1,25 @@
 """Base strategy class for trading strategies."""
 from abc import ABC, abstractmethod
 from typing import Optional, Dict
+import pandas as pd
 from ..data_providers.base_provider import BaseDataProvider
+from ..metrics.registry import instrument_methods
 from ..position.position_calculator import PositionCalculator
+from .market_snapshot import MarketSnapshot
+
+
+# Strategy methods measured while metrics are enabled (see src.metrics);
+# items count the signals and setups they return
+INSTRUMENTED_METHODS = ("execute_strategy", "generate_signal", "calculate_entry", "generate_signals")
 
 
 class BaseStrategy(ABC):
     """Abstract base class for trading strategies."""
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_methods(cls, INSTRUMENTED_METHODS, "strategy", count_items=False)
+    
     def __init__(
         self,
         data_provider: BaseDataProvider,
@@ -28,14 +40,32 @@ class BaseStrategy(ABC):
         self.position_calculator = position_calculator
         self.symbol = symbol
         self.currency = currency
+        # State of the evaluation in progress (None outside execute_strategy)
+        self.snapshot: Optional[MarketSnapshot] = None
+        self.signal: Optional[Dict] = None
+    
+    def capture_snapshot(self) -> MarketSnapshot:
+        """
+        Capture the market state for one evaluation.
+        
+        Returns:
+            Immutable MarketSnapshot of this strategy's pair (one data
+            provider call)
+        """
+        return MarketSnapshot.capture(self.data_provider, self.symbol, self.currency)
     
     def get_current_price(self) -> Optional[float]:
         """
         Get current market price.
         
+        During execute_strategy this is the price of the evaluation's
+        snapshot, so repeated calls never hit the data provider.
+        
         Returns:
             Current price or None
         """
+        if self.snapshot is not None:
+            return self.snapshot.price
         return self.data_provider.get_current_price(self.symbol, self.currency)
     
     def get_market_data(self) -> Optional[Dict]:
@@ -45,6 +75,8 @@ class BaseStrategy(ABC):
         Returns:
             Market data dictionary or None
         """
+        if self.snapshot is not None and self.snapshot.market_data is not None:
+            return dict(self.snapshot.market_data)
         return self.data_provider.get_market_data(self.symbol, self.currency)
     
     @abstractmethod
@@ -63,34 +95,71 @@ class BaseStrategy(ABC):
         """
         Calculate entry parameters for a trade.
         
+        During execute_strategy the signal already generated for this
+        evaluation is available as ``self.signal``.
+        
         Returns:
             Dictionary with entry details or None
         """
         pass
     
-    def execute_strategy(self) -> Optional[Dict]:
+    def generate_signals(self, df: pd.DataFrame) -> Optional[Dict]:
         """
-        Execute full strategy workflow.
+        Generate signals for every bar of a historical OHLCV series at once.
         
+        Optional fast path for backtesting. Strategies that can express their
+        logic as array operations return a dictionary of NumPy arrays aligned
+        with ``df``; the default returns None, and the backtest engine then
+        replays bars one by one through generate_signal/calculate_entry.
+        
+        Args:
+            df: DataFrame in get_historical_ohlcv format
+            
         Returns:
-            Complete trade setup or None
+            Dictionary with 'entry' (bool), 'stop_loss' and 'target' (float)
+            arrays, or None if not supported
+        """
+        return None
+    
+    def execute_strategy(self, snapshot: Optional[MarketSnapshot] = None) -> Optional[Dict]:
         """
-        signal = self.generate_signal()
-        if signal is None:
-            return None
+        Execute full strategy workflow.
         
-        entry = self.calculate_entry()
-        if entry is None:
-            return None
+        The market is captured once and generate_signal and calculate_entry
+        both read from that snapshot, so the signal and the position size
+        use the same price and the evaluation costs at most one fetch. The
+        signal is generated once and kept in ``self.signal`` for
+        calculate_entry.
         
-        return {
-            "signal": signal,
-            "entry": entry,
-            "timestamp": self._get_timestamp()
-        }
-    
-    @staticmethod
-    def _get_timestamp() -> str:
-        """Get current timestamp."""
-        from datetime import datetime
-        return datetime.utcnow().isoformat()
+        Args:
+            snapshot: Market snapshot to evaluate against (default: capture
+                one); use MarketSnapshot.from_prices to evaluate off a
+                batched get_current_prices result
+            
+        Returns:
+            Complete trade setup with 'signal', 'entry', 'timestamp' and
+            'snapshot' (MarketSnapshot.to_dict()), or None
+        """
+        previous = self.snapshot, self.signal
+        self.snapshot = snapshot if snapshot is not None else self.capture_snapshot()
+        self.signal = None
+        try:
+            signal = self.signal = self.generate_signal()
+            if signal is None:
+                return None
+            
+            entry = self.calculate_entry()
+            if entry is None:
+                return None
+            
+            return {
+                "signal": signal,
+                "entry": entry,
+                "timestamp": self.snapshot.timestamp,
+                "snapshot": self.snapshot.to_dict()
+            }
+        finally:
+            self.snapshot, self.signal = previous
+
+
+instrument_methods(BaseStrategy, ["execute_strategy"], "strategy", count_items=False)
@@ -0,0 +1,129 @@
+"""Immutable market snapshot shared by one strategy evaluation."""
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+from ..data_providers.base_provider import BaseDataProvider
+
+
+class MarketSnapshot:
+    """
+    Price (and optionally market data) of one pair frozen at capture time.
+    
+    A strategy evaluation reads every price from the same snapshot, so
+    signal generation and entry sizing see identical numbers and the
+    provider is called once per evaluation instead of once per lookup.
+    Attributes cannot be reassigned and market data is exposed read-only.
+    """
+    
+    __slots__ = ("symbol", "currency", "price", "market_data", "timestamp")
+    
+    def __init__(
+        self,
+        symbol: str,
+        currency: str,
+        price: Optional[float],
+        market_data: Optional[Dict] = None,
+        timestamp: Optional[str] = None
+    ):
+        """
+        Initialize market snapshot.
+        
+        Args:
+            symbol: Trading symbol
+            currency: Quote currency
+            price: Current price (None if unavailable)
+            market_data: Optional get_market_data dictionary (copied)
+            timestamp: ISO capture time (default: now, UTC)
+        """
+        values = {
+            "symbol": symbol.upper(),
+            "currency": currency.upper(),
+            "price": None if price is None else float(price),
+            "market_data": None if market_data is None else MappingProxyType(dict(market_data)),
+            "timestamp": timestamp or datetime.utcnow().isoformat(),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("MarketSnapshot is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("MarketSnapshot is immutable")
+    
+    def __repr__(self) -> str:
+        return (
+            f"MarketSnapshot(symbol={self.symbol!r}, currency={self.currency!r}, "
+            f"price={self.price!r}, timestamp={self.timestamp!r})"
+        )
+    
+    def to_dict(self) -> Dict:
+        """
+        Convert to a plain (JSON-serializable) dictionary.
+        
+        Returns:
+            Dictionary with symbol, currency, price, market_data and timestamp
+        """
+        return {
+            "symbol": self.symbol,
+            "currency": self.currency,
+            "price": self.price,
+            "market_data": None if self.market_data is None else dict(self.market_data),
+            "timestamp": self.timestamp,
+        }
+    
+    @classmethod
+    def capture(
+        cls,
+        data_provider: BaseDataProvider,
+        symbol: str,
+        currency: str = "USD",
+        include_market_data: bool = False
+    ) -> "MarketSnapshot":
+        """
+        Fetch a snapshot from a data provider.
+        
+        With include_market_data the price is taken from the market data
+        response, so capturing still costs a single provider call.
+        
+        Args:
+            data_provider: Provider to query
+            symbol: Trading symbol
+            currency: Quote currency
+            include_market_data: Fetch get_market_data instead of get_current_price
+            
+        Returns:
+            MarketSnapshot of the pair
+        """
+        if include_market_data:
+            market_data = data_provider.get_market_data(symbol, currency)
+            price = market_data.get("price") if market_data else None
+            return cls(symbol, currency, price, market_data)
+        return cls(symbol, currency, data_provider.get_current_price(symbol, currency))
+    
+    @classmethod
+    def from_prices(
+        cls,
+        prices: Mapping[str, Mapping[str, float]],
+        symbol: str,
+        currency: str = "USD",
+        market_data: Optional[Mapping[str, Mapping[str, Dict]]] = None,
+        timestamp: Optional[str] = None
+    ) -> "MarketSnapshot":
+        """
+        Build a snapshot from batched get_current_prices output.
+        
+        Args:
+            prices: Nested dictionary {SYMBOL: {CURRENCY: price}}
+            symbol: Trading symbol
+            currency: Quote currency
+            market_data: Optional nested dictionary {SYMBOL: {CURRENCY: market data}}
+            timestamp: ISO capture time (default: now, UTC)
+            
+        Returns:
+            MarketSnapshot of the pair (price None if the pair is missing)
+        """
+        symbol, currency = symbol.upper(), currency.upper()
+        price = prices.get(symbol, {}).get(currency)
+        data = market_data.get(symbol, {}).get(currency) if market_data else None
+        return cls(symbol, currency, price, data, timestamp)
@@ -0,0 +1,316 @@
+"""Run many strategy instances per tick off one shared market data fetch."""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from ..data_providers.base_provider import BaseDataProvider
+from .base_strategy import BaseStrategy
+from .market_snapshot import MarketSnapshot
+
+
+class StrategyScheduler:
+    """
+    Evaluate many strategies per tick with one fetch per distinct pair.
+    
+    Every tick the scheduler collects the distinct (symbol, currency)
+    pairs of the registered strategies, fetches their prices with one
+    get_current_prices call per quote currency (and optionally market data
+    once per pair), and builds one immutable MarketSnapshot per pair. The
+    strategies' execute_strategy (generate_signal + calculate_entry) then
+    run concurrently on a thread pool against their pair's snapshot.
+    
+    Strategies that have not finished when the tick deadline passes are
+    reported as late and their result is dropped for that tick. A strategy
+    still running from an earlier tick is skipped rather than started
+    twice.
+    """
+    
+    def __init__(
+        self,
+        data_provider: BaseDataProvider,
+        max_workers: int = 16,
+        deadline: float = 1.0,
+        fetch_market_data: bool = False
+    ):
+        """
+        Initialize strategy scheduler.
+        
+        Args:
+            data_provider: Provider used for the per-tick batch fetch
+            max_workers: Strategies evaluated in parallel
+            deadline: Seconds from the start of a tick by which results must
+                be in (fetching included)
+            fetch_market_data: Also fetch get_market_data once per pair and
+                share it with the strategies
+        """
+        if deadline <= 0:
+            raise ValueError("deadline must be positive")
+        
+        self.data_provider = data_provider
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self.fetch_market_data = fetch_market_data
+        
+        self._strategies: Dict[str, BaseStrategy] = {}
+        # Registered instances by id() (the scheduler keeps them alive, so ids are unique)
+        self._names_by_strategy: Dict[int, str] = {}
+        self._running: Dict[str, Future] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        # Suffix of default names; never reused, so names stay unique after unregister
+        self._next_number = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.ticks = 0
+    
+    def register(self, strategy: BaseStrategy, name: Optional[str] = None) -> str:
+        """
+        Add a strategy to the schedule.
+        
+        Args:
+            strategy: Strategy instance (its data provider is still used for
+                anything the snapshot does not cover, e.g. historical data)
+            name: Unique name (default: class, pair and a counter)
+            
+        Returns:
+            Name the strategy is registered under
+            
+        Raises:
+            ValueError: If the name is taken or the instance is already
+                registered (one instance must not run on two threads at
+                once, since each evaluation sets its snapshot)
+        """
+        with self._lock:
+            existing = self._names_by_strategy.get(id(strategy))
+            if existing is not None:
+                raise ValueError(f"This strategy instance is already registered as {existing}")
+            if name is None:
+                name = f"{type(strategy).__name__}-{strategy.symbol.upper()}/{strategy.currency.upper()}-{self._next_number}"
+                self._next_number += 1
+            if name in self._strategies:
+                raise ValueError(f"A strategy named {name} is already registered")
+            
+            self._strategies[name] = strategy
+            self._names_by_strategy[id(strategy)] = name
+            self._stats[name] = {"runs": 0, "late": 0, "skipped": 0, "errors": 0, "total_time": 0.0, "max_time": 0.0}
+        return name
+    
+    def unregister(self, name: str) -> None:
+        """
+        Remove a strategy from the schedule.
+        
+        Args:
+            name: Name returned by register()
+        """
+        with self._lock:
+            strategy = self._strategies.pop(name, None)
+            if strategy is not None:
+                self._names_by_strategy.pop(id(strategy), None)
+            self._stats.pop(name, None)
+            self._running.pop(name, None)
+    
+    def pairs(self) -> List[Tuple[str, str]]:
+        """
+        Get the distinct (symbol, currency) pairs of registered strategies.
+        
+        Returns:
+            Sorted list of (SYMBOL, CURRENCY) tuples
+        """
+        with self._lock:
+            return sorted({(s.symbol.upper(), s.currency.upper()) for s in self._strategies.values()})
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="strategy")
+        return self._executor
+    
+    def fetch_snapshot(self) -> Tuple[Dict[str, Dict[str, float]], Optional[Dict[str, Dict[str, Dict]]]]:
+        """
+        Fetch prices (and market data if enabled) for every distinct pair.
+        
+        Returns:
+            Tuple of (prices {SYMBOL: {CURRENCY: price}}, market data
+            {SYMBOL: {CURRENCY: dict}} or None)
+        """
+        by_currency: Dict[str, List[str]] = {}
+        for symbol, currency in self.pairs():
+            by_currency.setdefault(currency, []).append(symbol)
+        
+        prices: Dict[str, Dict[str, float]] = {}
+        for currency, symbols in by_currency.items():
+            # One call per quote currency avoids fetching the symbol x currency cross product
+            try:
+                batch = self.data_provider.get_current_prices(symbols, currency)
+            except Exception as e:
+                print(f"Error fetching prices for {currency}: {e}")
+                continue
+            for symbol, quotes in (batch or {}).items():
+                prices.setdefault(symbol.upper(), {}).update(quotes)
+        
+        if not self.fetch_market_data:
+            return prices, None
+        
+        executor = self._get_executor()
+        futures = {
+            pair: executor.submit(self.data_provider.get_market_data, *pair)
+            for pair in self.pairs()
+        }
+        market_data: Dict[str, Dict[str, Dict]] = {}
+        for (symbol, currency), future in futures.items():
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"Error fetching market data for {symbol}/{currency}: {e}")
+                continue
+            if data is not None:
+                market_data.setdefault(symbol, {})[currency] = data
+        return prices, market_data
+    
+    def _evaluate(
+        self,
+        name: str,
+        strategy: BaseStrategy,
+        snapshot: Optional[MarketSnapshot]
+    ) -> Optional[Dict]:
+        """Run one strategy and record its latency."""
+        start = time.perf_counter()
+        try:
+            return strategy.execute_strategy(snapshot)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stats.get(name)
+                if stats is not None:
+                    stats["runs"] += 1
+                    stats["total_time"] += elapsed
+                    stats["max_time"] = max(stats["max_time"], elapsed)
+    
+    def tick(self) -> Dict:
+        """
+        Fetch one snapshot and evaluate every registered strategy.
+        
+        Returns:
+            Dictionary with 'timestamp', 'prices', 'results' (name -> trade
+            setup or None), 'late' and 'skipped' (names), 'errors' (name ->
+            message), 'fetch_seconds' and 'elapsed_seconds'
+        """
+        started = time.perf_counter()
+        timestamp = datetime.utcnow().isoformat()
+        prices, market_data = self.fetch_snapshot()
+        fetch_seconds = time.perf_counter() - started
+        
+        with self._lock:
+            strategies = list(self._strategies.items())
+        
+        executor = self._get_executor()
+        snapshots: Dict[Tuple[str, str], Optional[MarketSnapshot]] = {}
+        futures: Dict[Future, str] = {}
+        skipped = []
+        for name, strategy in strategies:
+            previous = self._running.get(name)
+            if previous is not None and not previous.done():
+                skipped.append(name)
+                continue
+            
+            pair = (strategy.symbol.upper(), strategy.currency.upper())
+            if pair not in snapshots:
+                snapshot = MarketSnapshot.from_prices(prices, *pair, market_data, timestamp)
+                # Pairs missing from the batch fall back to the strategy's own capture
+                snapshots[pair] = snapshot if snapshot.price is not None else None
+            future = executor.submit(self._evaluate, name, strategy, snapshots[pair])
+            with self._lock:
+                # Not tracked if unregistered meanwhile, so _running holds no stale entries
+                if name in self._strategies:
+                    self._running[name] = future
+            futures[future] = name
+        
+        remaining = max(0.0, self.deadline - (time.perf_counter() - started))
+        done, not_done = wait(futures, timeout=remaining)
+        
+        results = {}
+        errors = {}
+        for future in done:
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = str(e)
+        late = sorted(futures[future] for future in not_done)
+        
+        with self._lock:
+            for names, key in ((late, "late"), (skipped, "skipped"), (errors, "errors")):
+                for name in names:
+                    if name in self._stats:
+                        self._stats[name][key] += 1
+            self.ticks += 1
+        
+        return {
+            "timestamp": timestamp,
+            "prices": prices,
+            "results": results,
+            "late": late,
+            "skipped": skipped,
+            "errors": errors,
+            "fetch_seconds": fetch_seconds,
+            "elapsed_seconds": time.perf_counter() - started,
+        }
+    
+    def run(
+        self,
+        interval: float,
+        max_ticks: Optional[int] = None,
+        on_tick: Optional[Callable[[Dict], None]] = None
+    ) -> None:
+        """
+        Tick at a fixed interval until stop() is called.
+        
+        Args:
+            interval: Seconds between tick starts
+            max_ticks: Stop after this many ticks (default: run until stopped)
+            on_tick: Callback receiving each tick() result
+        """
+        self._stop.clear()
+        count = 0
+        next_tick = time.monotonic()
+        while not self._stop.is_set() and (max_ticks is None or count < max_ticks):
+            result = self.tick()
+            count += 1
+            if on_tick is not None:
+                on_tick(result)
+            
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Fell behind; start the next tick now instead of bunching up
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+    
+    def stop(self) -> None:
+        """Stop a loop started with run()."""
+        self._stop.set()
+    
+    def shutdown(self) -> None:
+        """Stop ticking and release the worker threads."""
+        self.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-strategy metrics.
+        
+        Returns:
+            Dictionary mapping strategy name to runs, late, skipped, errors,
+            avg_time and max_time (seconds)
+        """
+        with self._lock:
+            return {
+                name: {
+                    **counts,
+                    "avg_time": counts["total_time"] / counts["runs"] if counts["runs"] else 0.0,
+                }
+                for name, counts in self._stats.items()
+            }
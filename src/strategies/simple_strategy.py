@@ -1,5 +1,7 @@
 """Simple example strategy implementation."""
 from typing import Optional, Dict
+import numpy as np
+import pandas as pd
 from .base_strategy import BaseStrategy
 
 
@@ -16,7 +18,9 @@ class SimpleStopLossStrategy(BaseStrategy):
         stop_loss_price: Optional[float] = None,
         target_price: Optional[float] = None,
         symbol: str = "BTC",
-        currency: str = "USD"
+        currency: str = "USD",
+        stop_loss_pct: float = 0.02,
+        target_pct: float = 0.05
     ):
         """
         Initialize simple strategy.
@@ -24,14 +28,18 @@ class SimpleStopLossStrategy(BaseStrategy):
         Args:
             data_provider: Data provider instance
             position_calculator: Position calculator instance
-            stop_loss_price: User-defined stop loss price (None = auto-calculate 2%)
-            target_price: User-defined target price (None = auto-calculate 5%)
+            stop_loss_price: User-defined stop loss price (None = auto-calculate from stop_loss_pct)
+            target_price: User-defined target price (None = auto-calculate from target_pct)
             symbol: Trading symbol
             currency: Quote currency
+            stop_loss_pct: Auto stop loss distance below price (default: 0.02 = 2%)
+            target_pct: Auto target distance above price (default: 0.05 = 5%)
         """
         super().__init__(data_provider, position_calculator, symbol, currency)
         self.stop_loss_price = stop_loss_price
         self.target_price = target_price
+        self.stop_loss_pct = stop_loss_pct
+        self.target_pct = target_pct
     
     def set_levels(self, stop_loss_price: float, target_price: float):
         """
@@ -61,8 +69,8 @@ class SimpleStopLossStrategy(BaseStrategy):
             target = self.target_price
         else:
             # Auto-calculate with default percentages if not set
-            stop_loss = current_price * 0.98  # 2% stop loss
-            target = current_price * 1.05     # 5% target
+            stop_loss = current_price * (1 - self.stop_loss_pct)
+            target = current_price * (1 + self.target_pct)
         
         # Determine action based on stop loss position
         action = "BUY" if current_price > stop_loss else "SELL"
@@ -75,6 +83,34 @@ class SimpleStopLossStrategy(BaseStrategy):
             "confidence": 0.7
         }
     
+    def generate_signals(self, df: pd.DataFrame) -> Optional[Dict]:
+        """
+        Generate signals for every bar using the close as the current price.
+        
+        The strategy is always willing to enter, so every bar is an entry
+        candidate with the same levels generate_signal would produce.
+        
+        Args:
+            df: DataFrame in get_historical_ohlcv format
+            
+        Returns:
+            Dictionary with 'entry', 'stop_loss' and 'target' arrays
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        
+        if self.stop_loss_price is not None and self.target_price is not None:
+            stop_loss = np.full(len(close), float(self.stop_loss_price))
+            target = np.full(len(close), float(self.target_price))
+        else:
+            stop_loss = close * (1 - self.stop_loss_pct)
+            target = close * (1 + self.target_pct)
+        
+        return {
+            "entry": np.ones(len(close), dtype=bool),
+            "stop_loss": stop_loss,
+            "target": target,
+        }
+    
     def calculate_entry(self) -> Optional[Dict]:
         """
         Calculate position size based on user's max loss amount and price levels.
@@ -82,7 +118,8 @@ class SimpleStopLossStrategy(BaseStrategy):
         Returns:
             Entry details with position sizing
         """
-        signal = self.generate_signal()
+        # Reuse the signal of the evaluation in progress (see execute_strategy)
+        signal = self.signal if self.signal is not None else self.generate_signal()
         if signal is None:
             return None
         
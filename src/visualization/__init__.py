@@ -1,4 +1,5 @@
 """Visualization module for interactive candlestick charts."""
 from .chart_visualizer import ChartVisualizer
+from .batch_export import ChartExporter
 
-__all__ = ['ChartVisualizer']
+__all__ = ['ChartVisualizer', 'ChartExporter']
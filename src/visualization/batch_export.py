@@ -0,0 +1,251 @@
+"""Export many charts at once with a shared plotly.js bundle and a warm image renderer."""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+import plotly.graph_objects as go
+import plotly.io as pio
+from .chart_visualizer import ChartVisualizer
+
+
+IMAGE_FORMATS = ('png', 'jpg', 'jpeg', 'webp', 'svg', 'pdf')
+
+
+def _write_html_batch(jobs: List[Tuple[str, Dict, str, Optional[List[str]], Union[bool, str]]]) -> List[Tuple[str, Optional[str]]]:
+    """
+    Write a batch of HTML files in a worker process.
+    
+    Args:
+        jobs: (name, figure dict, path, post scripts, include_plotlyjs) tuples
+        
+    Returns:
+        List of (name, error message or None)
+    """
+    results = []
+    for name, fig_dict, path, post_script, include_plotlyjs in jobs:
+        try:
+            # Figures were validated when they were built
+            pio.write_html(
+                fig_dict,
+                path,
+                include_plotlyjs=include_plotlyjs,
+                post_script=post_script,
+                validate=False
+            )
+            results.append((name, None))
+        except Exception as e:
+            results.append((name, str(e)))
+    return results
+
+
+class ChartExporter:
+    """
+    Write many figures to a directory in one call.
+    
+    HTML files are serialized in parallel on a process pool and reference
+    one plotly.js bundle written next to them (or a CDN copy) instead of
+    each inlining its own ~4.5 MB copy. Static images go through a single
+    Kaleido renderer that is started once and kept warm between export()
+    calls, rendering several figures at a time, so the browser startup is
+    paid once per exporter instead of once per image.
+    
+    Use as a context manager, or call close() when done, to release the
+    worker processes and the renderer.
+    """
+    
+    def __init__(
+        self,
+        output_dir: Union[str, Path],
+        max_workers: Optional[int] = None,
+        include_plotlyjs: Union[bool, str] = "directory",
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        scale: Optional[float] = None
+    ):
+        """
+        Initialize chart exporter.
+        
+        Args:
+            output_dir: Directory the files are written to (created if missing)
+            max_workers: HTML worker processes and concurrent image renders
+                (default: CPU count)
+            include_plotlyjs: 'directory' to share one plotly.min.js in
+                output_dir, 'cdn' to load it from the CDN, or True to inline
+                it in every file
+            width: Image width in pixels (default: figure layout width)
+            height: Image height in pixels (default: figure layout height)
+            scale: Image scale factor (default: 1)
+        """
+        self.output_dir = Path(output_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.include_plotlyjs = include_plotlyjs
+        self.width = width
+        self.height = height
+        self.scale = scale
+        
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._renderer_started = False
+        self._renderer_error: Optional[str] = None
+    
+    def __enter__(self) -> "ChartExporter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
+    def _start_renderer(self) -> Optional[str]:
+        """
+        Start the shared Kaleido renderer if this Kaleido version has one.
+        
+        Returns:
+            Error message if images cannot be rendered, otherwise None
+        """
+        if self._renderer_started or self._renderer_error is not None:
+            return self._renderer_error
+        
+        try:
+            import kaleido
+            # A one-off render fails fast if Chrome is missing, where the
+            # shared server would wait forever
+            pio.to_image(go.Figure(), format="png", width=10, height=10)
+        except Exception as e:
+            self._renderer_error = f"Image export unavailable: {e}"
+            print(self._renderer_error)
+            return self._renderer_error
+        
+        if hasattr(kaleido, "start_sync_server"):
+            # Kaleido >= 1.0: one Chrome with max_workers tabs serves every write
+            kaleido.start_sync_server(n=self.max_workers, silence_warnings=True)
+            self._renderer_started = True
+        return None
+    
+    def close(self) -> None:
+        """Shut down the worker processes and the image renderer."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        
+        if self._renderer_started:
+            import kaleido
+            kaleido.stop_sync_server(silence_warnings=True)
+            self._renderer_started = False
+    
+    def _write_plotlyjs_bundle(self) -> None:
+        """Write the shared plotly.min.js once, before workers reference it."""
+        bundle = self.output_dir / "plotly.min.js"
+        if self.include_plotlyjs == "directory" and not bundle.exists():
+            from plotly.offline import get_plotlyjs
+            bundle.write_text(get_plotlyjs(), encoding="utf-8")
+    
+    def export(
+        self,
+        charts: Mapping[str, go.Figure],
+        formats: Sequence[str] = ("html",)
+    ) -> Dict:
+        """
+        Write every chart in every format.
+        
+        Args:
+            charts: Mapping of file stem (e.g., 'BTC_hour') to figure
+            formats: Output formats ('html', 'png', 'jpg', 'webp', 'svg', 'pdf')
+            
+        Returns:
+            Dictionary with 'files' (name -> written paths), 'errors'
+            (name -> message) and 'elapsed_seconds'
+        """
+        started = time.perf_counter()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        files: Dict[str, List[str]] = {name: [] for name in charts}
+        errors: Dict[str, str] = {}
+        
+        for output_format in formats:
+            output_format = output_format.lower()
+            paths = {name: str(self.output_dir / f"{name}.{output_format}") for name in charts}
+            if output_format == "html":
+                failed = self._export_html(charts, paths)
+            elif output_format in IMAGE_FORMATS:
+                failed = self._export_images(charts, paths, output_format)
+            else:
+                raise ValueError(f"Unsupported format: {output_format}")
+            
+            for name, path in paths.items():
+                if name in failed:
+                    errors[name] = failed[name]
+                else:
+                    files[name].append(path)
+        
+        return {
+            "files": files,
+            "errors": errors,
+            "elapsed_seconds": time.perf_counter() - started,
+        }
+    
+    def _export_html(self, charts: Mapping[str, go.Figure], paths: Dict[str, str]) -> Dict[str, str]:
+        """Write HTML files on the process pool; returns errors by name."""
+        self._write_plotlyjs_bundle()
+        
+        jobs = []
+        for name, fig in charts.items():
+            fig, post_script = ChartVisualizer.html_options(fig)
+            jobs.append((name, fig.to_plotly_json(), paths[name], post_script, self.include_plotlyjs))
+        if not jobs:
+            return {}
+        
+        # A few batches per worker keeps pickling overhead low and the load even
+        batch_size = max(1, -(-len(jobs) // (self.max_workers * 4)))
+        batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+        
+        executor = self._get_executor()
+        errors = {}
+        for future in [executor.submit(_write_html_batch, batch) for batch in batches]:
+            for name, error in future.result():
+                if error is not None:
+                    errors[name] = error
+        return errors
+    
+    def _export_images(self, charts: Mapping[str, go.Figure], paths: Dict[str, str], format: str) -> Dict[str, str]:
+        """Render static images through the shared renderer; returns errors by name."""
+        names = list(charts)
+        if not names:
+            return {}
+        
+        error = self._start_renderer()
+        if error is not None:
+            return {name: error for name in names}
+        
+        if self._renderer_started:
+            try:
+                pio.write_images(
+                    [charts[name] for name in names],
+                    [paths[name] for name in names],
+                    format=format,
+                    width=self.width,
+                    height=self.height,
+                    scale=self.scale
+                )
+                return {}
+            except Exception as e:
+                print(f"Batch image export failed, retrying one by one: {e}")
+        
+        # Older Kaleido keeps its own renderer process warm between calls
+        errors = {}
+        for name in names:
+            try:
+                pio.write_image(
+                    charts[name],
+                    paths[name],
+                    format=format,
+                    width=self.width,
+                    height=self.height,
+                    scale=self.scale
+                )
+            except Exception as e:
+                errors[name] = str(e)
+        return errors
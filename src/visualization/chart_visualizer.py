@@ -1,9 +1,72 @@
 """Interactive candlestick chart visualizer with volume subplot."""
+import json
 import plotly.graph_objects as go
+from plotly.basedatatypes import BaseTraceType
+from plotly.io.json import to_json_plotly
 from plotly.subplots import make_subplots
+import numpy as np
 import pandas as pd
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
+from ..indicators import bollinger_bands, ema, sma, vwap
+from .downsampling import bucket_bounds, downsample_ohlcv, downsample_series
+
+
+# Shows the finest embedded resolution whose visible candle count still
+# fits max_points whenever the x-axis range changes
+_RESOLUTION_SCRIPT = """
+(function() {
+    var gd = document.getElementById('{plot_id}');
+    var levels = __LEVELS__;
+    var maxPoints = __MAX_POINTS__;
+    var current = 0;
+    gd.on('plotly_relayout', function() {
+        var range = gd.layout.xaxis.range;
+        if (!range) { return; }
+        var span = new Date(String(range[1]).replace(' ', 'T')) - new Date(String(range[0]).replace(' ', 'T'));
+        var pick = 0;
+        for (var i = 1; i < levels.length; i++) {
+            if (levels[i].bar_ms > 0 && span / levels[i].bar_ms <= maxPoints) { pick = i; }
+        }
+        if (pick === current) { return; }
+        current = pick;
+        var traces = [], visible = [];
+        levels.forEach(function(level, i) {
+            level.traces.forEach(function(t) { traces.push(t); visible.push(i === pick); });
+        });
+        Plotly.restyle(gd, {visible: visible}, traces);
+    });
+})();
+"""
+
+
+# Adds a deferred timeframe's traces the first time it is selected, then
+# shows only that timeframe; payloads stay JSON strings until needed
+_TIMEFRAME_SCRIPT = """
+(function() {
+    var gd = document.getElementById('{plot_id}');
+    var state = __TIMEFRAMES__;
+    gd.on('plotly_buttonclicked', function(event) {
+        var timeframe = state.labels[event.button.label];
+        if (!timeframe) { return; }
+        var ready = Promise.resolve();
+        if (!state.traces[timeframe]) {
+            var traces = JSON.parse(state.payloads[timeframe]);
+            var first = gd.data.length;
+            state.traces[timeframe] = traces.map(function(_, i) { return first + i; });
+            delete state.payloads[timeframe];
+            ready = Plotly.addTraces(gd, traces);
+        }
+        ready.then(function() {
+            var indices = [], visible = [];
+            Object.keys(state.traces).forEach(function(name) {
+                state.traces[name].forEach(function(i) { indices.push(i); visible.push(name === timeframe); });
+            });
+            return Plotly.update(gd, {visible: visible}, {'title.text': state.titles[timeframe]}, indices);
+        });
+    });
+})();
+"""
 
 
 class ChartVisualizer:
@@ -33,11 +96,20 @@ class ChartVisualizer:
         title: Optional[str] = None,
         show_volume: bool = True,
         height: int = 800,
-        width: Optional[int] = None
+        width: Optional[int] = None,
+        max_points: Optional[int] = None,
+        webgl: bool = False,
+        resolutions: int = 1
     ) -> go.Figure:
         """
         Create an interactive candlestick chart with optional volume subplot.
         
+        For long series, set max_points (about the chart width in pixels)
+        to aggregate the data into at most that many OHLC candles, and
+        webgl=True to draw volume with WebGL. With resolutions > 1, finer
+        levels (4x more candles each) are embedded too, and saved HTML
+        switches to the sharpest level that fits when you zoom in.
+        
         Args:
             df: DataFrame with columns: timestamp, open, high, low, close, volume
             symbol: Trading symbol (e.g., 'BTC')
@@ -47,10 +119,208 @@ class ChartVisualizer:
             show_volume: Whether to show volume subplot (default: True)
             height: Chart height in pixels (default: 800)
             width: Chart width in pixels (optional, auto if None)
+            max_points: Maximum candles per resolution level (None keeps every row)
+            webgl: Use WebGL (Scattergl) traces for volume (default: False)
+            resolutions: Number of embedded resolution levels when
+                downsampling (default: 1)
             
         Returns:
             Plotly figure object
         """
+        self._check_ohlcv(df)
+        has_volume = show_volume and 'volume' in df.columns
+        fig = self._make_figure(symbol, currency, has_volume)
+        
+        # Coarsest level first; it is the one shown initially
+        levels = [df]
+        if max_points is not None and len(df) > max_points:
+            levels = []
+            points = max_points
+            for _ in range(max(1, resolutions)):
+                levels.append(downsample_ohlcv(df, points))
+                if points >= len(df):
+                    break
+                points *= 4
+        
+        level_meta = []
+        for level, level_df in enumerate(levels):
+            first_trace = len(fig.data)
+            self._add_traces(fig, self.build_timeframe_traces(level_df, show_volume=has_volume, webgl=webgl))
+            
+            for trace in fig.data[first_trace:]:
+                trace.visible = level == 0
+            level_meta.append({
+                "traces": list(range(first_trace, len(fig.data))),
+                "bar_ms": self._bar_milliseconds(level_df['timestamp']),
+            })
+        
+        if len(levels) > 1:
+            fig.update_layout(meta={"resolution_levels": level_meta, "max_points": max_points})
+        
+        # Set title
+        if title is None:
+            title = f"{symbol}/{currency} - {timeframe.capitalize()} Chart"
+        
+        self._apply_layout(fig, title, currency, height, width, has_volume)
+        return fig
+    
+    def create_multi_timeframe_chart(
+        self,
+        data_dict: Dict[str, pd.DataFrame],
+        symbol: str,
+        currency: str = "USD",
+        default_timeframe: str = "hour",
+        indicators: Optional[List[str]] = None,
+        show_volume: bool = True,
+        height: int = 800,
+        width: Optional[int] = None,
+        max_points: Optional[int] = None,
+        webgl: bool = False,
+        lazy: bool = False
+    ) -> go.Figure:
+        """
+        Create a chart with dropdown to switch between timeframes.
+        
+        The figure and its layout are built once; each timeframe only adds
+        its own traces (price, indicators and volume), and the dropdown
+        toggles exactly those traces. With lazy=True only the default
+        timeframe is plotted and the others are kept as JSON payloads that
+        saved HTML parses and adds the first time they are selected, so the
+        page opens as fast as a single-timeframe chart. Lazy timeframes
+        only load in HTML written by save_chart().
+        
+        Args:
+            data_dict: Dictionary mapping timeframe names to DataFrames
+            symbol: Trading symbol
+            currency: Quote currency
+            default_timeframe: Initial timeframe to display
+            indicators: Indicators drawn on every timeframe (e.g., ['SMA_20'])
+            show_volume: Whether to show volume subplot (default: True)
+            height: Chart height in pixels (default: 800)
+            width: Chart width in pixels (optional, auto if None)
+            max_points: Maximum candles per timeframe (None keeps every row)
+            webgl: Use WebGL (Scattergl) traces for volume and indicators
+            lazy: Defer the non-default timeframes (default: False)
+            
+        Returns:
+            Plotly figure with timeframe selector dropdown
+        """
+        if not data_dict:
+            raise ValueError("data_dict is empty")
+        
+        # Use default timeframe or first available
+        if default_timeframe not in data_dict:
+            default_timeframe = list(data_dict.keys())[0]
+        
+        for df in data_dict.values():
+            self._check_ohlcv(df)
+        
+        has_volume = show_volume and 'volume' in data_dict[default_timeframe].columns
+        fig = self._make_figure(symbol, currency, has_volume)
+        
+        # Trace indices of each plotted timeframe, and payloads of deferred ones
+        trace_groups: Dict[str, List[int]] = {}
+        payloads: Dict[str, str] = {}
+        for tf_name, df in data_dict.items():
+            traces = self.build_timeframe_traces(df, indicators, has_volume, max_points, webgl)
+            if lazy and tf_name != default_timeframe:
+                payloads[tf_name] = self._traces_payload(traces)
+                continue
+            
+            first_trace = len(fig.data)
+            self._add_traces(fig, traces)
+            for trace in fig.data[first_trace:]:
+                trace.visible = tf_name == default_timeframe
+            trace_groups[tf_name] = list(range(first_trace, len(fig.data)))
+        
+        titles = {tf_name: f"{symbol}/{currency} - {tf_name.capitalize()} Chart" for tf_name in data_dict}
+        
+        # Create buttons for timeframe selection
+        buttons = []
+        for tf_name in data_dict:
+            if lazy:
+                # Handled by the script save_chart embeds
+                buttons.append(dict(label=tf_name.upper(), method="skip"))
+                continue
+            
+            visible_states = [False] * len(fig.data)
+            for index in trace_groups[tf_name]:
+                visible_states[index] = True
+            
+            buttons.append(dict(
+                label=tf_name.upper(),
+                method="update",
+                args=[
+                    {"visible": visible_states},
+                    {"title.text": titles[tf_name]}
+                ]
+            ))
+        
+        self._apply_layout(fig, titles[default_timeframe], currency, height, width, has_volume)
+        
+        # Add dropdown menu
+        fig.update_layout(
+            updatemenus=[
+                dict(
+                    buttons=buttons,
+                    active=list(data_dict).index(default_timeframe),
+                    direction="down",
+                    pad={"r": 10, "t": 10},
+                    showactive=True,
+                    x=0.11,
+                    xanchor="left",
+                    y=1.15,
+                    yanchor="top",
+                    bgcolor="rgba(150, 150, 150, 0.1)",
+                    bordercolor="rgba(200, 200, 200, 0.5)",
+                    font=dict(size=12)
+                )
+            ]
+        )
+        
+        if lazy:
+            fig.update_layout(meta={"timeframes": {
+                "labels": {tf_name.upper(): tf_name for tf_name in data_dict},
+                "titles": titles,
+                "traces": trace_groups,
+                "payloads": payloads,
+            }})
+        
+        return fig
+    
+    def build_timeframe_traces(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[List[str]] = None,
+        show_volume: bool = True,
+        max_points: Optional[int] = None,
+        webgl: bool = False
+    ) -> List[Tuple[BaseTraceType, int]]:
+        """
+        Build the traces of one timeframe without creating a figure.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            indicators: Indicators to draw over the price (e.g., ['SMA_20'])
+            show_volume: Include volume traces if df has a volume column
+            max_points: Downsample candles, volume and indicators to at most
+                this many points
+            webgl: Use WebGL (Scattergl) traces for volume and indicators
+            
+        Returns:
+            List of (trace, subplot row) tuples: price, indicators, volume
+        """
+        chart_df = downsample_ohlcv(df, max_points) if max_points is not None else df
+        
+        traces = [(self._candlestick_trace(chart_df), 1)]
+        traces.extend((trace, 1) for trace in self._indicator_traces(df, indicators or [], max_points, webgl))
+        if show_volume and 'volume' in df.columns:
+            traces.extend((trace, 2) for trace in self._volume_traces(chart_df, webgl))
+        return traces
+    
+    @staticmethod
+    def _check_ohlcv(df: pd.DataFrame) -> None:
+        """Raise ValueError unless df has the OHLC columns needed for a chart."""
         if df is None or df.empty:
             raise ValueError("DataFrame is empty or None")
         
@@ -58,59 +328,52 @@ class ChartVisualizer:
         required_cols = ['timestamp', 'open', 'high', 'low', 'close']
         if not all(col in df.columns for col in required_cols):
             raise ValueError(f"DataFrame must contain columns: {required_cols}")
-        
-        # Create subplots
-        if show_volume and 'volume' in df.columns:
-            fig = make_subplots(
+    
+    @staticmethod
+    def _make_figure(symbol: str, currency: str, has_volume: bool) -> go.Figure:
+        """Create the empty price (and volume) subplot figure."""
+        if has_volume:
+            return make_subplots(
                 rows=2, cols=1,
                 shared_xaxes=True,
                 vertical_spacing=0.03,
                 row_heights=[0.7, 0.3],
                 subplot_titles=(f'{symbol}/{currency} Price', 'Volume')
             )
-        else:
-            fig = make_subplots(rows=1, cols=1)
-        
-        # Add candlestick chart
-        candlestick = go.Candlestick(
-            x=df['timestamp'],
-            open=df['open'],
-            high=df['high'],
-            low=df['low'],
-            close=df['close'],
-            name='Price',
-            increasing_line_color=self.default_colors['increasing'],
-            decreasing_line_color=self.default_colors['decreasing'],
-            increasing_fillcolor=self.default_colors['increasing'],
-            decreasing_fillcolor=self.default_colors['decreasing']
+        return make_subplots(rows=1, cols=1)
+    
+    @staticmethod
+    def _add_traces(fig: go.Figure, traces: List[Tuple[BaseTraceType, int]]) -> None:
+        """Add (trace, row) tuples from build_timeframe_traces to a figure."""
+        if not traces:
+            return
+        fig.add_traces(
+            [trace for trace, _ in traces],
+            rows=[row for _, row in traces],
+            cols=[1] * len(traces)
         )
-        
-        fig.add_trace(candlestick, row=1, col=1)
-        
-        # Add volume bars if requested
-        if show_volume and 'volume' in df.columns:
-            # Color volume bars based on price change
-            colors = []
-            for i in range(len(df)):
-                if df['close'].iloc[i] >= df['open'].iloc[i]:
-                    colors.append(self.default_colors['volume_increasing'])
-                else:
-                    colors.append(self.default_colors['volume_decreasing'])
-            
-            volume_bars = go.Bar(
-                x=df['timestamp'],
-                y=df['volume'],
-                name='Volume',
-                marker_color=colors,
-                showlegend=False
-            )
-            
-            fig.add_trace(volume_bars, row=2, col=1)
-        
-        # Set title
-        if title is None:
-            title = f"{symbol}/{currency} - {timeframe.capitalize()} Chart"
-        
+    
+    @staticmethod
+    def _traces_payload(traces: List[Tuple[BaseTraceType, int]]) -> str:
+        """Serialize (trace, row) tuples, with their subplot axes, to JSON."""
+        data = []
+        for trace, row in traces:
+            trace_json = trace.to_plotly_json()
+            trace_json['xaxis'] = 'x' if row == 1 else f'x{row}'
+            trace_json['yaxis'] = 'y' if row == 1 else f'y{row}'
+            data.append(trace_json)
+        return to_json_plotly(data)
+    
+    def _apply_layout(
+        self,
+        fig: go.Figure,
+        title: str,
+        currency: str,
+        height: int,
+        width: Optional[int],
+        has_volume: bool
+    ) -> None:
+        """Apply the title, axes, theme and range selector shared by all charts."""
         # Update layout
         layout_config = {
             'title': {
@@ -145,7 +408,7 @@ class ChartVisualizer:
             layout_config['width'] = width
         
         # Add volume y-axis if applicable
-        if show_volume and 'volume' in df.columns:
+        if has_volume:
             layout_config['yaxis2'] = {
                 'title': f'Volume ({currency})',
                 'side': 'right'
@@ -173,153 +436,193 @@ class ChartVisualizer:
             ),
             row=1, col=1
         )
-        
-        return fig
     
-    def create_multi_timeframe_chart(
-        self,
-        data_dict: Dict[str, pd.DataFrame],
-        symbol: str,
-        currency: str = "USD",
-        default_timeframe: str = "hour"
-    ) -> go.Figure:
+    def _candlestick_trace(self, df: pd.DataFrame) -> go.Candlestick:
+        """Build the price trace for an OHLC DataFrame."""
+        return go.Candlestick(
+            x=df['timestamp'].to_numpy(),
+            open=df['open'].to_numpy(),
+            high=df['high'].to_numpy(),
+            low=df['low'].to_numpy(),
+            close=df['close'].to_numpy(),
+            name='Price',
+            increasing_line_color=self.default_colors['increasing'],
+            decreasing_line_color=self.default_colors['decreasing'],
+            increasing_fillcolor=self.default_colors['increasing'],
+            decreasing_fillcolor=self.default_colors['decreasing']
+        )
+    
+    def _volume_traces(self, df: pd.DataFrame, webgl: bool = False) -> List:
         """
-        Create a chart with dropdown to switch between timeframes.
+        Build the volume traces for an OHLCV DataFrame.
         
-        Args:
-            data_dict: Dictionary mapping timeframe names to DataFrames
-            symbol: Trading symbol
-            currency: Quote currency
-            default_timeframe: Initial timeframe to display
-            
-        Returns:
-            Plotly figure with timeframe selector dropdown
+        The WebGL version draws each bar as a vertical line segment in two
+        Scattergl traces (rising and falling candles), since Plotly has no
+        WebGL bar trace.
         """
-        if not data_dict:
-            raise ValueError("data_dict is empty")
-        
-        # Use default timeframe or first available
-        if default_timeframe not in data_dict:
-            default_timeframe = list(data_dict.keys())[0]
-        
-        # Create initial chart
-        fig = self.create_candlestick_chart(
-            df=data_dict[default_timeframe],
-            symbol=symbol,
-            currency=currency,
-            timeframe=default_timeframe,
-            show_volume=True
-        )
-        
-        # Create buttons for timeframe selection
-        buttons = []
-        for tf_name, df in data_dict.items():
-            # Determine visibility for each trace
-            visible_states = []
-            for trace_tf in data_dict.keys():
-                if trace_tf == tf_name:
-                    visible_states.extend([True, True])  # candlestick + volume
-                else:
-                    visible_states.extend([False, False])
-            
-            button = dict(
-                label=tf_name.upper(),
-                method="update",
-                args=[
-                    {"visible": visible_states},
-                    {"title": f"{symbol}/{currency} - {tf_name.capitalize()} Chart"}
-                ]
-            )
-            buttons.append(button)
-        
-        # Add all timeframe data as traces (initially hidden)
-        for i, (tf_name, df) in enumerate(data_dict.items()):
-            if tf_name == default_timeframe:
-                continue  # Already added
-            
-            temp_fig = self.create_candlestick_chart(
-                df=df,
-                symbol=symbol,
-                currency=currency,
-                timeframe=tf_name,
-                show_volume=True
-            )
-            
-            for trace in temp_fig.data:
-                trace.visible = False
-                fig.add_trace(trace)
+        timestamps = df['timestamp'].to_numpy()
+        volume = df['volume'].to_numpy(dtype=float)
+        rising = df['close'].to_numpy() >= df['open'].to_numpy()
         
-        # Add dropdown menu
-        fig.update_layout(
-            updatemenus=[
-                dict(
-                    buttons=buttons,
-                    direction="down",
-                    pad={"r": 10, "t": 10},
-                    showactive=True,
-                    x=0.11,
-                    xanchor="left",
-                    y=1.15,
-                    yanchor="top",
-                    bgcolor="rgba(150, 150, 150, 0.1)",
-                    bordercolor="rgba(200, 200, 200, 0.5)",
-                    font=dict(size=12)
-                )
-            ]
-        )
+        if webgl:
+            traces = []
+            for mask, color in ((rising, 'volume_increasing'), (~rising, 'volume_decreasing')):
+                count = int(mask.sum())
+                # x, x, gap / 0, volume, gap for every bar
+                x = np.empty(count * 3, dtype=timestamps.dtype)
+                x[0::3] = timestamps[mask]
+                x[1::3] = timestamps[mask]
+                x[2::3] = np.datetime64('NaT') if np.issubdtype(timestamps.dtype, np.datetime64) else None
+                y = np.zeros(count * 3)
+                y[1::3] = volume[mask]
+                y[2::3] = np.nan
+                traces.append(go.Scattergl(
+                    x=x,
+                    y=y,
+                    mode='lines',
+                    name='Volume',
+                    line=dict(color=self.default_colors[color], width=2),
+                    connectgaps=False,
+                    hoverinfo='skip',
+                    showlegend=False
+                ))
+            return traces
         
-        return fig
+        # Color volume bars based on price change; 0/1 through a two-color
+        # scale, since plotly validates a list of color strings one by one
+        return [go.Bar(
+            x=timestamps,
+            y=volume,
+            name='Volume',
+            marker=dict(
+                color=rising.astype(np.int8),
+                colorscale=[
+                    [0, self.default_colors['volume_decreasing']],
+                    [1, self.default_colors['volume_increasing']]
+                ],
+                cmin=0,
+                cmax=1
+            ),
+            showlegend=False
+        )]
+    
+    @staticmethod
+    def _bar_milliseconds(timestamps: pd.Series) -> float:
+        """Typical spacing of the given timestamps in milliseconds."""
+        if len(timestamps) < 2:
+            return 0.0
+        spacing = np.diff(timestamps.to_numpy().astype('datetime64[ms]').astype(np.int64))
+        return float(np.median(spacing))
     
     def add_technical_indicators(
         self,
         fig: go.Figure,
         df: pd.DataFrame,
-        indicators: Optional[List[str]] = None
+        indicators: Optional[List[str]] = None,
+        max_points: Optional[int] = None,
+        webgl: bool = False
     ) -> go.Figure:
         """
         Add technical indicators to an existing chart.
         
+        Indicators are computed with the vectorized functions in
+        ``src.indicators``; the input DataFrame is not modified.
+        
         Args:
             fig: Existing Plotly figure
             df: DataFrame with OHLCV data
-            indicators: List of indicators to add (e.g., ['SMA_20', 'EMA_50'])
+            indicators: List of indicators to add (e.g., ['SMA_20', 'EMA_50',
+                'BB_20', 'VWAP'])
+            max_points: Downsample the lines to match a chart built with the
+                same max_points (indicators are still computed on every row)
+            webgl: Draw the lines with Scattergl (default: False)
             
         Returns:
             Updated figure with indicators
         """
-        if indicators is None:
-            indicators = []
+        for trace in self._indicator_traces(df, indicators or [], max_points, webgl):
+            fig.add_trace(trace, row=1, col=1)
+        
+        return fig
+    
+    def _indicator_traces(
+        self,
+        df: pd.DataFrame,
+        indicators: List[str],
+        max_points: Optional[int] = None,
+        webgl: bool = False
+    ) -> List:
+        """Build the overlay line traces for add_technical_indicators."""
+        if not indicators:
+            return []
+        
+        close = df['close'].to_numpy(dtype=float)
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        timestamps = df['timestamp'].to_numpy()
+        if max_points is not None and len(df) > max_points:
+            starts, _ = bucket_bounds(len(df), max_points)
+            timestamps = timestamps[starts]
+        else:
+            max_points = None
+        scatter = go.Scattergl if webgl else go.Scatter
+        
+        def line(values):
+            return values if max_points is None else downsample_series(values, max_points)
         
+        traces = []
         for indicator in indicators:
             if indicator.startswith('SMA_'):
                 period = int(indicator.split('_')[1])
-                df[f'SMA_{period}'] = df['close'].rolling(window=period).mean()
                 
-                fig.add_trace(
-                    go.Scatter(
-                        x=df['timestamp'],
-                        y=df[f'SMA_{period}'],
+                traces.append(
+                    scatter(
+                        x=timestamps,
+                        y=line(sma(close, period)),
                         name=f'SMA {period}',
                         line=dict(width=1.5)
-                    ),
-                    row=1, col=1
+                    )
                 )
             
             elif indicator.startswith('EMA_'):
                 period = int(indicator.split('_')[1])
-                df[f'EMA_{period}'] = df['close'].ewm(span=period, adjust=False).mean()
                 
-                fig.add_trace(
-                    go.Scatter(
-                        x=df['timestamp'],
-                        y=df[f'EMA_{period}'],
+                traces.append(
+                    scatter(
+                        x=timestamps,
+                        y=line(ema(close, period)),
                         name=f'EMA {period}',
                         line=dict(width=1.5, dash='dash')
-                    ),
-                    row=1, col=1
+                    )
+                )
+            
+            elif indicator.startswith('BB_'):
+                period = int(indicator.split('_')[1])
+                middle, upper, lower = bollinger_bands(close, period)
+                
+                for name, values in (('Upper', upper), ('Middle', middle), ('Lower', lower)):
+                    traces.append(
+                        scatter(
+                            x=timestamps,
+                            y=line(values),
+                            name=f'BB {period} {name}',
+                            line=dict(width=1, dash='dot' if name == 'Middle' else 'solid')
+                        )
+                    )
+            
+            elif indicator == 'VWAP':
+                volume_col = 'volume_from' if 'volume_from' in df.columns else 'volume'
+                
+                traces.append(
+                    scatter(
+                        x=timestamps,
+                        y=line(vwap(high, low, close, df[volume_col].to_numpy(dtype=float))),
+                        name='VWAP',
+                        line=dict(width=1.5, dash='dashdot')
+                    )
                 )
         
-        return fig
+        return traces
     
     def save_chart(
         self,
@@ -336,12 +639,61 @@ class ChartVisualizer:
             format: Output format ('html', 'png', 'jpg', 'svg', 'pdf')
         """
         if format == "html":
-            fig.write_html(filename)
+            fig, post_script = self.html_options(fig)
+            fig.write_html(filename, post_script=post_script)
         else:
             fig.write_image(filename, format=format)
         
         print(f"Chart saved to: {filename}")
     
+    @classmethod
+    def html_options(cls, fig: go.Figure) -> Tuple[go.Figure, Optional[List[str]]]:
+        """
+        Prepare a figure for HTML output.
+        
+        Args:
+            fig: Plotly figure to save
+            
+        Returns:
+            Tuple of (figure to write, post_script list for write_html or None)
+        """
+        scripts = [script for script in (cls._resolution_script(fig), cls._timeframe_script(fig)) if script]
+        meta = fig.layout.meta
+        if isinstance(meta, dict) and "timeframes" in meta:
+            # Deferred payloads are embedded once, in the script
+            fig = go.Figure(fig)
+            fig.layout.meta = None
+        return fig, scripts or None
+    
+    @staticmethod
+    def _resolution_script(fig: go.Figure) -> Optional[str]:
+        """
+        Build the JavaScript that swaps resolution levels on zoom.
+        
+        Returns:
+            Script for write_html's post_script, or None for single-level charts
+        """
+        meta = fig.layout.meta
+        if not isinstance(meta, dict) or "resolution_levels" not in meta:
+            return None
+        
+        return _RESOLUTION_SCRIPT.replace("__LEVELS__", json.dumps(meta["resolution_levels"])) \
+            .replace("__MAX_POINTS__", str(int(meta["max_points"])))
+    
+    @staticmethod
+    def _timeframe_script(fig: go.Figure) -> Optional[str]:
+        """
+        Build the JavaScript that loads lazy timeframes from the dropdown.
+        
+        Returns:
+            Script for write_html's post_script, or None if nothing is deferred
+        """
+        meta = fig.layout.meta
+        if not isinstance(meta, dict) or "timeframes" not in meta:
+            return None
+        
+        return _TIMEFRAME_SCRIPT.replace("__TIMEFRAMES__", json.dumps(meta["timeframes"]))
+    
     def show_chart(self, fig: go.Figure) -> None:
         """
         Display chart in browser.
@@ -0,0 +1,80 @@
+"""Downsample OHLCV series to a fixed number of chart points."""
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+
+def bucket_bounds(length: int, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split ``length`` rows into at most ``max_points`` contiguous buckets.
+    
+    Buckets hold an equal number of rows (the last may be shorter), so
+    every bucket maps to roughly one pixel column of the chart.
+    
+    Args:
+        length: Number of rows
+        max_points: Maximum number of buckets
+        
+    Returns:
+        Tuple of (first row, last row) index arrays, one entry per bucket
+    """
+    if max_points <= 0:
+        raise ValueError("max_points must be positive")
+    
+    step = max(1, -(-length // max_points))
+    starts = np.arange(0, length, step)
+    ends = np.r_[starts[1:], length] - 1
+    return starts, ends
+
+
+def downsample_ohlcv(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """
+    Aggregate an OHLCV DataFrame into at most ``max_points`` candles.
+    
+    Each bucket becomes one candle labelled with its first timestamp:
+    open=first, high=max, low=min, close=last, volumes summed. Series that
+    already fit are returned unchanged.
+    
+    Args:
+        df: DataFrame with timestamp, open, high, low, close and optional volume columns
+        max_points: Maximum number of candles (e.g. the chart width in pixels)
+        
+    Returns:
+        Downsampled DataFrame with the same columns
+    """
+    if len(df) <= max_points:
+        return df
+    
+    starts, ends = bucket_bounds(len(df), max_points)
+    result = {
+        'timestamp': df['timestamp'].to_numpy()[starts],
+        'open': df['open'].to_numpy()[starts],
+        'high': np.maximum.reduceat(df['high'].to_numpy(), starts),
+        'low': np.minimum.reduceat(df['low'].to_numpy(), starts),
+        'close': df['close'].to_numpy()[ends],
+    }
+    for col in ('volume_from', 'volume_to', 'volume'):
+        if col in df.columns:
+            result[col] = np.add.reduceat(df[col].to_numpy(dtype=np.float64), starts)
+    return pd.DataFrame(result)
+
+
+def downsample_series(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Sample a per-row series at the bucket ends used by downsample_ohlcv.
+    
+    Taking the last value matches the bucket's close, so overlays such as
+    moving averages line up with the downsampled candles.
+    
+    Args:
+        values: Per-row values (e.g. an indicator computed on the full series)
+        max_points: Maximum number of points
+        
+    Returns:
+        Array with one value per bucket
+    """
+    values = np.asarray(values)
+    if len(values) <= max_points:
+        return values
+    _, ends = bucket_bounds(len(values), max_points)
+    return values[ends]
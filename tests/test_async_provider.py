@@ -0,0 +1,187 @@
+"""AsyncCryptoCompareProvider against a local aiohttp stub of the CryptoCompare API."""
+import asyncio
+import gc
+import logging
+import threading
+import warnings
+import pytest
+from aiohttp import web
+from src.data_providers.async_cryptocompare_provider import AsyncCryptoCompareProvider
+
+
+def bars(count: int, start: int = 1_700_000_000, step: int = 3600):
+    return [
+        {
+            "time": start + i * step,
+            "open": 100.0 + i,
+            "high": 102.0 + i,
+            "low": 99.0 + i,
+            "close": 101.0 + i,
+            "volumefrom": 10.0,
+            "volumeto": 1000.0,
+        }
+        for i in range(count)
+    ]
+
+
+class StubApi:
+    """CryptoCompare REST stub served from its own event loop thread."""
+
+    def __init__(self):
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = 0.0
+        self.port = None
+        self._loop = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def _track(self, request: web.Request) -> None:
+        self.requests.append((request.path, dict(request.query)))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+    async def price(self, request: web.Request) -> web.Response:
+        await self._track(request)
+        if request.query["fsym"] == "NOPE":
+            return web.json_response({"Response": "Error", "Message": "market does not exist"})
+        return web.json_response({request.query["tsyms"]: 42000.5})
+
+    async def pricemulti(self, request: web.Request) -> web.Response:
+        await self._track(request)
+        return web.json_response({
+            symbol: {currency: 1.0 for currency in request.query["tsyms"].split(",")}
+            for symbol in request.query["fsyms"].split(",")
+        })
+
+    async def histo(self, request: web.Request) -> web.Response:
+        await self._track(request)
+        return web.json_response({"Response": "Success", "Data": {"Data": bars(int(request.query["limit"]) + 1)}})
+
+    def _serve(self) -> None:
+        async def main():
+            self._loop = asyncio.get_running_loop()
+            app = web.Application()
+            app.router.add_get("/data/price", self.price)
+            app.router.add_get("/data/pricemulti", self.pricemulti)
+            app.router.add_get("/data/v2/histohour", self.histo)
+            app.router.add_get("/data/v2/histoday", self.histo)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            self.port = site._server.sockets[0].getsockname()[1]
+            self._stop = asyncio.Event()
+            self._ready.set()
+            await self._stop.wait()
+            await runner.cleanup()
+
+        asyncio.run(main())
+
+    def start(self) -> "StubApi":
+        self._thread.start()
+        self._ready.wait(5.0)
+        return self
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(5.0)
+
+
+@pytest.fixture
+def stub():
+    api = StubApi().start()
+    yield api
+    api.stop()
+
+
+def make_provider(stub: StubApi, **kwargs) -> AsyncCryptoCompareProvider:
+    options = {"rate_limit": 1000.0}
+    options.update(kwargs)
+    return AsyncCryptoCompareProvider(base_url=stub.url, **options)
+
+
+def test_requests_against_stub(stub):
+    async def scenario():
+        async with make_provider(stub, api_key="secret") as provider:
+            price = await provider.get_current_price("btc")
+            prices = await provider.get_current_prices(["BTC", "ETH"], ["USD", "EUR"])
+            df = await provider.get_historical_ohlcv("BTC", timeframe="hour", limit=5)
+            market = await provider.get_market_data("BTC")
+            missing = await provider.get_current_price("NOPE")
+        return price, prices, df, market, missing
+
+    price, prices, df, market, missing = asyncio.run(scenario())
+
+    assert price == 42000.5
+    assert prices == {"BTC": {"USD": 1.0, "EUR": 1.0}, "ETH": {"USD": 1.0, "EUR": 1.0}}
+    assert len(df) == 6
+    assert list(df.columns[:5]) == ["timestamp", "open", "high", "low", "close"]
+    assert market["price"] == 42000.5
+    assert missing is None
+    assert all(query["api_key"] == "secret" for _, query in stub.requests)
+
+
+def test_concurrency_is_capped(stub):
+    stub.delay = 0.05
+
+    async def scenario():
+        async with make_provider(stub, max_concurrency=2) as provider:
+            await asyncio.gather(*(provider.get_current_price(symbol) for symbol in ("A", "B", "C", "D", "E")))
+
+    asyncio.run(scenario())
+    assert stub.max_in_flight == 2
+
+
+def test_reused_across_event_loops(stub, caplog):
+    provider = make_provider(stub)
+    sessions = []
+
+    async def fetch():
+        price = await provider.get_current_price("BTC")
+        sessions.append(provider._session)
+        return price
+
+    with warnings.catch_warnings(record=True) as caught, caplog.at_level(logging.ERROR, logger="asyncio"):
+        warnings.simplefilter("always")
+        # No close() between the runs: the second loop must replace the first loop's session
+        assert asyncio.run(fetch()) == 42000.5
+        assert asyncio.run(fetch()) == 42000.5
+        asyncio.run(provider.close())
+        del sessions[:]
+        gc.collect()
+
+    assert len(stub.requests) == 2
+    assert provider._session is None
+    unclosed = [str(w.message) for w in caught if "Unclosed" in str(w.message)]
+    assert not unclosed
+    assert "Unclosed" not in caplog.text
+
+
+def test_each_loop_gets_its_own_session_and_semaphore(stub):
+    provider = make_provider(stub)
+    state = []
+
+    async def fetch():
+        await provider.get_current_price("BTC")
+        state.append((provider._session, provider._semaphore, provider._loop))
+
+    asyncio.run(fetch())
+    asyncio.run(fetch())
+    asyncio.run(provider.close())
+
+    (first_session, first_semaphore, first_loop), (second_session, second_semaphore, second_loop) = state
+    assert first_session is not second_session
+    assert first_semaphore is not second_semaphore
+    assert first_loop is not second_loop
+    assert first_session.closed
+    assert second_session.closed
@@ -0,0 +1,228 @@
+"""StreamingCryptoCompareProvider against a local mock streamer."""
+import asyncio
+import json
+import re
+import socket
+import time
+import websockets
+from src.data_providers import streaming_provider
+from src.data_providers.streaming_provider import StreamingCryptoCompareProvider
+
+
+BTC = "5~CCCAGG~BTC~USD"
+ETH = "5~CCCAGG~ETH~USD"
+
+
+def tick(symbol: str, price, **fields) -> str:
+    """Aggregate (TYPE 5) message as sent by the CryptoCompare streamer."""
+    return json.dumps({
+        "TYPE": "5",
+        "MARKET": "CCCAGG",
+        "FROMSYMBOL": symbol,
+        "TOSYMBOL": "USD",
+        "PRICE": price,
+        "LASTUPDATE": 1_700_000_000,
+        **fields,
+    })
+
+
+async def wait_until(predicate, timeout: float = 5.0) -> None:
+    """Poll ``predicate`` until it is true or fail after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.005)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class MockStreamer:
+    """Local WebSocket server that records control messages per connection."""
+
+    def __init__(self, port: int = 0):
+        self.port = port
+        self.connections = []
+        self.received = []
+        self.server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}"
+
+    async def handler(self, ws, *_):
+        messages = []
+        self.connections.append(ws)
+        self.received.append(messages)
+        try:
+            async for raw in ws:
+                messages.append(json.loads(raw))
+        except websockets.ConnectionClosed:
+            pass
+
+    async def send(self, raw) -> None:
+        await self.connections[-1].send(raw)
+
+    async def __aenter__(self) -> "MockStreamer":
+        self.server = await websockets.serve(self.handler, "127.0.0.1", self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def make_provider(url: str, **kwargs) -> StreamingCryptoCompareProvider:
+    options = {"initial_backoff": 0.01, "max_backoff": 0.05, "heartbeat_timeout": 5.0}
+    options.update(kwargs)
+    return StreamingCryptoCompareProvider(url=url, **options)
+
+
+def test_subscribe_sends_pending_and_live_subscriptions():
+    async def scenario():
+        async with MockStreamer() as mock:
+            provider = make_provider(mock.url)
+            provider.subscribe(["btc"])
+            task = asyncio.create_task(provider.run())
+
+            await wait_until(lambda: mock.received and mock.received[0])
+            assert mock.received[0][0] == {"action": "SubAdd", "subs": [BTC]}
+
+            provider.subscribe(["ETH", "BTC"])
+            await wait_until(lambda: len(mock.received[0]) == 2)
+            assert mock.received[0][1] == {"action": "SubAdd", "subs": [ETH]}
+
+            await mock.send(tick("BTC", 100.5))
+            await wait_until(lambda: provider.get_current_price("BTC") is not None)
+            assert provider.get_current_price("btc", "usd") == 100.5
+
+            provider.unsubscribe(["ETH"])
+            await wait_until(lambda: len(mock.received[0]) == 3)
+            assert mock.received[0][2] == {"action": "SubRemove", "subs": [ETH]}
+
+            await provider.close()
+            await asyncio.wait_for(task, 5.0)
+
+    asyncio.run(scenario())
+
+
+def test_resubscribes_after_connection_drop():
+    async def scenario():
+        async with MockStreamer() as mock:
+            provider = make_provider(mock.url)
+            provider.subscribe(["BTC", "ETH"])
+            task = asyncio.create_task(provider.run())
+
+            await wait_until(lambda: mock.received and mock.received[0])
+            await mock.connections[0].close()
+
+            await wait_until(lambda: len(mock.received) == 2 and mock.received[1])
+            assert mock.received[1][0] == {"action": "SubAdd", "subs": [BTC, ETH]}
+            assert provider.reconnects == 1
+
+            await mock.send(tick("ETH", 2500.0))
+            await wait_until(lambda: provider.get_current_price("ETH") == 2500.0)
+
+            await provider.close()
+            await asyncio.wait_for(task, 5.0)
+
+    asyncio.run(scenario())
+
+
+def test_malformed_frames_do_not_drop_the_stream():
+    async def scenario():
+        async with MockStreamer() as mock:
+            provider = make_provider(mock.url)
+            provider.subscribe(["BTC"])
+            task = asyncio.create_task(provider.run())
+            await wait_until(lambda: mock.connections)
+
+            await mock.send(tick("BTC", 100.0))
+            for raw in ("not json", "[1, 2]", "null", b"\x00", tick("BTC", "abc"), tick("BTC", 1.0, LASTUPDATE="x")):
+                await mock.send(raw)
+            await mock.send(tick("BTC", 101.0))
+
+            await wait_until(lambda: provider.get_current_price("BTC") == 101.0)
+            assert provider.connected
+            assert provider.reconnects == 0
+            assert len(mock.connections) == 1
+            # The rejected ticks did not reach the live candles
+            candles = provider.get_live_candles("BTC")
+            assert candles["high"].iloc[-1] == 101.0
+            assert candles["low"].iloc[-1] == 100.0
+
+            await provider.close()
+            await asyncio.wait_for(task, 5.0)
+
+    asyncio.run(scenario())
+
+
+def test_updates_iterator_ends_when_provider_closes():
+    async def scenario():
+        async with MockStreamer() as mock:
+            provider = make_provider(mock.url)
+            provider.subscribe(["BTC"])
+            task = asyncio.create_task(provider.run())
+            await wait_until(lambda: mock.connections)
+
+            received = []
+
+            async def consume():
+                async for update in provider.updates():
+                    received.append(update)
+
+            consumer = asyncio.create_task(consume())
+            await wait_until(lambda: provider._queues)
+
+            await mock.send(tick("BTC", 100.0))
+            await mock.send(tick("BTC", 102.0))
+            await wait_until(lambda: len(received) == 2)
+            assert [update["price"] for update in received] == [100.0, 102.0]
+
+            await provider.close()
+            await asyncio.wait_for(task, 5.0)
+            await asyncio.wait_for(consumer, 5.0)
+            assert not provider._queues
+
+    asyncio.run(scenario())
+
+
+def reconnect_delays(output: str):
+    """Delays announced by the provider's reconnect warnings."""
+    return [float(delay) for delay in re.findall(r"reconnecting in ([0-9.]+)s", output)]
+
+
+def test_backoff_grows_to_cap_and_resets_on_connect(monkeypatch, capsys):
+    # Without jitter every delay is exactly the current backoff
+    monkeypatch.setattr(streaming_provider.random, "uniform", lambda low, high: high)
+
+    async def scenario():
+        port = free_port()
+        provider = make_provider(f"ws://127.0.0.1:{port}", initial_backoff=0.1, max_backoff=0.4)
+        provider.subscribe(["BTC"])
+        task = asyncio.create_task(provider.run())
+
+        # Nothing listens on the port yet, so every attempt is refused
+        await wait_until(lambda: provider.reconnects >= 5)
+        assert reconnect_delays(capsys.readouterr().out)[:5] == [0.1, 0.2, 0.4, 0.4, 0.4]
+
+        async with MockStreamer(port) as mock:
+            await wait_until(lambda: mock.received and mock.received[0])
+            assert mock.received[0][0] == {"action": "SubAdd", "subs": [BTC]}
+            reconnects = provider.reconnects
+            capsys.readouterr()
+
+            # A successful connection resets the delay to initial_backoff
+            await mock.connections[0].close()
+            await wait_until(lambda: len(mock.received) == 2 and mock.received[1])
+            assert provider.reconnects == reconnects + 1
+            assert reconnect_delays(capsys.readouterr().out) == [0.1]
+
+            await provider.close()
+            await asyncio.wait_for(task, 5.0)
+
+    asyncio.run(scenario())